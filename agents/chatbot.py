@@ -1,8 +1,9 @@
 """
 Chatbot agent for interacting with users.
 """
+import asyncio
 import logging
-from typing import Literal
+from typing import Dict, List, Literal, Optional, Tuple
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import HumanMessage
 from langchain_ollama import ChatOllama
@@ -16,6 +17,76 @@ from document_processing.prompts import CONVERSATION_PROMPT
 logger = logging.getLogger(__name__)
 
 
+def _record_user_message(state: AgentState) -> List[str]:
+    # Record user message
+    message_list = state["chatbot_conversation"]
+    message_list.append("User: " + state["messages"][-1].content)
+    print(message_list)
+    logger.info("User message: {}".format(str(state["messages"][-1].content)))
+    logger.info("Chatbot Conversation: {}".format(str(message_list)))
+    return message_list
+
+def _context_query(state: AgentState) -> Tuple[Optional[str], str]:
+    # Query the applicant's own documents for context; without an
+    # application there is nothing of theirs to retrieve. Only the latest
+    # question is embedded, so a repeated question hits the embedding cache;
+    # the conversation reaches the LLM through the prompt's chat history
+    applicant_id = (state.get("application_data") or {}).get("applicant_id")
+    return applicant_id, state["messages"][-1].content
+
+def _conversation_chain():
+    # Initialize LLM
+    llm = ChatOllama(
+        model=LLM_CONFIG["validation_model"],
+        temperature=LLM_CONFIG["validation_temperature"]
+    )
+    
+    # Create conversation chain
+    prompt = ChatPromptTemplate.from_template(CONVERSATION_PROMPT)
+    return prompt | llm
+
+def _conversation_inputs(state: AgentState, message_list: List[str], context_texts: List[str]) -> Dict[str, str]:
+    return {
+        "contextText": context_texts[0] if context_texts else "",
+        "userQuestion": state["messages"][-1].content,
+        "chatHistory": "\n".join(message_list)
+    }
+
+def _chatbot_command(result, message_list: List[str]) -> Command[Literal["supervisor"]]:
+    # Record system response
+    system_response = result.content.split("</think")[-1].strip()
+    message_list.append("System: " + system_response)
+    
+    logger.info(f"--- Workflow Transition: Chatbot to Supervisor ---")
+    return Command(
+        update={
+            "messages": [
+                HumanMessage(
+                    content="Successfully constructed a reply for the user.",
+                    name="chatbot"
+                )
+            ],
+            "chatbot_conversation": message_list
+        },
+        goto="supervisor",
+    )
+
+def _chatbot_failed(state: AgentState, e: Exception) -> Command[Literal["supervisor"]]:
+    logger.error(f"Chatbot error: {str(e)}")
+    return Command(
+        update={
+            "messages": [
+                HumanMessage(
+                    content="Error generating response for the user.",
+                    name="chatbot"
+                )
+            ],
+            "chatbot_conversation": ["User: " + state["messages"][-1].content, 
+                                    "System: I apologize, but I encountered an error while processing your request. Please try again."]
+        },
+        goto="supervisor",
+    )
+
 def chatbot_node(state: AgentState) -> Command[Literal["supervisor"]]:
     """
     Chatbot node that interacts with users.
@@ -27,62 +98,27 @@ def chatbot_node(state: AgentState) -> Command[Literal["supervisor"]]:
         Command: Next step in the workflow
     """
     try:
-        # Record user message
-        message_list = state["chatbot_conversation"]
-        message_list.append("User: " + state["messages"][-1].content)
-        print(message_list)
-        logger.info("User message: {}".format(str(state["messages"][-1].content)))
-        logger.info("Chatbot Conversation: {}".format(str(message_list)))
-        
-        # Query vector DB for context
-        context_text = query_vector_db("\n".join(message_list))[0] if query_vector_db("\n".join(message_list)) else ""
-        
-        # Initialize LLM
-        llm = ChatOllama(
-            model=LLM_CONFIG["validation_model"],
-            temperature=LLM_CONFIG["validation_temperature"]
-        )
-        
-        # Create conversation chain
-        prompt = ChatPromptTemplate.from_template(CONVERSATION_PROMPT)
-        chain = prompt | llm
+        message_list = _record_user_message(state)
+        applicant_id, query = _context_query(state)
+        context_texts = query_vector_db(query, applicant_id=applicant_id) if applicant_id else []
         
         # Generate response
-        result = chain.invoke({
-            "contextText": context_text,
-            "userQuestion": state["messages"][-1].content,
-            "chatHistory": "\n".join(message_list)
-        })
-        
-        # Record system response
-        system_response = result.content.split("</think")[-1].strip()
-        message_list.append("System: " + system_response)
-        
-        logger.info(f"--- Workflow Transition: Chatbot to Supervisor ---")
-        return Command(
-            update={
-                "messages": [
-                    HumanMessage(
-                        content="Successfully constructed a reply for the user.",
-                        name="chatbot"
-                    )
-                ],
-                "chatbot_conversation": message_list
-            },
-            goto="supervisor",
+        result = _conversation_chain().invoke(_conversation_inputs(state, message_list, context_texts))
+        return _chatbot_command(result, message_list)
+    except Exception as e:
+        return _chatbot_failed(state, e)
+
+async def achatbot_node(state: AgentState) -> Command[Literal["supervisor"]]:
+    """
+    Async variant of chatbot_node; the vector store lookup runs in a worker thread.
+    """
+    try:
+        message_list = _record_user_message(state)
+        applicant_id, query = _context_query(state)
+        context_texts = (
+            await asyncio.to_thread(query_vector_db, query, applicant_id=applicant_id) if applicant_id else []
         )
+        result = await _conversation_chain().ainvoke(_conversation_inputs(state, message_list, context_texts))
+        return _chatbot_command(result, message_list)
     except Exception as e:
-        logger.error(f"Chatbot error: {str(e)}")
-        return Command(
-            update={
-                "messages": [
-                    HumanMessage(
-                        content="Error generating response for the user.",
-                        name="chatbot"
-                    )
-                ],
-                "chatbot_conversation": ["User: " + state["messages"][-1].content, 
-                                        "System: I apologize, but I encountered an error while processing your request. Please try again."]
-            },
-            goto="supervisor",
-        )
\ No newline at end of file
+        return _chatbot_failed(state, e)
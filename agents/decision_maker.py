@@ -6,15 +6,100 @@ from typing import Literal
 from langchain_core.messages import HumanMessage
 from langgraph.types import Command
 
+from config import DECISION_MODEL_CONFIG
 from models.agent_state import AgentState
-from inference.decision_model import predict_eligibility
+from inference.decision_model import apredict_eligibility, predict_eligibility
+
+# Decision that needs no recommendations
+FINANCIAL_SUPPORT_ONLY = "Financial Support Approved"
 
 logger = logging.getLogger(__name__)
 
+def details_pending(decision: str) -> bool:
+    """
+    Whether an immediate decision still needs an LLM reason or recommendations.
+    """
+    return DECISION_MODEL_CONFIG["explanation_mode"] == "llm" or decision != FINANCIAL_SUPPORT_ONLY
+
+def _decision_command(decision: str, reason: str, deferred: bool) -> Command[Literal["supervisor", "recommender"]]:
+    if deferred and details_pending(decision):
+        logger.info(f"--- Workflow Transition: Decision Maker to Supervisor (details pending) ---")
+        return Command(
+            update={
+                "messages": [
+                    HumanMessage(
+                        content="Decision made: details pending.",
+                        name="decision_maker"
+                    )
+                ],
+                "decision": {
+                    "decision": decision,
+                    "reason": reason,
+                    "details_pending": True
+                }
+            },
+            goto="supervisor",
+        )
+    
+    # Determine next step based on decision
+    if decision == FINANCIAL_SUPPORT_ONLY:
+        logger.info(f"--- Workflow Transition: Decision Maker to Supervisor ---")
+        return Command(
+            update={
+                "messages": [
+                    HumanMessage(
+                        content="Decision made: only Financial Support Approved.",
+                        name="decision_maker"
+                    )
+                ],
+                "decision": {
+                    "decision": decision,
+                    "reason": reason
+                }
+            },
+            goto="supervisor",
+        )
+    else:
+        logger.info(f"--- Workflow Transition: Decision Maker to Recommender ---")
+        return Command(
+            update={
+                "messages": [
+                    HumanMessage(
+                        content="Decision made.",
+                        name="decision_maker"
+                    )
+                ],
+                "decision": {
+                    "decision": decision,
+                    "reason": reason
+                }
+            },
+            goto="recommender",
+        )
+
+def _decision_failed(e: Exception) -> Command[Literal["supervisor"]]:
+    logger.error(f"Decision making error: {str(e)}")
+    return Command(
+        update={
+            "messages": [
+                HumanMessage(
+                    content="Decision Making Component Failed.",
+                    name="decision_maker"
+                )
+            ],
+            "decision": {}
+        },
+        goto="supervisor",
+    )
+
 def decision_maker_node(state: AgentState) -> Command[Literal["supervisor", "recommender"]]:
     """
     Decision maker node that makes decisions on social support applications.
     
+    With deferred details enabled, the decision is committed straight away with
+    a template reason; the LLM reason and recommendations are generated after
+    the workflow returns (see wrapper.complete_decision_details).
+    
     Args:
         state: Current state of the workflow
     
@@ -26,54 +111,24 @@ def decision_maker_node(state: AgentState) -> Command[Literal["supervisor", "rec
         application_data = state["application_data"]
         
         # Make prediction
-        decision, reason = predict_eligibility(application_data)
-        
-        # Determine next step based on decision
-        if decision == "Financial Support Approved":
-            logger.info(f"--- Workflow Transition: Decision Maker to Supervisor ---")
-            return Command(
-                update={
-                    "messages": [
-                        HumanMessage(
-                            content="Decision made: only Financial Support Approved.",
-                            name="decision_maker"
-                        )
-                    ],
-                    "decision": {
-                        "decision": decision,
-                        "reason": reason
-                    }
-                },
-                goto="supervisor",
-            )
+        deferred = DECISION_MODEL_CONFIG["deferred_details"]
+        if deferred:
+            decision, reason = predict_eligibility(application_data, explanation_mode="template")
         else:
-            logger.info(f"--- Workflow Transition: Decision Maker to Recommender ---")
-            return Command(
-                update={
-                    "messages": [
-                        HumanMessage(
-                            content="Decision made.",
-                            name="decision_maker"
-                        )
-                    ],
-                    "decision": {
-                        "decision": decision,
-                        "reason": reason
-                    }
-                },
-                goto="recommender",
-            )
+            decision, reason = predict_eligibility(application_data)
+        return _decision_command(decision, reason, deferred)
     except Exception as e:
-        logger.error(f"Decision making error: {str(e)}")
-        return Command(
-            update={
-                "messages": [
-                    HumanMessage(
-                        content="Decision Making Component Failed.",
-                        name="decision_maker"
-                    )
-                ],
-                "decision": {}
-            },
-            goto="supervisor",
-        )
\ No newline at end of file
+        return _decision_failed(e)
+
+async def adecision_maker_node(state: AgentState) -> Command[Literal["supervisor", "recommender"]]:
+    """
+    Async variant of decision_maker_node.
+    """
+    try:
+        deferred = DECISION_MODEL_CONFIG["deferred_details"]
+        decision, reason = await apredict_eligibility(
+            state["application_data"], explanation_mode="template" if deferred else None
+        )
+        return _decision_command(decision, reason, deferred)
+    except Exception as e:
+        return _decision_failed(e)
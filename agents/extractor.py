@@ -7,10 +7,41 @@ from langchain_core.messages import HumanMessage
 from langgraph.types import Command
 
 from models.agent_state import AgentState
-from document_processing.extraction import extract_documents, load_cached_extraction_data
+from document_processing.extraction import aextract_documents, extract_documents
 
 logger = logging.getLogger(__name__)
 
+def _extraction_command(result_str) -> Command[Literal["validator"]]:
+    # Proceed to validation
+    logger.info(f"--- Workflow Transition: Extractor to Validator ---")
+    return Command(
+        update={
+            "messages": [
+                HumanMessage(
+                    content="Extraction completed.",
+                    name="extractor"
+                )
+            ],
+            "extracted_data": result_str
+        },
+        goto="validator",
+    )
+
+def _extraction_failed(e: Exception) -> Command[Literal["supervisor"]]:
+    logger.error(f"Extraction error: {str(e)}")
+    return Command(
+        update={
+            "messages": [
+                HumanMessage(
+                    content="Extraction Component Failed.",
+                    name="extractor"
+                )
+            ],
+            "extracted_data": {}
+        },
+        goto="supervisor",
+    )
+
 def extractor_node(state: AgentState) -> Command[Literal["validator", "supervisor"]]:
     """
     Extractor node that extracts information from documents.
@@ -22,52 +53,26 @@ def extractor_node(state: AgentState) -> Command[Literal["validator", "superviso
         Command: Next step in the workflow
     """
     try:
-        # Check if cached extraction data is available
-        if state["cached_extraction_data_file_path"] != "":
-            extracted_data = load_cached_extraction_data()
-            if extracted_data:
-                logger.info(f"--- Workflow Transition: Extractor to Validator ---")
-                return Command(
-                    update={
-                        "messages": [
-                            HumanMessage(
-                                content="Extraction completed.",
-                                name="extractor"
-                            )
-                        ],
-                        "extracted_data": extracted_data
-                    },
-                    goto="validator",
-                )
-        
         # Extract information from documents
-        result_str = extract_documents(state["extraction_filepath_dict"])
-        
-        # Proceed to validation
-        logger.info(f"--- Workflow Transition: Extractor to Validator ---")
-        return Command(
-            update={
-                "messages": [
-                    HumanMessage(
-                        content="Extraction completed.",
-                        name="extractor"
-                    )
-                ],
-                "extracted_data": result_str
-            },
-            goto="validator",
+        result_str = extract_documents(
+            state["extraction_filepath_dict"],
+            use_cache=state.get("use_cached_extraction", True),
+            applicant_id=state["application_data"].get("applicant_id")
+        )
+        return _extraction_command(result_str)
+    except Exception as e:
+        return _extraction_failed(e)
+
+async def aextractor_node(state: AgentState) -> Command[Literal["validator", "supervisor"]]:
+    """
+    Async variant of extractor_node.
+    """
+    try:
+        result_str = await aextract_documents(
+            state["extraction_filepath_dict"],
+            use_cache=state.get("use_cached_extraction", True),
+            applicant_id=state["application_data"].get("applicant_id")
         )
+        return _extraction_command(result_str)
     except Exception as e:
-        logger.error(f"Extraction error: {str(e)}")
-        return Command(
-            update={
-                "messages": [
-                    HumanMessage(
-                        content="Extraction Component Failed.",
-                        name="extractor"
-                    )
-                ],
-                "extracted_data": {}
-            },
-            goto="supervisor",
-        )
\ No newline at end of file
+        return _extraction_failed(e)
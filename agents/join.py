@@ -0,0 +1,59 @@
+"""
+Join agent for merging the parallel validation and decision branches.
+"""
+import logging
+from typing import Literal, Optional
+from langchain_core.messages import HumanMessage
+from langgraph.types import Command
+
+from models.agent_state import AgentState
+
+logger = logging.getLogger(__name__)
+
+VALIDATION_SUCCESSFUL = "Application Validation Completed."
+
+def _last_message_from(state: AgentState, name: str) -> Optional[HumanMessage]:
+    for message in reversed(state["messages"]):
+        if isinstance(message, HumanMessage) and message.name == name:
+            return message
+    return None
+
+def join_node(state: AgentState) -> Command[Literal["supervisor", "recommender"]]:
+    """
+    Join node that merges the validator and decision maker results once both
+    have finished, and routes as the sequential workflow would have.
+    
+    A failed or unsuccessful validation overrides the decision. The message
+    that decides the route is repeated last, since the supervisor and the
+    recommender read the latest message.
+    
+    Args:
+        state: Current state of the workflow
+    
+    Returns:
+        Command: Next step in the workflow
+    """
+    validation = _last_message_from(state, "validator")
+    decision = _last_message_from(state, "decision_maker")
+    
+    if validation is None or validation.content != VALIDATION_SUCCESSFUL:
+        content = validation.content if validation else "Validation Component Failed."
+        goto = "recommender" if content == "Validation Unsuccessful." else "supervisor"
+        logger.info(f"--- Workflow Transition: Join to {goto} (validation overrides decision) ---")
+        return Command(
+            update={
+                "messages": [HumanMessage(content=content, name="validator")],
+                "decision": {}
+            },
+            goto=goto,
+        )
+    
+    content = decision.content if decision else "Decision Making Component Failed."
+    goto = "recommender" if content == "Decision made." else "supervisor"
+    logger.info(f"--- Workflow Transition: Join to {goto} ---")
+    return Command(
+        update={
+            "messages": [HumanMessage(content=content, name="decision_maker")]
+        },
+        goto=goto,
+    )
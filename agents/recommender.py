@@ -2,7 +2,7 @@
 Recommender agent for providing recommendations based on application decision.
 """
 import logging
-from typing import Literal
+from typing import Any, Dict, Literal
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import HumanMessage
 from langchain_ollama import ChatOllama
@@ -17,6 +17,99 @@ from document_processing.prompts import (
 
 logger = logging.getLogger(__name__)
 
+def _llm() -> ChatOllama:
+    return ChatOllama(
+        model=LLM_CONFIG["validation_model"],
+        temperature=LLM_CONFIG["validation_temperature"]
+    )
+
+def _recommendation_inputs(application_data: Dict[str, Any], decision: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'decision': decision["decision"],
+        'reason': decision["reason"],
+        'monthly_income': application_data['monthly_income'],
+        'assets': application_data['assets'],
+        'liabilities': application_data['liabilities'],
+        'household_size': application_data['household_size'],
+        'age': application_data['age'],
+        'education_level': application_data['education_level'],
+        'marital_status': application_data['marital_status'],
+    }
+
+def generate_recommendations(application_data: Dict[str, Any], decision: Dict[str, Any]) -> str:
+    """
+    Generate recommendations for an applicant from their decision and reason.
+    
+    Args:
+        application_data: Application data from the applicant
+        decision: Decision made by the model, with its reason
+    
+    Returns:
+        str: Recommendations for the applicant
+    """
+    # Create recommendation chain
+    prompt = ChatPromptTemplate.from_template(RECOMMENDATION_AGENT_PROMPT)
+    chain = prompt | _llm()
+    
+    # Generate recommendations
+    result = chain.invoke(_recommendation_inputs(application_data, decision))
+    return result.content.split("</think>")[-1]
+
+async def agenerate_recommendations(application_data: Dict[str, Any], decision: Dict[str, Any]) -> str:
+    """
+    Async variant of generate_recommendations.
+    """
+    chain = ChatPromptTemplate.from_template(RECOMMENDATION_AGENT_PROMPT) | _llm()
+    result = await chain.ainvoke(_recommendation_inputs(application_data, decision))
+    return result.content.split("</think>")[-1]
+
+def _validation_failed(state: AgentState) -> bool:
+    return (isinstance(state["messages"][-1], HumanMessage) and 
+            state["messages"][-1].name == "validator" and 
+            state["messages"][-1].content == "Validation Unsuccessful.")
+
+def _validation_failure_inputs(state: AgentState) -> Dict[str, Any]:
+    return {
+        'data_collected_from_emirates_id': state['extracted_data']['EID_Extract_In_Text'],
+        'data_collected_from_bank_statements': state['extracted_data']['BankS_Extract_In_Text'],
+        'data_collected_from_resume': state['extracted_data']['Resume_Extract_In_Text']
+    }
+
+def _recommender_command(recommendations: str, validation_failed: bool) -> Command[Literal["supervisor"]]:
+    if validation_failed:
+        logger.info(" --- Transitioning to supervisor ---")
+        content = "Process Complete (Extraction - Validation - Recommendation)"
+    else:
+        logger.info(f"--- Workflow Transition: Recommender to Supervisor ---")
+        content = "Process Complete (Extraction - Validation - Decision - Recommendation)"
+    return Command(
+        update={
+            "messages": [
+                HumanMessage(
+                    content=content,
+                    name="recommender"
+                )
+            ],
+            "recommendations": recommendations
+        },
+        goto="supervisor",
+    )
+
+def _recommender_failed(e: Exception) -> Command[Literal["supervisor"]]:
+    logger.error(f"Recommendation error: {str(e)}")
+    return Command(
+        update={
+            "messages": [
+                HumanMessage(
+                    content="Recommender Component Failed.",
+                    name="recommender"
+                )
+            ],
+            "recommendations": ""
+        },
+        goto="supervisor",
+    )
+
 def recommender_node(state: AgentState) -> Command[Literal["supervisor"]]:
     """
     Recommender node that provides recommendations based on application decision.
@@ -28,86 +121,33 @@ def recommender_node(state: AgentState) -> Command[Literal["supervisor"]]:
         Command: Next step in the workflow
     """
     try:
-        # Initialize LLM
-        llm = ChatOllama(
-            model=LLM_CONFIG["validation_model"],
-            temperature=LLM_CONFIG["validation_temperature"]
-        )
-        
         # Handle validation failure case
-        if (isinstance(state["messages"][-1], HumanMessage) and 
-            state["messages"][-1].name == "validator" and 
-            state["messages"][-1].content == "Validation Unsuccessful."):
-            
+        if _validation_failed(state):
             # Create validation failure recommendation chain
             prompt = ChatPromptTemplate.from_template(VALIDATION_FAILURE_RECOMMENDATION_PROMPT)
-            chain = prompt | llm
+            chain = prompt | _llm()
             
             # Generate recommendations
-            result = chain.invoke({
-                'data_collected_from_emirates_id': state['extracted_data']['EID_Extract_In_Text'],
-                'data_collected_from_bank_statements': state['extracted_data']['BankS_Extract_In_Text'],
-                'data_collected_from_resume': state['extracted_data']['Resume_Extract_In_Text']
-            })
-            
-            logger.info(" --- Transitioning to supervisor ---")
-            return Command(
-                update={
-                    "messages": [
-                        HumanMessage(
-                            content="Process Complete (Extraction - Validation - Recommendation)",
-                            name="recommender"
-                        )
-                    ],
-                    "recommendations": result.content.split("</think>")[-1],
-                },
-                goto="supervisor",
-            )
+            result = chain.invoke(_validation_failure_inputs(state))
+            return _recommender_command(result.content.split("</think>")[-1], validation_failed=True)
         
         # Handle normal recommendation case
-        application_data = state["application_data"]
-        
-        # Create recommendation chain
-        prompt = ChatPromptTemplate.from_template(RECOMMENDATION_AGENT_PROMPT)
-        chain = prompt | llm
-        
-        # Generate recommendations
-        result = chain.invoke({
-            'decision': state["decision"]["decision"],
-            'reason': state["decision"]["reason"],
-            'monthly_income': application_data['monthly_income'],
-            'assets': application_data['assets'],
-            'liabilities': application_data['liabilities'],
-            'household_size': application_data['household_size'],
-            'age': application_data['age'],
-            'education_level': application_data['education_level'],
-            'marital_status': application_data['marital_status'],
-        })
+        recommendations = generate_recommendations(state["application_data"], state["decision"])
+        return _recommender_command(recommendations, validation_failed=False)
+    except Exception as e:
+        return _recommender_failed(e)
+
+async def arecommender_node(state: AgentState) -> Command[Literal["supervisor"]]:
+    """
+    Async variant of recommender_node.
+    """
+    try:
+        if _validation_failed(state):
+            chain = ChatPromptTemplate.from_template(VALIDATION_FAILURE_RECOMMENDATION_PROMPT) | _llm()
+            result = await chain.ainvoke(_validation_failure_inputs(state))
+            return _recommender_command(result.content.split("</think>")[-1], validation_failed=True)
         
-        logger.info(f"--- Workflow Transition: Recommender to Supervisor ---")
-        return Command(
-            update={
-                "messages": [
-                    HumanMessage(
-                        content="Process Complete (Extraction - Validation - Decision - Recommendation)",
-                        name="recommender"
-                    )
-                ],
-                "recommendations": result.content.split("</think>")[-1]
-            },
-            goto="supervisor",
-        )
+        recommendations = await agenerate_recommendations(state["application_data"], state["decision"])
+        return _recommender_command(recommendations, validation_failed=False)
     except Exception as e:
-        logger.error(f"Recommendation error: {str(e)}")
-        return Command(
-            update={
-                "messages": [
-                    HumanMessage(
-                        content="Recommender Component Failed.",
-                        name="recommender"
-                    )
-                ],
-                "recommendations": ""
-            },
-            goto="supervisor",
-        )
\ No newline at end of file
+        return _recommender_failed(e)
@@ -2,7 +2,9 @@
 Supervisor agent for coordinating workflow in the Social Support Application Processing System.
 """
 import logging
-from typing import List, Literal
+import threading
+import time
+from typing import Any, Dict, List, Literal, Optional, Tuple
 from langchain_core.messages import HumanMessage
 from langchain_ollama import ChatOllama
 from langgraph.types import Command
@@ -13,128 +15,190 @@ from models.data_models import Supervisor
 
 logger = logging.getLogger(__name__)
 
+START_APPLICATION = "CODE-STARTAPPLICATION"
+
+# (sender, content) -> (next node, reason). A content of None matches any
+# message from that sender; exact matches are tried first. User queries
+# arrive as ("user", text) tuples and report "user" as their sender.
+ROUTES: Dict[Tuple[str, Optional[str]], Tuple[str, str]] = {
+    ("user", START_APPLICATION): ("extractor", "New application submitted; extracting details from the documents."),
+    ("user", None): ("chatbot", ""),
+    ("validator", "Validation Unsuccessful."): (END, "Document Validation Failed."),
+    ("validator", "Validation Component Failed."): (END, "Validation Component Failed."),
+    ("extractor", "Extraction Unsuccessful."): (END, "Information Extraction from Documents Failed."),
+    ("extractor", "Extraction Component Failed."): (END, "Information Extraction component failed."),
+    ("decision_maker", "Decision made: only Financial Support Approved."): (END, "Since, only Financial Support was approved, there is no need to generate recommendations for Economic Enablement, and only next steps in the process needs to be communicated to the applicant."),
+    ("decision_maker", "Decision made: details pending."): (END, "Decision made; the reason and recommendations are generated in the background."),
+    ("decision_maker", "Decision Making Component Failed."): (END, "Decision Making Component Failed."),
+    ("recommender", "Process Complete (Extraction - Validation - Decision - Recommendation)"): (END, "Decision and Recommendation generation complete."),
+    ("recommender", "Process Complete (Extraction - Validation - Recommendation)"): (END, "No Decision needed, Recommendation generation complete."),
+    ("recommender", "Recommender Component Failed."): (END, "Recommender Component Failed."),
+    ("chatbot", "Error generating response for the user."): (END, "Error generating response for the user."),
+    ("chatbot", None): (END, "Chatbot Job finished."),
+}
+
+
+class RoutingStats:
+    """
+    Thread-safe counts and timings of routing decisions, by source.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {}
+        self._total_seconds: Dict[str, float] = {}
+        self._max_seconds: Dict[str, float] = {}
+
+    def record(self, source: str, elapsed: float) -> None:
+        """Record one routing decision made by a source ("rule" or "llm")."""
+        with self._lock:
+            self._counts[source] = self._counts.get(source, 0) + 1
+            self._total_seconds[source] = self._total_seconds.get(source, 0.0) + elapsed
+            self._max_seconds[source] = max(self._max_seconds.get(source, 0.0), elapsed)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return a snapshot of the counters."""
+        with self._lock:
+            return {
+                source: {
+                    "count": count,
+                    "avg_seconds": self._total_seconds[source] / count,
+                    "max_seconds": self._max_seconds[source],
+                }
+                for source, count in self._counts.items()
+            }
+
+
+ROUTING_STATS = RoutingStats()
+
+def get_routing_stats() -> Dict[str, Any]:
+    """
+    Return how many routing decisions came from rules and from the LLM, with timings.
+    """
+    return ROUTING_STATS.stats()
+
+
+def match_route(message: Any) -> Optional[Tuple[str, str]]:
+    """
+    Look up the route for a message in the routing table.
+    
+    Args:
+        message: Latest message in the workflow state
+    
+    Returns:
+        Tuple: (next node, reason), or None if no rule matches
+    """
+    if isinstance(message, tuple):
+        sender, content = "user", message[-1]
+    elif isinstance(message, HumanMessage):
+        sender, content = message.name, message.content
+    else:
+        return None
+    return ROUTES.get((sender, content)) or ROUTES.get((sender, None))
+
+def _rule_command(state: AgentState) -> Optional[Command]:
+    """
+    Route known messages from the routing table, without the LLM.
+    """
+    message = state["messages"][-1]
+    route = match_route(message)
+    if route is None:
+        return None
+    goto, reason = route
+    if goto == "chatbot":
+        # The chatbot reads the user's query from the latest message
+        reason = message[-1]
+    logger.info(f"--- Workflow Transition: Supervisor to {goto} (rule) ---")
+    return Command(
+        update={
+            "messages": [
+                HumanMessage(content=reason, name="supervisor")
+            ]
+        },
+        goto=goto,
+    )
+
+def _routing_llm():
+    llm = ChatOllama(
+        model=LLM_CONFIG["validation_model"],
+        temperature=LLM_CONFIG["validation_temperature"]
+    )
+    return llm.with_structured_output(Supervisor)
+
+def _routing_messages(state: AgentState) -> List:
+    system_prompt = '''
+        **Team Members**:
+        1. **Extractor** - Always prefer this first. Extracts details to be used by subsequent workers.
+
+        **Your Responsibilities**:
+        1. Analyze each user request and agent response for completeness, accuracy, and relevance.
+        2. Route the task to the most appropriate agent at each decision point.
+        3. Maintain workflow momentum by avoiding redundant agent assignments.
+        4. Continue the process until the user's request is fully and satisfactorily resolved.
+        Return output as JSON as follows:
+        - goto: name of the worker node, like extractor, etc.
+        - reason: reason for choosing.
+    '''
+    
+    # Convert state messages to format expected by LLM
+    return [
+        {"role": "system", "content": system_prompt},
+    ] + state["messages"] + [{"role": "user", "content": "Get the details about the applicant from all the submitted documents"},]
+
+def _llm_route_command(response) -> Command:
+    goto = response.next
+    reason = response.reason
+    
+    # Handle "FINISH" as a synonym for "__end__"
+    if goto == "FINISH" or goto == "__end__":
+        goto = "__end__"
+    logger.info(f"--- Workflow Transition: Supervisor to {goto.lower()} (LLM) ---")
+    return Command(
+        update={
+            "messages": [
+                HumanMessage(content=reason, name="supervisor")
+            ]
+        },
+        goto=goto.lower(),
+    )
+
 def supervisor_node(state: AgentState) -> Command[Literal["extractor", "chatbot", "__end__"]]:
     """
     Supervisor node that coordinates workflow and routes to the appropriate specialist.
     
+    Known messages are routed from ROUTES; the LLM router is only consulted
+    for messages no rule matches.
+    
     Args:
         state: Current state of the workflow
     
     Returns:
         Command: Next step in the workflow
     """
-    # If the message is a user query that isn't starting an application, route to chatbot
-    if isinstance(state["messages"][-1], tuple) and state["messages"][-1][-1] != "CODE-STARTAPPLICATION":
-        logger.info("--- Workflow Transition: Supervisor to chatbot ---")
-        return Command(
-            update={
-                "messages": [
-                    HumanMessage(content=state["messages"][-1][-1], name="supervisor")
-                ]
-            },
-            goto="chatbot",
-        )
-    else:
-        # Handle agent response messages
-        goto = ""
-        reason = ""
-        if isinstance(state["messages"][-1], HumanMessage):
-            if (state["messages"][-1].name == "validator" and state["messages"][-1].content == "Validation Unsuccessful."):
-                goto == "FINISH"
-                reason = "Document Validation Failed."
-                
-            
-            elif (state["messages"][-1].name == "validator" and state["messages"][-1].content ==  "Validation Component Failed."):
-                goto == "FINISH"
-                reason = "Validation Component Failed."
-
-            elif (state["messages"][-1].name == "extractor" and state["messages"][-1].content == "Extraction Unsuccessful."):
-                goto == "FINISH"
-                reason = "Information Extraction from Documents Failed."
-
-                
-            elif (state["messages"][-1].name == "extractor" and state["messages"][-1].content == "Extraction Component Failed."):
-                goto == "FINISH"
-                reason = "Information Extraction component failed."
-
-            elif state["messages"][-1].name == "decision_maker" and state["messages"][-1].content == "Decision made: only Financial Support Approved.":
-                goto == "FINISH"
-                reason = "Since, only Financial Support was approved, there is no need to generate recommendations for Economic Enablement, and only next steps in the process needs to be communicated to the applicant."
-
-            elif state["messages"][-1].name == "decision_maker" and state["messages"][-1].content == "Decision Making Component Failed.":  
-                goto == "FINISH"
-                reason = "Decision Making Component Failed."
-
-            elif state["messages"][-1].name == "recommender" and state["messages"][-1].content == "Process Complete (Extraction - Validation - Decision - Recommendation)":
-                goto == "FINISH"
-                reason = "Decision and Recommendation generation complete."
-
-            elif state["messages"][-1].name == "recommender" and state["messages"][-1].content == "Process Complete (Extraction - Validation - Recommendation)":
-                goto == "FINISH"
-                reason = "No Decision needed, Recommendation generation complete."
-
-            elif state["messages"][-1].name == "recommender" and state["messages"][-1].content == "Recommender Component Failed.":
-                goto == "FINISH"
-                reason = "Recommender Component Failed."
-
-            elif state["messages"][-1].name == "chatbot":
-                goto == "FINISH"
-                reason = "Chatbot Job finished."
-
-            elif state["messages"][-1].name == "chatbot":
-                goto == "FINISH"
-                reason = "Error generating response for the user."
-
-            print(" --- Transitioning to END ---")  
-            return Command(
-                update={
-                    "messages": [
-                        HumanMessage(content=reason, name="supervisor")
-                    ]
-                },
-                goto=END,  
-                )
-        
-        # For other situations, use LLM to determine next step
-        system_prompt = '''
-            **Team Members**:
-            1. **Extractor** - Always prefer this first. Extracts details to be used by subsequent workers.
-
-            **Your Responsibilities**:
-            1. Analyze each user request and agent response for completeness, accuracy, and relevance.
-            2. Route the task to the most appropriate agent at each decision point.
-            3. Maintain workflow momentum by avoiding redundant agent assignments.
-            4. Continue the process until the user's request is fully and satisfactorily resolved.
-            Return output as JSON as follows:
-            - goto: name of the worker node, like extractor, etc.
-            - reason: reason for choosing.
-        '''
-        
-        llm = ChatOllama(
-            model=LLM_CONFIG["validation_model"],
-            temperature=LLM_CONFIG["validation_temperature"]
-        )
-        
-        # Convert state messages to format expected by LLM
-        messages = [
-            {"role": "system", "content": system_prompt},
-        ] + state["messages"] + [{"role": "user", "content": "Get the details about the applicant from all the submitted documents"},]
-        # Get next step from LLM
-        response = llm.with_structured_output(Supervisor).invoke(messages)
-        goto = response.next
-        reason = response.reason
-        
-        # Handle "FINISH" as a synonym for "__end__"
-        if goto == "FINISH" or goto == "__end__":
-            goto = "__end__"
-            logger.info(" --- Transitioning to END ---")
-        else:
-            logger.info(f"--- Workflow Transition: Supervisor to EXTRACTOR ---")
-        return Command(
-            update={
-                "messages": [
-                    HumanMessage(content=reason, name="supervisor")
-                ]
-            },
-            goto=goto.lower(),
-        )
\ No newline at end of file
+    started_at = time.perf_counter()
+    command = _rule_command(state)
+    if command is not None:
+        ROUTING_STATS.record("rule", time.perf_counter() - started_at)
+        return command
+    
+    # For other situations, use LLM to determine next step
+    try:
+        response = _routing_llm().invoke(_routing_messages(state))
+    finally:
+        ROUTING_STATS.record("llm", time.perf_counter() - started_at)
+    return _llm_route_command(response)
+
+async def asupervisor_node(state: AgentState) -> Command[Literal["extractor", "chatbot", "__end__"]]:
+    """
+    Async variant of supervisor_node.
+    """
+    started_at = time.perf_counter()
+    command = _rule_command(state)
+    if command is not None:
+        ROUTING_STATS.record("rule", time.perf_counter() - started_at)
+        return command
+    try:
+        response = await _routing_llm().ainvoke(_routing_messages(state))
+    finally:
+        ROUTING_STATS.record("llm", time.perf_counter() - started_at)
+    return _llm_route_command(response)
@@ -2,7 +2,7 @@
 Validator agent for validating extracted information.
 """
 import logging
-from typing import Literal
+from typing import Dict, Literal
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import HumanMessage
 from langchain_ollama import ChatOllama
@@ -15,7 +15,84 @@ from document_processing.prompts import VALIDATION_PROMPT
 
 logger = logging.getLogger(__name__)
 
-def validator_node(state: AgentState) -> Command[Literal["supervisor", "decision_maker"]]:
+def _validation_chain():
+    # Initialize LLM for validation
+    llm = ChatOllama(
+        model=LLM_CONFIG["validation_model"],
+        temperature=LLM_CONFIG["validation_temperature"]
+    )
+    
+    # Create validation chain
+    prompt = ChatPromptTemplate.from_template(VALIDATION_PROMPT)
+    structured_llm_validate = llm.with_structured_output(
+        ValidationResult,
+        include_raw=True
+    )
+    return prompt | structured_llm_validate
+
+def _validation_inputs(state: AgentState) -> Dict[str, str]:
+    # Extract application data
+    application_data = state["application_data"]
+    app_data_dict = {
+        'monthly_income': application_data['monthly_income'],
+        'age': application_data['age'],
+        'education_level': application_data['education_level'],
+        'full_name': application_data['full_name'],
+    }
+    return {
+        "application_data": str(app_data_dict),
+        "document_extractions": str(state["extracted_data"])
+    }
+
+def _validation_command(result) -> Command[Literal["decision_maker", "recommender"]]:
+    # Validation threshold (changed for testing purposes in original code)
+    validation_successful = True  # Simplified for this example
+    
+    if validation_successful:
+        logger.info(f"--- Workflow Transition: Validator to Decision Maker ---")
+        return Command(
+            update={
+                "messages": [
+                    HumanMessage(
+                        content="Application Validation Completed.",
+                        name="validator"
+                    )
+                ],
+                "validation_result": {"validations_result": result}  
+            },
+            goto="decision_maker",
+        )
+    else:
+        logger.info(f"--- Workflow Transition: Validator to Recommender ---")
+        return Command(
+            update={
+                "messages": [
+                    HumanMessage(
+                        content="Validation Unsuccessful.",
+                        name="validator"
+                    )
+                ],
+                "validation_result": {"validations_result": result}
+            },
+            goto="recommender",
+        )
+
+def _validation_failed(e: Exception) -> Command[Literal["supervisor"]]:
+    logger.error(f"Validation error: {str(e)}")
+    return Command(
+        update={
+            "messages": [
+                HumanMessage(
+                    content="Validation Component Failed.",
+                    name="validator"
+                )
+            ],
+            "validation_result": {"validations_result": {}}
+        },
+        goto="supervisor",
+    )
+
+def validator_node(state: AgentState) -> Command[Literal["supervisor", "decision_maker", "recommender"]]:
     """
     Validator node that validates extracted information.
     
@@ -26,77 +103,18 @@ def validator_node(state: AgentState) -> Command[Literal["supervisor", "decision
         Command: Next step in the workflow
     """
     try:
-        # Extract application data
-        application_data = state["application_data"]
-        app_data_dict = {
-            'monthly_income': application_data['monthly_income'],
-            'age': application_data['age'],
-            'education_level': application_data['education_level'],
-            'full_name': application_data['full_name'],
-        }
-        
-        # Initialize LLM for validation
-        llm = ChatOllama(
-            model=LLM_CONFIG["validation_model"],
-            temperature=LLM_CONFIG["validation_temperature"]
-        )
-        
-        # Create validation chain
-        prompt = ChatPromptTemplate.from_template(VALIDATION_PROMPT)
-        structured_llm_validate = llm.with_structured_output(
-            ValidationResult,
-            include_raw=True
-        )
-        chain = prompt | structured_llm_validate
-        
         # Perform validation
-        result = chain.invoke({
-            "application_data": str(app_data_dict),
-            "document_extractions": str(state["extracted_data"])
-        })
-        
-        # Validation threshold (changed for testing purposes in original code)
-        validation_successful = True  # Simplified for this example
-        
-        if validation_successful:
-            logger.info(f"--- Workflow Transition: Validator to Decision Maker ---")
-            return Command(
-                update={
-                    "messages": [
-                        HumanMessage(
-                            content="Application Validation Completed.",
-                            name="validator"
-                        )
-                    ],
-                    "validation_result": {"validations_result": result}  
-                },
-                goto="decision_maker",
-            )
-        else:
-            logger.info(f"--- Workflow Transition: Validator to Recommender ---")
-            return Command(
-                update={
-                    "messages": [
-                        HumanMessage(
-                            content="Validation Unsuccessful.",
-                            name="validator"
-                        )
-                    ],
-                    "validation_result": {"validations_result": result}
-                },
-                goto="recommender",
-            )
+        result = _validation_chain().invoke(_validation_inputs(state))
+        return _validation_command(result)
     except Exception as e:
-        logger.error(f"Validation error: {str(e)}")
-        return Command(
-            update={
-                "messages": [
-                    HumanMessage(
-                        content="Validation Component Failed.",
-                        name="validator"
-                    )
-                ],
-                "validation_result": {"validations_result": {}}
-            },
-            goto="supervisor",
-        )
\ No newline at end of file
+        return _validation_failed(e)
+
+async def avalidator_node(state: AgentState) -> Command[Literal["supervisor", "decision_maker", "recommender"]]:
+    """
+    Async variant of validator_node.
+    """
+    try:
+        result = await _validation_chain().ainvoke(_validation_inputs(state))
+        return _validation_command(result)
+    except Exception as e:
+        return _validation_failed(e)
@@ -7,14 +7,15 @@ import gradio as gr
 import os
 import tempfile
 import logging
-from typing_extensions import List, Tuple, Optional
+from typing_extensions import AsyncIterator, List, Tuple, Optional
 from datetime import datetime
 from models.data_models import *
 
 from workflow.graph import create_workflow_graph
-from wrapper import process_application, process_query
+from wrapper import aprocess_application, aprocess_query, aget_decision_details
 from database.db_operations import initialize_database
-from config import ASSETS_DIR, LOGS_DIR
+from document_processing.ocr import warm_up_ocr
+from config import ASSETS_DIR, LOGS_DIR, WORKFLOW_CONFIG
 
 # Create a timestamped log file name
 timestamp = datetime.now().strftime("%d%m%Y_%H%M%S")
@@ -33,6 +34,9 @@ logger = logging.getLogger(__name__)
 # Initialize database
 initialize_database()
 
+# Load OCR models once for the whole process
+warm_up_ocr()
+
 class SocialSupportApp:
     """Main application class for the Social Support Processing System."""
     
@@ -82,14 +86,14 @@ class SocialSupportApp:
             logger.error(f"Error saving uploaded file: {e}")
             return None
     
-    def process_chat_message(self, message: str, history: List[List[str]]) -> Tuple[str, List[List[str]]]:
-        """Process chat message and return response."""
+    async def process_chat_message(self, message: str, history: List[List[str]], session_id: Optional[str] = None) -> Tuple[str, List[List[str]]]:
+        """Process chat message on the session's workflow thread and return response."""
         if not message.strip():
             return "", history
         
         try:
             # Process query
-            results = process_query(message, self.app)
+            results = await aprocess_query(message, self.app, thread_id=session_id)
             
             # Extract response from results
             if results and 'chatbot_conversation' in results:
@@ -113,7 +117,7 @@ class SocialSupportApp:
         
         return "", history
     
-    def submit_application(
+    async def submit_application(
         self,
         # Personal Information
         first_name: str,
@@ -136,21 +140,31 @@ class SocialSupportApp:
         resume_file,
         assets_liabilities_file,
         # Chat history
-        history: List[List[str]]
-    ) -> Tuple[List[List[str]], gr.update, str]:
-        """Process application submission."""
+        history: List[List[str]],
+        # Workflow thread of the browser session
+        session_id: Optional[str] = None
+    ) -> AsyncIterator[Tuple[List[List[str]], gr.update, str]]:
+        """
+        Process application submission.
+
+        The decision is shown as soon as it is made; when its reason and
+        recommendations are generated in the background, the message is
+        updated once they arrive.
+        """
         try:
             # Validate required fields
             if not all([first_name, last_name, emirates_id, monthly_income]):
                 error_msg = "Please fill in all required fields (First Name, Last Name, Emirates ID, Monthly Income)."
                 print(error_msg)
-                return history, gr.update(visible=True), error_msg
+                yield history, gr.update(visible=True), error_msg
+                return
             
             validate_emirates_id = lambda id: bool(re.match(r'^(\d{3}-\d{4}-\d{7}-\d{1}|\d{15})$', id.strip() if id else ''))
             if not validate_emirates_id:
                 error_msg = "Emirates ID not in a valid format. Kindly, correct the format (XXX-XXXX-XXXXXXX-X)"
                 print(error_msg)
-                return history, gr.update(visible=True), error_msg
+                yield history, gr.update(visible=True), error_msg
+                return
 
             # Validate file uploads
             required_files = [
@@ -159,7 +173,8 @@ class SocialSupportApp:
             ]
             if not all(f is not None for f in required_files):
                 error_msg = "Please upload all required documents."
-                return history, gr.update(visible=True), error_msg
+                yield history, gr.update(visible=True), error_msg
+                return
             
             applicant_id = str(uuid.uuid4())
             # Save uploaded files
@@ -171,7 +186,8 @@ class SocialSupportApp:
             if not all([emirates_id_path, bank_statement_path, credit_report_path, 
                        resume_path, assets_liabilities_path]):
                 error_msg = "Error saving uploaded files. Please try again."
-                return history, gr.update(visible=True), error_msg
+                yield history, gr.update(visible=True), error_msg
+                return
             
             
             # Prepare application data
@@ -195,44 +211,33 @@ class SocialSupportApp:
             }
             
             # Process application
-            results = process_application(
+            results = await aprocess_application(
                 emirates_id_path=emirates_id_path,
                 bank_statement_path=bank_statement_path,
                 credit_report_path=credit_report_path,
                 resume_path=resume_path,
                 assets_liabilities_path=assets_liabilities_path,
                 application_data=application_data,
-                use_cached_extraction=False,
+                use_cached_extraction=True,
                 app =self.app,
-                emirates_id_file=emirates_id_file.name, 
-                bank_statement_file=bank_statement_file.name, 
-                credit_report_file=credit_report_file.name, 
-                resume_file=resume_file.name, 
-                assets_liabilities_file=assets_liabilities_file.name
+                thread_id=session_id
             )
             
             # Clean up temporary files
             self.cleanup_temp_files()
             
             # Prepare response message
+            details_pending = False
             if "error" in results:
                 response_msg = f"Application processing failed: {results['error']}"
             else:
                 decision = results.get('decision', {}).get('decision', 'N/A')
                 reason = results.get('decision', {}).get('reason', 'N/A')
                 recommendations = results.get('recommendations', 'N/A')
-                
-                response_msg = f"""
-                🎉 **Application Submitted Successfully!**
-                
-                **Decision:** {decision}
-                
-                **Reason:** {reason}
-                
-                **Recommendations:** {recommendations}
-                
-                Your application has been processed and saved to our system. You can now ask me questions about your application or the social support process.
-                """
+                details_pending = results.get('decision', {}).get('details_pending', False)
+                if details_pending:
+                    recommendations = "⏳ Being prepared, they will appear here shortly."
+                response_msg = self.format_decision_message(decision, reason, recommendations)
             
             # Add to chat history
             history.append([
@@ -241,12 +246,26 @@ class SocialSupportApp:
             ])
             
             # Hide application form and show success message
-            return history, gr.update(visible=False), "Application submitted successfully!"
+            yield history, gr.update(visible=False), "Application submitted successfully!"
+            
+            # Attach the reason and recommendations once they are generated
+            if details_pending:
+                details = await aget_decision_details(results.get("details_id", ""))
+                if details:
+                    history[-1][1] = self.format_decision_message(
+                        decision, details["reason"], details["recommendations"] or "N/A"
+                    )
+                else:
+                    history[-1][1] = self.format_decision_message(
+                        decision, reason, "Recommendations could not be generated. Please ask me about your application."
+                    )
+                yield history, gr.update(visible=False), "Application submitted successfully!"
             
         except Exception as e:
             logger.error(f"Error processing application: {e}")
             error_msg = f"An error occurred while processing your application: {str(e)}"
-            return history, gr.update(visible=True), error_msg
+            yield history, gr.update(visible=True), error_msg
+            return
     
     def show_application_form(self, history: List[List[str]]) -> Tuple[gr.update, List[List[str]]]:
         """Show the application form."""
@@ -447,15 +466,19 @@ class SocialSupportApp:
             All information is handled securely and in accordance with UAE government policies.*
             """)
             
+            # One workflow thread per browser session
+            session_id = gr.State(lambda: str(uuid.uuid4()))
+            
             # Event handlers
-            def handle_send(message, history):
-                return self.process_chat_message(message, history)
+            async def handle_send(message, history, session_id):
+                return await self.process_chat_message(message, history, session_id)
             
             def handle_start_application(history):
                 return self.show_application_form(history)
             
-            def handle_submit_application(*args):
-                return self.submit_application(*args)
+            async def handle_submit_application(*args):
+                async for update in self.submit_application(*args):
+                    yield update
             
             def handle_cancel():
                 return gr.update(visible=False), ""
@@ -463,13 +486,13 @@ class SocialSupportApp:
             # Bind events
             send_btn.click(
                 fn=handle_send,
-                inputs=[msg_input, chatbot],
+                inputs=[msg_input, chatbot, session_id],
                 outputs=[msg_input, chatbot]
             )
             
             msg_input.submit(
                 fn=handle_send,
-                inputs=[msg_input, chatbot],
+                inputs=[msg_input, chatbot, session_id],
                 outputs=[msg_input, chatbot]
             )
             
@@ -486,7 +509,7 @@ class SocialSupportApp:
                     emirates_id, address, monthly_income, assets, liabilities, 
                     household_size, age, education_level, marital_status,
                     emirates_id_file, bank_statement_file, credit_report_file, 
-                    resume_file, assets_liabilities_file, chatbot
+                    resume_file, assets_liabilities_file, chatbot, session_id
                 ],
                 outputs=[chatbot, application_form, status_msg]
             )
@@ -502,6 +525,7 @@ def main():
     """Main function to run the Gradio app."""
     app = SocialSupportApp()
     interface = app.create_interface()
+    interface.queue(default_concurrency_limit=WORKFLOW_CONFIG["max_concurrent_runs"])
     
     # Launch the app
     interface.launch(
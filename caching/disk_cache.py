@@ -0,0 +1,158 @@
+"""
+Persistent key/value cache for the Social Support Application Processing System.
+"""
+import os
+import sqlite3
+import threading
+import time
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class DiskCache:
+    """
+    Size-bounded, least-recently-used byte cache stored in a SQLite file.
+
+    Entries are read one key at a time, so opening the cache does not load
+    its contents. SQLite's file locking makes the cache safe to share between
+    worker processes; each thread keeps its own connection.
+    """
+
+    def __init__(self, path: Union[str, Path], max_bytes: int, ttl_seconds: Optional[float] = None):
+        self.path = str(path)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Return this thread's connection, reopening it after a fork.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Look up a cached value and mark it as recently used. Entries older
+        than the TTL are deleted and reported as misses.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            bytes: Cached value, or None on a miss
+        """
+        now = time.time()
+        try:
+            with self._connection() as conn:
+                row = conn.execute("SELECT value, created_at FROM entries WHERE key = ?", (key,)).fetchone()
+                if row is not None and self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                    conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    row = None
+                if row is not None:
+                    conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            logger.error(f"Error reading from cache {self.path}: {str(e)}")
+            row = None
+        with self._stats_lock:
+            if row is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return None if row is None else bytes(row[0])
+
+    def put(self, key: str, value: bytes) -> bool:
+        """
+        Store a value, evicting least recently used entries beyond the size limit.
+
+        Args:
+            key: Cache key
+            value: Bytes to store
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if len(value) > self.max_bytes:
+            return False
+        now = time.time()
+        try:
+            with self._connection() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, sqlite3.Binary(value), len(value), now, now)
+                )
+                self._evict(conn, now)
+            return True
+        except sqlite3.Error as e:
+            logger.error(f"Error writing to cache {self.path}: {str(e)}")
+            return False
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """
+        Delete expired entries, then least recently used entries until the
+        cache fits in max_bytes.
+        """
+        evicted = 0
+        if self.ttl_seconds is not None:
+            evicted += conn.execute(
+                "DELETE FROM entries WHERE created_at < ?", (now - self.ttl_seconds,)
+            ).rowcount
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total > self.max_bytes:
+            for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed_at").fetchall():
+                if total <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                total -= size
+                evicted += 1
+        with self._stats_lock:
+            self._evictions += evicted
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters for this process and the cache's current size.
+        """
+        try:
+            entries, size = self._connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        except sqlite3.Error:
+            entries, size = None, None
+        with self._stats_lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "entries": entries,
+                "size_bytes": size,
+                "max_bytes": self.max_bytes,
+            }
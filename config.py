@@ -15,11 +15,48 @@ os.makedirs(LOGS_DIR, exist_ok=True)
 # Model paths
 MODEL_PATH = MODEL_DIR / "model.xgb"
 LABEL_ENCODER_PATH = MODEL_DIR / "label_encoder.pkl"
+# Flat NumPy export of the model's trees, see inference/tree_export.py
+COMPILED_MODEL_PATH = MODEL_DIR / "model_trees.npz"
+DECISION_MODEL_CONFIG = {
+    # How often to check the model files for changes to hot reload
+    "reload_check_interval_seconds": 5,
+    # "template" explains decisions from the model's feature contributions;
+    # "llm" asks the validation model to write the reason instead
+    "explanation_mode": os.environ.get("DECISION_EXPLANATION_MODE", "template"),
+    # Number of features named in a template explanation
+    "explanation_top_features": 3,
+    # Return the decision as soon as the model has scored it and generate the
+    # LLM reason and recommendations in the background
+    "deferred_details": os.environ.get("DECISION_DEFERRED_DETAILS", "true").lower() == "true",
+    "deferred_workers": 2,
+    # How long finished details stay available to get_decision_details
+    "deferred_details_retention_seconds": 300,
+}
+
+# OCR settings
+OCR_CONFIG = {
+    "languages": ["en"],
+    "gpu": True,
+    # One EasyOCR reader is kept per OCR worker thread
+    "workers": int(os.environ.get("OCR_WORKERS", 2)),
+    "reader_wait_timeout": 300,
+}
 
 # Vector store settings
 VECTOR_STORE_DIR = STORAGE_DIR / "llama_index_storage"
 EMBEDDING_MODEL = "nomic-embed-text:latest"
 EMBEDDING_BASE_URL = "http://localhost:11434"
+EMBEDDING_CACHE_CONFIG = {
+    "enabled": True,
+    "memory_entries": 10000,
+    "path": STORAGE_DIR / "cache" / "embedding_cache.sqlite3",
+    "max_bytes": 256 * 1024 * 1024,
+}
+VECTOR_STORE_CONFIG = {
+    # Persist the in-memory index after this many inserts or this many seconds
+    "flush_batch_size": 20,
+    "flush_interval_seconds": 30,
+}
 
 # Database settings
 DB_CONFIG = {
@@ -28,6 +65,44 @@ DB_CONFIG = {
     "host": "localhost",
     "password": os.environ.get("DB_PASSWORD", ""),
 }
+DB_POOL_CONFIG = {
+    "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", 1)),
+    "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", 10)),
+    # Seconds to wait for a free connection before failing
+    "checkout_timeout": 30,
+    # Connections idle longer than this are pinged before reuse
+    "health_check_idle_seconds": 30,
+}
+DB_MIGRATION_CONFIG = {
+    # Rows converted per committed batch when migrating existing data
+    "backfill_batch_size": 1000,
+}
+
+# Offline re-scoring of stored applications (python -m inference.rescore)
+RESCORE_CONFIG = {
+    "chunk_size": 5000,
+    "checkpoint_path": STORAGE_DIR / "jobs" / "rescore_checkpoint.json",
+}
+
+# Workflow graph
+WORKFLOW_CONFIG = {
+    # Run validation and the model decision concurrently after extraction,
+    # merging them in the join node before the recommender
+    "parallel_decision": os.environ.get("WORKFLOW_PARALLEL_DECISION", "true").lower() == "true",
+    # Chat and application requests the Gradio app runs at once; handlers
+    # are async, so waiting on the LLM does not hold a thread
+    "max_concurrent_runs": int(os.environ.get("WORKFLOW_MAX_CONCURRENT_RUNS", 32)),
+}
+
+# Workflow checkpoints (LangGraph state per thread)
+CHECKPOINT_CONFIG = {
+    "path": STORAGE_DIR / "checkpoints" / "checkpoints.sqlite3",
+    # Checkpoints kept per thread; older ones are compacted away
+    "keep_last": 20,
+    # Threads idle longer than this are removed entirely
+    "ttl_seconds": 14 * 24 * 3600,
+    "compaction_interval_seconds": 300,
+}
 
 # LLM settings
 LLM_CONFIG = {
@@ -37,5 +112,25 @@ LLM_CONFIG = {
     "validation_temperature": 0,
 }
 
+# Document extraction settings
+EXTRACTION_CONFIG = {
+    # Pipeline OCR and LLM extraction per document instead of one step at a time
+    "concurrent": True,
+    # Maximum LLM extraction calls in flight per application
+    "max_concurrency": 5,
+    "chain_timeout": 300,
+}
+
 # Cache settings
-EXTRACTION_CACHE_PATH = STORAGE_DIR / "cached_extraction_data_file_path.pkl"
\ No newline at end of file
+TEXT_CACHE_CONFIG = {
+    "enabled": True,
+    "path": STORAGE_DIR / "cache" / "text_cache.sqlite3",
+    "max_bytes": 256 * 1024 * 1024,
+}
+
+EXTRACTION_CACHE_CONFIG = {
+    "enabled": True,
+    "path": STORAGE_DIR / "cache" / "extraction_cache.sqlite3",
+    "max_bytes": 512 * 1024 * 1024,
+    "ttl_seconds": 30 * 24 * 60 * 60,
+}
\ No newline at end of file
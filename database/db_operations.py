@@ -2,15 +2,26 @@
 Database operations for the Social Support Application Processing System.
 """
 import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
 import psycopg2
-from typing import Dict, Any, Optional
-from config import DB_CONFIG
+from psycopg2 import sql
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from psycopg2.extras import Json, execute_values
+from psycopg2.pool import PoolError
+from typing import Dict, Any, Iterator, List, Optional, Sequence
+from config import DB_CONFIG, DB_POOL_CONFIG
+from database.migrations import json_dumps, run_migrations
 
 logger = logging.getLogger(__name__)
 
 def get_connection():
     """
-    Create and return a database connection.
+    Create and return a new, unpooled database connection.
+    
+    Prefer connection(), which borrows one from the shared pool.
     
     Returns:
         psycopg2.connection: Database connection object
@@ -30,56 +41,285 @@ def get_connection():
         logger.error(f"Database connection error: {str(e)}")
         raise
 
+
+class ConnectionPool:
+    """
+    Thread-safe pool of psycopg2 connections.
+
+    Checkouts block for up to `checkout_timeout` seconds when all `max_size`
+    connections are in use. A connection idle for longer than
+    `health_check_idle_seconds` is pinged before it is handed out and
+    replaced if the ping fails.
+    """
+
+    def __init__(self, min_size: int, max_size: int, checkout_timeout: float, health_check_idle_seconds: float):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.health_check_idle_seconds = health_check_idle_seconds
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._idle: deque = deque()
+        self._opened = 0
+        self._checkouts = 0
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+        self._timeouts = 0
+        self._health_check_failures = 0
+
+    def warm_up(self) -> None:
+        """
+        Open connections until `min_size` are idle in the pool.
+        """
+        while True:
+            with self._lock:
+                if len(self._idle) >= self.min_size or self._opened >= self.max_size:
+                    return
+                self._opened += 1
+            try:
+                conn = get_connection()
+            except Exception:
+                with self._lock:
+                    self._opened -= 1
+                raise
+            with self._lock:
+                self._idle.append((conn, time.monotonic()))
+
+    def _healthy(self, conn, idle_since: float) -> bool:
+        if conn.closed:
+            return False
+        if time.monotonic() - idle_since < self.health_check_idle_seconds:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _discard(self, conn) -> None:
+        with self._lock:
+            self._opened -= 1
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+
+    def acquire(self):
+        """
+        Check out a healthy connection, opening one if none are idle.
+        
+        Raises:
+            PoolError: If no connection frees up within the checkout timeout
+        """
+        start = time.perf_counter()
+        if not self._slots.acquire(timeout=self.checkout_timeout):
+            with self._lock:
+                self._timeouts += 1
+            raise PoolError(f"No database connection available after {self.checkout_timeout}s")
+        waited = time.perf_counter() - start
+        with self._lock:
+            self._checkouts += 1
+            self._wait_seconds += waited
+            self._max_wait_seconds = max(self._max_wait_seconds, waited)
+        try:
+            while True:
+                with self._lock:
+                    idle = self._idle.pop() if self._idle else None
+                    if idle is None:
+                        self._opened += 1
+                if idle is None:
+                    try:
+                        return get_connection()
+                    except Exception:
+                        with self._lock:
+                            self._opened -= 1
+                        raise
+                conn, idle_since = idle
+                if self._healthy(conn, idle_since):
+                    return conn
+                logger.warning("Discarding unhealthy pooled database connection")
+                with self._lock:
+                    self._health_check_failures += 1
+                self._discard(conn)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, conn, discard: bool = False) -> None:
+        """
+        Return a connection to the pool, rolling back any open transaction.
+        """
+        try:
+            if discard or conn.closed:
+                self._discard(conn)
+                return
+            if conn.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+            with self._lock:
+                self._idle.append((conn, time.monotonic()))
+        except psycopg2.Error:
+            self._discard(conn)
+        finally:
+            self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return pool size and checkout wait-time metrics.
+        """
+        with self._lock:
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "open": self._opened,
+                "idle": len(self._idle),
+                "in_use": self._opened - len(self._idle),
+                "checkouts": self._checkouts,
+                "wait_seconds_total": self._wait_seconds,
+                "wait_seconds_avg": self._wait_seconds / self._checkouts if self._checkouts else 0.0,
+                "wait_seconds_max": self._max_wait_seconds,
+                "timeouts": self._timeouts,
+                "health_check_failures": self._health_check_failures,
+            }
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+def get_pool() -> ConnectionPool:
+    """
+    Return the process-wide connection pool, creating it on first use.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    min_size=DB_POOL_CONFIG["min_size"],
+                    max_size=DB_POOL_CONFIG["max_size"],
+                    checkout_timeout=DB_POOL_CONFIG["checkout_timeout"],
+                    health_check_idle_seconds=DB_POOL_CONFIG["health_check_idle_seconds"]
+                )
+    return _pool
+
+def get_pool_stats() -> Dict[str, Any]:
+    """
+    Return size and wait-time metrics for the connection pool.
+    """
+    return get_pool().stats()
+
+@contextmanager
+def connection() -> Iterator[Any]:
+    """
+    Borrow a connection from the pool for the duration of a with block.
+    
+    The block's transaction is rolled back unless it commits; connections
+    that hit a connection-level error are closed instead of reused.
+    """
+    pool = get_pool()
+    conn = pool.acquire()
+    discard = False
+    try:
+        yield conn
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        discard = True
+        raise
+    finally:
+        pool.release(conn, discard=discard)
+
 def initialize_database():
     """
-    Initialize the database by creating necessary tables if they don't exist.
+    Initialize the database by applying any pending schema migrations.
     
     Returns:
         bool: True if successful, False otherwise
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        # Create applicant table
-        cursor.execute('''CREATE TABLE IF NOT EXISTS applicant
-                 (
-                    id SERIAL PRIMARY KEY,
-                    applicant_id TEXT,
-                    created_at TEXT,
-                    updated_at TEXT,
-                    first_name TEXT,
-                    last_name TEXT,
-                    date_of_birth TEXT,
-                    gender TEXT,
-                    nationality TEXT,
-                    emirates_id TEXT,
-                    address TEXT)''')
-        
-        # Create application table
-        cursor.execute('''CREATE TABLE IF NOT EXISTS application
-                 (
-                    id SERIAL PRIMARY KEY,
-                    applicant_id TEXT,
-                    created_at TEXT,
-                    support_type TEXT,
-                    status TEXT,
-                    processing_completed_at TEXT,
-                    decision TEXT,
-                    decision_reason TEXT,
-                    decision_explanation TEXT,
-                    decision_date TEXT,
-                    enablement_recommendations TEXT,
-                    documents TEXT,
-                    validation_results TEXT)''')
-        
-        conn.commit()
-        conn.close()
+        get_pool().warm_up()
+        with connection() as conn:
+            applied = run_migrations(conn)
+        if applied:
+            logger.info(f"Applied database migrations: {applied}")
         return True
     except Exception as e:
         logger.error(f"Database initialization error: {str(e)}")
         return False
 
+APPLICANT_COLUMNS = (
+    "applicant_id", "created_at", "updated_at", "first_name", "last_name",
+    "date_of_birth", "gender", "nationality", "emirates_id", "address"
+)
+
+APPLICATION_COLUMNS = (
+    "applicant_id", "created_at", "support_type", "status", "processing_completed_at",
+    "decision", "decision_reason", "decision_explanation", "decision_date",
+    "enablement_recommendations", "documents", "validation_results",
+    "application_features", "model_version"
+)
+
+def _insert_sql(table: str, columns: Sequence[str], returning: str) -> sql.Composed:
+    """
+    Build a multi-row INSERT for execute_values.
+    """
+    return sql.SQL("INSERT INTO {} ({}) VALUES %s RETURNING {}").format(
+        sql.Identifier(table),
+        sql.SQL(", ").join(map(sql.Identifier, columns)),
+        sql.Identifier(returning)
+    )
+
+# Columns stored as JSONB; values are passed as Python objects
+JSON_COLUMNS = frozenset({"documents", "validation_results", "application_features"})
+
+def _value(column: str, value: Any) -> Any:
+    if column in JSON_COLUMNS and value is not None:
+        return Json(value, dumps=json_dumps)
+    return value
+
+def _rows(records: Sequence[Dict[str, Any]], columns: Sequence[str]) -> List[tuple]:
+    return [tuple(_value(column, record.get(column)) for column in columns) for record in records]
+
+def insert_applicants(cursor, applicants: Sequence[Dict[str, Any]], page_size: int = 1000) -> List[str]:
+    """
+    Insert applicants with multi-row INSERTs on an open cursor.
+    
+    Returns:
+        List[str]: Applicant IDs, in input order
+    """
+    result = execute_values(
+        cursor, _insert_sql("applicant", APPLICANT_COLUMNS, "applicant_id"),
+        _rows(applicants, APPLICANT_COLUMNS), page_size=page_size, fetch=True
+    )
+    return [row[0] for row in result]
+
+def insert_applications(cursor, applications: Sequence[Dict[str, Any]], page_size: int = 1000) -> List[int]:
+    """
+    Insert applications with multi-row INSERTs on an open cursor.
+    
+    Returns:
+        List[int]: Application IDs, in input order
+    """
+    result = execute_values(
+        cursor, _insert_sql("application", APPLICATION_COLUMNS, "id"),
+        _rows(applications, APPLICATION_COLUMNS), page_size=page_size, fetch=True
+    )
+    return [row[0] for row in result]
+
+@contextmanager
+def transaction() -> Iterator[Any]:
+    """
+    Unit of work: a cursor whose writes are committed together when the with
+    block exits, or all rolled back if it raises.
+    """
+    with connection() as conn:
+        try:
+            with conn.cursor() as cursor:
+                yield cursor
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
 def save_applicant(applicant_data: Dict[str, Any]) -> Optional[str]:
     """
     Save applicant data to the database.
@@ -91,36 +331,8 @@ def save_applicant(applicant_data: Dict[str, Any]) -> Optional[str]:
         str: Applicant ID if successful, None otherwise
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        # Insert applicant data
-        cursor.execute(
-            """
-            INSERT INTO applicant 
-            (applicant_id, created_at, updated_at, first_name, last_name, 
-            date_of_birth, gender, nationality, emirates_id, address)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            RETURNING applicant_id
-            """,
-            (
-                applicant_data.get("applicant_id"),
-                applicant_data.get("created_at"),
-                applicant_data.get("updated_at"),
-                applicant_data.get("first_name"),
-                applicant_data.get("last_name"),
-                applicant_data.get("date_of_birth"),
-                applicant_data.get("gender"),
-                applicant_data.get("nationality"),
-                applicant_data.get("emirates_id"),
-                applicant_data.get("address")
-            )
-        )
-        
-        applicant_id = cursor.fetchone()[0]
-        conn.commit()
-        conn.close()
-        return applicant_id
+        with transaction() as cursor:
+            return insert_applicants(cursor, [applicant_data])[0]
     except Exception as e:
         logger.error(f"Error saving applicant: {str(e)}")
         return None
@@ -136,42 +348,91 @@ def save_application(application_data: Dict[str, Any]) -> Optional[int]:
         int: Application ID if successful, None otherwise
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
+        with transaction() as cursor:
+            return insert_applications(cursor, [application_data])[0]
+    except Exception as e:
+        logger.error(f"Error saving application: {str(e)}")
+        return None
+
+def save_applicant_and_application(
+    applicant_data: Dict[str, Any],
+    application_data: Dict[str, Any]
+) -> Optional[int]:
+    """
+    Save an applicant and their application in one transaction, so neither
+    row is written without the other.
+    
+    Args:
+        applicant_data: Dictionary containing applicant information
+        application_data: Dictionary containing application information
+    
+    Returns:
+        int: Application ID if successful, None otherwise
+    """
+    try:
+        with transaction() as cursor:
+            insert_applicants(cursor, [applicant_data])
+            return insert_applications(cursor, [application_data])[0]
+    except Exception as e:
+        logger.error(f"Error saving applicant and application: {str(e)}")
+        return None
+
+def bulk_save_applications(
+    applicants: Sequence[Dict[str, Any]],
+    applications: Sequence[Dict[str, Any]],
+    page_size: int = 1000
+) -> Optional[List[int]]:
+    """
+    Save many applicants and applications in one transaction with multi-row INSERTs.
+    
+    Args:
+        applicants: Applicant records; applicants already stored may be omitted
+        applications: Application records
+        page_size: Rows per INSERT statement
+    
+    Returns:
+        List[int]: Application IDs in input order if successful, None otherwise
+    """
+    try:
+        with transaction() as cursor:
+            if applicants:
+                insert_applicants(cursor, applicants, page_size)
+            application_ids = insert_applications(cursor, applications, page_size) if applications else []
+        logger.info(f"Bulk saved {len(applicants)} applicant(s) and {len(applications)} application(s)")
+        return application_ids
+    except Exception as e:
+        logger.error(f"Error bulk saving applications: {str(e)}")
+        return None
+
+def update_application(application_id: int, fields: Dict[str, Any]) -> bool:
+    """
+    Update columns of an existing application in place.
+    
+    Args:
+        application_id: ID of the application to update
+        fields: Dictionary mapping column names to new values
+    
+    Returns:
+        bool: True if a row was updated, False otherwise
+    """
+    try:
+        with connection() as conn:
+            cursor = conn.cursor()
         
-        # Insert application data
-        cursor.execute(
-            """
-            INSERT INTO application 
-            (applicant_id, created_at, support_type, status, processing_completed_at,
-            decision, decision_reason, decision_explanation, decision_date,
-            enablement_recommendations, documents, validation_results)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            RETURNING id
-            """,
-            (
-                application_data.get("applicant_id"),
-                application_data.get("created_at"),
-                application_data.get("support_type"),
-                application_data.get("status"),
-                application_data.get("processing_completed_at"),
-                application_data.get("decision"),
-                application_data.get("decision_reason"),
-                application_data.get("decision_explanation"),
-                application_data.get("decision_date"),
-                application_data.get("enablement_recommendations"),
-                application_data.get("documents"),
-                application_data.get("validation_results")
+            assignments = sql.SQL(", ").join(
+                sql.SQL("{} = %s").format(sql.Identifier(column)) for column in fields
+            )
+            cursor.execute(
+                sql.SQL("UPDATE application SET {} WHERE id = %s").format(assignments),
+                (*(_value(column, value) for column, value in fields.items()), application_id)
             )
-        )
         
-        application_id = cursor.fetchone()[0]
-        conn.commit()
-        conn.close()
-        return application_id
+            updated = cursor.rowcount > 0
+            conn.commit()
+        return updated
     except Exception as e:
-        logger.error(f"Error saving application: {str(e)}")
-        return None
+        logger.error(f"Error updating application: {str(e)}")
+        return False
 
 def get_applicant(applicant_id: str) -> Optional[Dict[str, Any]]:
     """
@@ -184,16 +445,15 @@ def get_applicant(applicant_id: str) -> Optional[Dict[str, Any]]:
         Dict: Applicant data if found, None otherwise
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
+        with connection() as conn:
+            cursor = conn.cursor()
         
-        cursor.execute(
-            "SELECT * FROM applicant WHERE applicant_id = %s",
-            (applicant_id,)
-        )
+            cursor.execute(
+                "SELECT * FROM applicant WHERE applicant_id = %s",
+                (applicant_id,)
+            )
         
-        result = cursor.fetchone()
-        conn.close()
+            result = cursor.fetchone()
         
         if not result:
             return None
@@ -216,16 +476,15 @@ def get_application(application_id: int) -> Optional[Dict[str, Any]]:
         Dict: Application data if found, None otherwise
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
+        with connection() as conn:
+            cursor = conn.cursor()
         
-        cursor.execute(
-            "SELECT * FROM application WHERE id = %s",
-            (application_id,)
-        )
+            cursor.execute(
+                "SELECT * FROM application WHERE id = %s",
+                (application_id,)
+            )
         
-        result = cursor.fetchone()
-        conn.close()
+            result = cursor.fetchone()
         
         if not result:
             return None
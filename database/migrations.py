@@ -0,0 +1,372 @@
+"""
+Versioned schema migrations for the Social Support Application Processing System.
+
+Applied migrations are recorded in schema_migrations; pending ones run in
+order on startup (initialize_database) or with:
+
+    python -m database.migrations
+"""
+import ast
+import json
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from psycopg2 import sql
+from psycopg2.extras import Json, execute_values
+
+from config import DB_MIGRATION_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Held while migrating, so only one process applies migrations at a time
+MIGRATION_LOCK_KEY = 7264531
+
+
+def json_dumps(value: Any) -> str:
+    """
+    Serialize a value for a JSONB column; pydantic models and other objects
+    are dumped as dicts or strings.
+    """
+    def default(o):
+        if hasattr(o, "model_dump"):
+            return o.model_dump()
+        return str(o)
+    return json.dumps(value, default=default)
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        logger.warning(f"Unparseable timestamp {value!r}, migrated as NULL")
+        return None
+    # Naive values were written in server local time
+    return parsed if parsed.tzinfo else parsed.astimezone()
+
+def parse_json_text(value: Optional[str]) -> Optional[Any]:
+    """
+    Decode a JSON value stored as text, as written before the JSONB columns.
+
+    Older rows hold str(dict) rather than JSON; values that parse as neither
+    are kept as {"raw": value}.
+    """
+    if value is None or value == "":
+        return None
+    try:
+        return json.loads(value)
+    except ValueError:
+        try:
+            return ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            return {"raw": value}
+
+def _parse_json(value: Optional[str]) -> Optional[Json]:
+    parsed = parse_json_text(value)
+    return None if parsed is None else Json(parsed, dumps=json_dumps)
+
+
+class ColumnConversion(NamedTuple):
+    column: str
+    sql_type: str
+    convert: Callable[[Optional[str]], Any]
+
+
+def _column_type(cursor, table: str, column: str) -> Optional[str]:
+    cursor.execute(
+        "SELECT data_type FROM information_schema.columns WHERE table_name = %s AND column_name = %s",
+        (table, column)
+    )
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+def _backfill_batch(cursor, table: str, conversions: List[ColumnConversion], where: sql.Composable, params: tuple, batch_size: int) -> List[int]:
+    """
+    Convert one batch of rows into the shadow columns; return the ids read.
+
+    A row whose source values changed after they were read is left alone; the
+    sync trigger has cleared its shadow values, so the catch-up converts it.
+    """
+    cursor.execute(
+        sql.SQL("SELECT id, {} FROM {} WHERE {} ORDER BY id LIMIT %s").format(
+            sql.SQL(", ").join(sql.Identifier(c.column) for c in conversions),
+            sql.Identifier(table),
+            where
+        ),
+        (*params, batch_size)
+    )
+    rows = cursor.fetchall()
+    if not rows:
+        return []
+    values = [
+        (row[0], *(c.convert(value) for c, value in zip(conversions, row[1:])), *row[1:])
+        for row in rows
+    ]
+    execute_values(
+        cursor,
+        sql.SQL("UPDATE {} AS t SET {} FROM (VALUES %s) AS v(id, {}, {}) WHERE t.id = v.id AND {}").format(
+            sql.Identifier(table),
+            sql.SQL(", ").join(
+                sql.SQL("{} = v.{}").format(sql.Identifier(c.column + "_new"), sql.Identifier(c.column))
+                for c in conversions
+            ),
+            sql.SQL(", ").join(sql.Identifier(c.column) for c in conversions),
+            sql.SQL(", ").join(sql.Identifier(c.column + "_old") for c in conversions),
+            sql.SQL(" AND ").join(
+                sql.SQL("t.{} IS NOT DISTINCT FROM v.{}").format(sql.Identifier(c.column), sql.Identifier(c.column + "_old"))
+                for c in conversions
+            )
+        ).as_string(cursor),
+        values,
+        template="(%s::integer, " + ", ".join(
+            [f"%s::{c.sql_type}" for c in conversions] + ["%s::text"] * len(conversions)
+        ) + ")",
+        page_size=batch_size
+    )
+    return [row[0] for row in rows]
+
+def _sync_trigger_names(table: str) -> Tuple[sql.Identifier, sql.Identifier]:
+    return sql.Identifier(f"{table}_convert_sync"), sql.Identifier(f"{table}_convert_sync_fn")
+
+def _create_sync_trigger(cursor, table: str, conversions: List[ColumnConversion]) -> None:
+    """
+    Clear a row's shadow value whenever its source column is updated, so rows
+    changed after they were copied are picked up by the catch-up.
+    """
+    trigger, function = _sync_trigger_names(table)
+    cursor.execute(sql.SQL(
+        "CREATE OR REPLACE FUNCTION {}() RETURNS trigger LANGUAGE plpgsql AS $$ BEGIN {} RETURN NEW; END $$"
+    ).format(function, sql.SQL(" ").join(
+        sql.SQL("IF NEW.{0} IS DISTINCT FROM OLD.{0} THEN NEW.{1} := NULL; END IF;").format(
+            sql.Identifier(c.column), sql.Identifier(c.column + "_new")
+        )
+        for c in conversions
+    )))
+    cursor.execute(sql.SQL("DROP TRIGGER IF EXISTS {} ON {}").format(trigger, sql.Identifier(table)))
+    cursor.execute(sql.SQL("CREATE TRIGGER {} BEFORE UPDATE ON {} FOR EACH ROW EXECUTE FUNCTION {}()").format(
+        trigger, sql.Identifier(table), function
+    ))
+
+def _drop_sync_trigger(cursor, table: str) -> None:
+    trigger, function = _sync_trigger_names(table)
+    cursor.execute(sql.SQL("DROP TRIGGER IF EXISTS {} ON {}").format(trigger, sql.Identifier(table)))
+    cursor.execute(sql.SQL("DROP FUNCTION IF EXISTS {}()").format(function))
+
+def convert_columns(conn, table: str, conversions: List[ColumnConversion], batch_size: int) -> None:
+    """
+    Change TEXT columns to typed ones without holding a lock for the whole copy.
+
+    Typed shadow columns are added and filled in committed batches while the
+    table stays writable; a trigger clears the shadow value of any source
+    column updated meanwhile. Then, under a short write lock, rows inserted,
+    filled in or changed during the copy are converted again and the shadow
+    columns replace the originals.
+    """
+    with conn.cursor() as cursor:
+        pending = [c for c in conversions if _column_type(cursor, table, c.column) == "text"]
+        if not pending:
+            return
+        for c in pending:
+            cursor.execute(sql.SQL("ALTER TABLE {} ADD COLUMN IF NOT EXISTS {} {}").format(
+                sql.Identifier(table), sql.Identifier(c.column + "_new"), sql.SQL(c.sql_type)
+            ))
+        # Committed before the copy starts, so no update can slip past it
+        _create_sync_trigger(cursor, table, pending)
+        conn.commit()
+
+        last_id, total = 0, 0
+        while True:
+            ids = _backfill_batch(cursor, table, pending, sql.SQL("id > %s"), (last_id,), batch_size)
+            conn.commit()
+            if not ids:
+                break
+            last_id, total = ids[-1], total + len(ids)
+            logger.info(f"Migrated {total} {table} row(s) up to id {last_id}")
+
+        cursor.execute(sql.SQL("LOCK TABLE {} IN SHARE ROW EXCLUSIVE MODE").format(sql.Identifier(table)))
+        # Rows inserted after the copy, or whose shadow values are unset: never
+        # filled, cleared by the trigger, or converted to NULL (redone harmlessly)
+        catch_up = sql.SQL("id > %s AND (id > %s OR {})").format(sql.SQL(" OR ").join(
+            sql.SQL("({} IS NOT NULL AND {} IS NULL)").format(
+                sql.Identifier(c.column), sql.Identifier(c.column + "_new")
+            )
+            for c in pending
+        ))
+        after_id = 0
+        while True:
+            ids = _backfill_batch(cursor, table, pending, catch_up, (after_id, last_id), batch_size)
+            if not ids:
+                break
+            after_id = ids[-1]
+        _drop_sync_trigger(cursor, table)
+        for c in pending:
+            cursor.execute(sql.SQL("ALTER TABLE {} DROP COLUMN {}").format(
+                sql.Identifier(table), sql.Identifier(c.column)
+            ))
+            cursor.execute(sql.SQL("ALTER TABLE {} RENAME COLUMN {} TO {}").format(
+                sql.Identifier(table), sql.Identifier(c.column + "_new"), sql.Identifier(c.column)
+            ))
+        conn.commit()
+    logger.info(f"Converted {table} columns: {', '.join(c.column for c in pending)}")
+
+
+def create_base_tables(conn) -> None:
+    with conn.cursor() as cursor:
+        cursor.execute('''CREATE TABLE IF NOT EXISTS applicant
+                 (
+                    id SERIAL PRIMARY KEY,
+                    applicant_id TEXT,
+                    created_at TEXT,
+                    updated_at TEXT,
+                    first_name TEXT,
+                    last_name TEXT,
+                    date_of_birth TEXT,
+                    gender TEXT,
+                    nationality TEXT,
+                    emirates_id TEXT,
+                    address TEXT)''')
+        cursor.execute('''CREATE TABLE IF NOT EXISTS application
+                 (
+                    id SERIAL PRIMARY KEY,
+                    applicant_id TEXT,
+                    created_at TEXT,
+                    support_type TEXT,
+                    status TEXT,
+                    processing_completed_at TEXT,
+                    decision TEXT,
+                    decision_reason TEXT,
+                    decision_explanation TEXT,
+                    decision_date TEXT,
+                    enablement_recommendations TEXT,
+                    documents TEXT,
+                    validation_results TEXT)''')
+        # Model inputs and version, needed to re-score applications offline
+        cursor.execute("ALTER TABLE application ADD COLUMN IF NOT EXISTS application_features TEXT")
+        cursor.execute("ALTER TABLE application ADD COLUMN IF NOT EXISTS model_version TEXT")
+    conn.commit()
+
+def convert_to_typed_columns(conn) -> None:
+    batch_size = DB_MIGRATION_CONFIG["backfill_batch_size"]
+    convert_columns(conn, "applicant", [
+        ColumnConversion("created_at", "timestamptz", _parse_timestamp),
+        ColumnConversion("updated_at", "timestamptz", _parse_timestamp),
+    ], batch_size)
+    convert_columns(conn, "application", [
+        ColumnConversion("created_at", "timestamptz", _parse_timestamp),
+        ColumnConversion("processing_completed_at", "timestamptz", _parse_timestamp),
+        ColumnConversion("decision_date", "timestamptz", _parse_timestamp),
+        ColumnConversion("documents", "jsonb", _parse_json),
+        ColumnConversion("validation_results", "jsonb", _parse_json),
+        ColumnConversion("application_features", "jsonb", _parse_json),
+    ], batch_size)
+
+def create_indexes(conn) -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cursor:
+            for name, table, column in [
+                ("applicant_applicant_id_idx", "applicant", "applicant_id"),
+                ("application_applicant_id_idx", "application", "applicant_id"),
+                ("application_status_idx", "application", "status"),
+                ("application_decision_date_idx", "application", "decision_date"),
+            ]:
+                # Drop a half-built index left by an interrupted run
+                cursor.execute(
+                    "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                    "WHERE c.relname = %s AND NOT i.indisvalid", (name,)
+                )
+                if cursor.fetchone():
+                    cursor.execute(sql.SQL("DROP INDEX CONCURRENTLY {}").format(sql.Identifier(name)))
+                cursor.execute(sql.SQL("CREATE INDEX CONCURRENTLY IF NOT EXISTS {} ON {} ({})").format(
+                    sql.Identifier(name), sql.Identifier(table), sql.Identifier(column)
+                ))
+    finally:
+        conn.autocommit = False
+
+
+# (version, name, migration); append new migrations, never reorder
+MIGRATIONS: List[Tuple[int, str, Callable[[Any], None]]] = [
+    (1, "create base tables", create_base_tables),
+    (2, "timestamptz and jsonb columns", convert_to_typed_columns),
+    (3, "applicant_id, status and decision_date indexes", create_indexes),
+]
+
+
+def applied_versions(conn) -> List[int]:
+    with conn.cursor() as cursor:
+        cursor.execute('''CREATE TABLE IF NOT EXISTS schema_migrations
+                 (
+                    version INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    applied_at TIMESTAMPTZ NOT NULL DEFAULT now())''')
+        cursor.execute("SELECT version FROM schema_migrations ORDER BY version")
+        versions = [row[0] for row in cursor.fetchall()]
+    conn.commit()
+    return versions
+
+def run_migrations(conn) -> List[int]:
+    """
+    Apply pending migrations in order.
+
+    Args:
+        conn: Database connection, outside any transaction
+
+    Returns:
+        List[int]: Versions applied by this call
+
+    Raises:
+        Exception: If a migration fails; earlier migrations stay applied
+    """
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_KEY,))
+    conn.commit()
+    applied = []
+    try:
+        done = set(applied_versions(conn))
+        for version, name, migrate in MIGRATIONS:
+            if version in done:
+                continue
+            logger.info(f"Applying migration {version}: {name}")
+            migrate(conn)
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)", (version, name)
+                )
+            conn.commit()
+            applied.append(version)
+        return applied
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_KEY,))
+        conn.commit()
+
+def migration_status(conn) -> Dict[str, Any]:
+    """
+    Return the applied and pending migration versions.
+    """
+    done = set(applied_versions(conn))
+    return {
+        "applied": sorted(done),
+        "pending": [version for version, _, _ in MIGRATIONS if version not in done],
+    }
+
+
+def main():
+    from database.db_operations import get_connection
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    conn = get_connection()
+    try:
+        applied = run_migrations(conn)
+        logger.info(f"Applied migrations: {applied or 'none'}; status: {migration_status(conn)}")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
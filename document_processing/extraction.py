@@ -1,15 +1,24 @@
 """
 Document extraction functionality for the Social Support Application Processing System.
 """
+import asyncio
+import hashlib
+import json
 import logging
-import pickle
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import pandas as pd
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+from langchain_core.messages import message_to_dict, messages_from_dict
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_ollama import ChatOllama
 
-from config import LLM_CONFIG, EXTRACTION_CACHE_PATH
-from document_processing.ocr import extract_text
+from caching.disk_cache import DiskCache
+from config import LLM_CONFIG, OCR_CONFIG, EXTRACTION_CONFIG, EXTRACTION_CACHE_CONFIG, TEXT_CACHE_CONFIG
+from document_processing.ocr import extract_text, file_digest
 from document_processing.prompts import (
     EXTRACT_EID, EXTRACT_BANK_STATEMENT, EXTRACT_CREDIT_REPORT,
     EXTRACT_RESUME, EXTRACT_ASSET_LIABILITY
@@ -18,185 +27,514 @@ from models.data_models import (
     EmiratesIDData, BankStatement, CreditReport,
     ResumeInfo, AssetLiabilityExtraction
 )
-from vector_store.operations import add_to_vector_store
+from vector_store.operations import add_many_to_vector_store
 
 logger = logging.getLogger(__name__)
 
-def load_cached_extraction_data() -> Optional[Dict[str, Any]]:
+# Result name -> (prompt template, output schema) for each document
+DOCUMENT_PROMPTS = {
+    "EmiratedID_Extract": (EXTRACT_EID, EmiratesIDData),
+    "CreditReport_Extract": (EXTRACT_CREDIT_REPORT, CreditReport),
+    "BankStatement_Extract": (EXTRACT_BANK_STATEMENT, BankStatement),
+    "Resume_Extract": (EXTRACT_RESUME, ResumeInfo),
+    "Assets_Liabilities_Extract": (EXTRACT_ASSET_LIABILITY, AssetLiabilityExtraction),
+}
+
+_extraction_cache: Optional[DiskCache] = None
+_extraction_cache_lock = threading.Lock()
+
+def get_extraction_cache() -> DiskCache:
+    """
+    Return the process-wide per-document extraction cache, opening it on first use.
+    """
+    global _extraction_cache
+    if _extraction_cache is None:
+        with _extraction_cache_lock:
+            if _extraction_cache is None:
+                _extraction_cache = DiskCache(
+                    EXTRACTION_CACHE_CONFIG["path"],
+                    EXTRACTION_CACHE_CONFIG["max_bytes"],
+                    ttl_seconds=EXTRACTION_CACHE_CONFIG["ttl_seconds"]
+                )
+    return _extraction_cache
+
+def get_extraction_cache_stats() -> Dict[str, Any]:
+    """
+    Return hit/miss statistics for the extraction cache.
+    """
+    return get_extraction_cache().stats()
+
+@lru_cache(maxsize=None)
+def prompt_version(result_name: str) -> str:
+    """
+    Version a document's prompt by hashing its template and output schema, so
+    editing either one invalidates earlier cached extractions.
     """
-    Load cached extraction data if available.
+    template, schema = DOCUMENT_PROMPTS[result_name]
+    payload = template + json.dumps(schema.model_json_schema(), sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+def extraction_cache_key(result_name: str, file_path: str, digest: Optional[str] = None) -> str:
+    """
+    Build the extraction cache key for one document.
+    
+    Args:
+        result_name: Name of the extraction result the document feeds
+        file_path: Path to the document
+        digest: The document's file_digest if the caller already computed it
     
     Returns:
-        Dict or None: Cached extraction data if available, None otherwise
+        str: Key made of content hash, document type, prompt version and model name
+    """
+    return ":".join([
+        digest or file_digest(file_path),
+        result_name,
+        prompt_version(result_name),
+        LLM_CONFIG["extraction_model"]
+    ])
+
+def load_cached_extraction(result_name: str, key: str) -> Optional[Dict[str, Any]]:
+    """
+    Load a cached structured extraction for one document.
+    
+    Args:
+        result_name: Name of the extraction result
+        key: Extraction cache key
+    
+    Returns:
+        Dict or None: Chain result (raw, parsed, parsing_error) if cached, None otherwise
     """
     try:
-        with open(str(EXTRACTION_CACHE_PATH), 'rb') as f:
-            return pickle.load(f)
-    except (FileNotFoundError, pickle.PickleError) as e:
-        logger.info(f"No valid cached extraction data found: {str(e)}")
-        return None
+        payload = get_extraction_cache().get(key)
+        if payload is None:
+            return None
+        entry = json.loads(zlib.decompress(payload))
+        _, schema = DOCUMENT_PROMPTS[result_name]
+        return {
+            "raw": messages_from_dict([entry["raw"]])[0] if entry["raw"] else None,
+            "parsed": schema.model_validate(entry["parsed"]),
+            "parsing_error": None
+        }
     except Exception as e:
-        logger.error(f"Error loading cached extraction data: {str(e)}")
+        logger.error(f"Error loading cached extraction for {result_name}: {str(e)}")
         return None
 
-def save_cached_extraction_data(data: Dict[str, Any]) -> bool:
+def save_cached_extraction(key: str, result: Dict[str, Any]) -> bool:
     """
-    Save extraction data to cache.
+    Save one document's structured extraction to the cache as compressed JSON.
     
     Args:
-        data: Extraction data to cache
+        key: Extraction cache key
+        result: Chain result (raw, parsed, parsing_error)
     
     Returns:
         bool: True if successful, False otherwise
     """
+    if result.get("parsed") is None or result.get("parsing_error") is not None:
+        return False
     try:
-        with open(str(EXTRACTION_CACHE_PATH), 'wb') as file:
-            pickle.dump(data, file)
-        return True
+        entry = {
+            "raw": message_to_dict(result["raw"]) if result.get("raw") is not None else None,
+            "parsed": result["parsed"].model_dump(mode="json")
+        }
+        payload = json.dumps(entry, separators=(",", ":"), default=str).encode("utf-8")
+        return get_extraction_cache().put(key, zlib.compress(payload))
     except Exception as e:
-        logger.error(f"Error saving cached extraction data: {str(e)}")
+        logger.error(f"Error saving cached extraction: {str(e)}")
         return False
 
-def extract_documents(filepaths: Dict[str, str]) -> Dict[str, Any]:
+def document_digest(file_path: str, use_cache: bool = True) -> Optional[str]:
     """
-    Extract information from all document types.
+    Hash a document once for both the extraction and the text cache keys.
+    
+    Returns:
+        str: The file's digest, None if neither cache will be used
+    """
+    if (use_cache and EXTRACTION_CACHE_CONFIG["enabled"]) or TEXT_CACHE_CONFIG["enabled"]:
+        return file_digest(file_path)
+    return None
+
+def lookup_extraction(
+    result_name: str,
+    file_path: str,
+    use_cache: bool = True,
+    digest: Optional[str] = None
+) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """
+    Look up one document in the extraction cache.
+    
+    Args:
+        result_name: Name of the extraction result the document feeds
+        file_path: Path to the document
+        use_cache: Whether the caller wants the cache used
+        digest: The document's file_digest if the caller already computed it
+    
+    Returns:
+        Tuple: (cache key, cached result); the key is None when caching is off
+            and the result is None on a miss
+    """
+    if not (use_cache and EXTRACTION_CACHE_CONFIG["enabled"]):
+        return None, None
+    key = extraction_cache_key(result_name, file_path, digest)
+    cached = load_cached_extraction(result_name, key)
+    if cached is not None:
+        logger.info(f"Extraction cache hit for {result_name}")
+    return key, cached
+
+def build_extraction_chains() -> Dict[str, Any]:
+    """
+    Build the structured-output LLM chain for each document type.
+    
+    Returns:
+        Dict: Extraction chains keyed by the name of their result
+    """
+    llm = ChatOllama(
+        model=LLM_CONFIG["extraction_model"],
+        temperature=LLM_CONFIG["extraction_temperature"]
+    )
+    return {
+        name: ChatPromptTemplate.from_template(template) | llm.with_structured_output(schema, include_raw=True)
+        for name, (template, schema) in DOCUMENT_PROMPTS.items()
+    }
+
+class PipelineStage:
+    """
+    Thread-safe queue-depth and timing counters for one extraction stage.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._total_wait = 0.0
+        self._total_run = 0.0
+        self._max_run = 0.0
+
+    def enqueue(self) -> float:
+        """Record a queued item and return the time it was queued."""
+        with self._lock:
+            self._queued += 1
+        return time.perf_counter()
+
+    def start(self, queued_at: float) -> float:
+        """Move an item from the queue to in-flight and return its start time."""
+        started_at = time.perf_counter()
+        with self._lock:
+            self._queued -= 1
+            self._in_flight += 1
+            self._total_wait += started_at - queued_at
+        return started_at
+
+    def finish(self, started_at: float, failed: bool = False) -> None:
+        """Record that an in-flight item finished."""
+        elapsed = time.perf_counter() - started_at
+        with self._lock:
+            self._in_flight -= 1
+            self._total_run += elapsed
+            self._max_run = max(self._max_run, elapsed)
+            if failed:
+                self._failed += 1
+            else:
+                self._completed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return a snapshot of the stage counters."""
+        with self._lock:
+            done = self._completed + self._failed
+            return {
+                "queued": self._queued,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "failed": self._failed,
+                "avg_wait_seconds": self._total_wait / done if done else 0.0,
+                "avg_run_seconds": self._total_run / done if done else 0.0,
+                "max_run_seconds": self._max_run,
+            }
+
+
+# Pipeline stages shared by every extraction in the process
+OCR_STAGE = PipelineStage("ocr")
+LLM_STAGE = PipelineStage("llm")
+
+# Result name -> (file path key, chain input variable) for each document
+DOCUMENT_SOURCES = {
+    "EmiratedID_Extract": ("emirates_id_file_path", "text"),
+    "CreditReport_Extract": ("credit_report_file_path", "text"),
+    "BankStatement_Extract": ("bank_statements_file_path", "text"),
+    "Resume_Extract": ("resume_file_path", "text"),
+    "Assets_Liabilities_Extract": ("assets_liabilities_file_path", "data"),
+}
+
+_ocr_executor: Optional[ThreadPoolExecutor] = None
+_ocr_executor_lock = threading.Lock()
+
+def get_ocr_executor() -> ThreadPoolExecutor:
+    """
+    Return the process-wide worker pool used for the OCR stage.
+    """
+    global _ocr_executor
+    if _ocr_executor is None:
+        with _ocr_executor_lock:
+            if _ocr_executor is None:
+                _ocr_executor = ThreadPoolExecutor(
+                    max_workers=OCR_CONFIG["workers"],
+                    thread_name_prefix="ocr"
+                )
+    return _ocr_executor
+
+def get_extraction_pipeline_stats() -> Dict[str, Any]:
+    """
+    Return queue depths and timings for each extraction stage.
+    """
+    return {stage.name: stage.stats() for stage in (OCR_STAGE, LLM_STAGE)}
+
+def read_asset_liability_sheet(file_path: str) -> str:
+    """
+    Flatten the assets/liabilities spreadsheet into text for the LLM.
+    
+    Args:
+        file_path: Path to the spreadsheet
+    
+    Returns:
+        str: One dictionary per spreadsheet row
+    """
+    df = pd.read_excel(file_path, index_col=None)
+    asset_liability_string = ""
+    for r in range(df.shape[0]):
+        asset_liability_string += str({
+            "type": df.iloc[r]['Type'],
+            "asset_or_liability": df.iloc[r]['Asset_or_Liability'],
+            "amount_or_value": df.iloc[r]['Value_or_Cost']
+        })
+    return asset_liability_string
+
+def read_document(result_name: str, file_path: str, digest: Optional[str] = None) -> Optional[str]:
+    """
+    Read the text of one document, using OCR where needed.
+    
+    Args:
+        result_name: Name of the extraction result the document feeds
+        file_path: Path to the document
+        digest: The document's file_digest if the caller already computed it
+    
+    Returns:
+        str: Document text or None if extraction fails
+    """
+    if result_name == "Assets_Liabilities_Extract":
+        return read_asset_liability_sheet(file_path)
+    return extract_text(file_path, digest)
+
+async def run_extraction_pipeline(
+    filepaths: Dict[str, str],
+    chains: Dict[str, Any],
+    max_concurrency: int,
+    timeout: float,
+    use_cache: bool = True
+) -> Dict[str, Any]:
+    """
+    Read and extract every document, starting each document's LLM extraction
+    as soon as its own text is ready.
+    
+    OCR runs on the shared OCR worker pool; LLM calls are bounded separately.
+    Documents found in the extraction cache skip both stages.
     
     Args:
         filepaths: Dictionary mapping document types to file paths
+        chains: Extraction chains keyed by result name
+        max_concurrency: Maximum number of LLM calls in flight at once
+        timeout: Seconds allowed for each LLM call once it starts
+        use_cache: Whether to read and write the extraction cache
     
     Returns:
-        Dict: Extracted information from all documents
+        Dict: Chain results keyed by result name
     
     Raises:
-        Exception: If extraction fails
+        TimeoutError: If an LLM call does not finish within the timeout
     """
-    try:
+    loop = asyncio.get_running_loop()
+    llm_slots = asyncio.Semaphore(max_concurrency)
 
-        # Extract text from documents
-        extracts = {}
-        for i, filename in enumerate([
-            filepaths["emirates_id_file_path"],
-            filepaths["credit_report_file_path"],
-            filepaths["bank_statements_file_path"],
-            filepaths["resume_file_path"]
-        ]):
-            extracts[str(i)] = extract_text(filename)
-        
-        # Extract data from assets/liabilities spreadsheet
-        df = pd.read_excel(filepaths["assets_liabilities_file_path"], index_col=None)
-        asset_liability_string = ""
-        for r in range(df.shape[0]):
-            asset_liability_string += str({
-                "type": df.iloc[r]['Type'],
-                "asset_or_liability": df.iloc[r]['Asset_or_Liability'],
-                "amount_or_value": df.iloc[r]['Value_or_Cost']
-            })
-        
-        # Initialize LLM
-        llm = ChatOllama(
-            model=LLM_CONFIG["extraction_model"],
-            temperature=LLM_CONFIG["extraction_temperature"]
+    def lookup(result_name: str, file_path: str):
+        digest = document_digest(file_path, use_cache)
+        return (digest, *lookup_extraction(result_name, file_path, use_cache, digest))
+
+    def read(result_name: str, file_path: str, digest: Optional[str], queued_at: float) -> Optional[str]:
+        started_at = OCR_STAGE.start(queued_at)
+        try:
+            text = read_document(result_name, file_path, digest)
+        except Exception:
+            OCR_STAGE.finish(started_at, failed=True)
+            raise
+        OCR_STAGE.finish(started_at, failed=text is None)
+        return text
+
+    async def run(result_name: str) -> Any:
+        path_key, input_key = DOCUMENT_SOURCES[result_name]
+        # The document is hashed once for both cache lookups
+        digest, cache_key, cached = await asyncio.to_thread(lookup, result_name, filepaths[path_key])
+        if cached is not None:
+            return cached
+
+        queued_at = OCR_STAGE.enqueue()
+        text = await loop.run_in_executor(
+            get_ocr_executor(), read, result_name, filepaths[path_key], digest, queued_at
         )
-        
-        # Prepare prompt templates
-        prompt_eid = ChatPromptTemplate.from_template(EXTRACT_EID)
-        prompt_cr = ChatPromptTemplate.from_template(EXTRACT_CREDIT_REPORT)
-        prompt_bs = ChatPromptTemplate.from_template(EXTRACT_BANK_STATEMENT)
-        prompt_r = ChatPromptTemplate.from_template(EXTRACT_RESUME)
-        prompt_al = ChatPromptTemplate.from_template(EXTRACT_ASSET_LIABILITY)
-        
-        # Prepare structured output models
-        structured_llm_eid = llm.with_structured_output(EmiratesIDData, include_raw=True)
-        structured_llm_cr = llm.with_structured_output(CreditReport, include_raw=True)
-        structured_llm_bs = llm.with_structured_output(BankStatement, include_raw=True)
-        structured_llm_r = llm.with_structured_output(ResumeInfo, include_raw=True)
-        structured_llm_al = llm.with_structured_output(AssetLiabilityExtraction, include_raw=True)
-        
-        # Create extraction chains
-        chain_eid = prompt_eid | structured_llm_eid
-        chain_cr = prompt_cr | structured_llm_cr
-        chain_bs = prompt_bs | structured_llm_bs
-        chain_r = prompt_r | structured_llm_r
-        chain_al = prompt_al | structured_llm_al
-        
-        # Extract information from each document
-        logger.info("Extracting from Emirates ID")
-        result_eid = chain_eid.invoke({"text": extracts['0']})
-        
-        logger.info("Extracting from Credit Report")
-        result_cr = chain_cr.invoke({"text": extracts['1']})
-        
-        logger.info("Extracting from Bank Statement")
-        result_bs = chain_bs.invoke({"text": extracts['2']})
-        
-        logger.info("Extracting from Resume")
-        result_r = chain_r.invoke({"text": extracts['3']})
-        
-        logger.info("Extracting from Assets/Liabilities")
-        result_al = chain_al.invoke({"data": asset_liability_string})
-        
-        # Combine results
-        result_str = {
-            "EmiratedID_Extract": result_eid,
-            "CreditReport_Extract": result_cr,
-            "BankStatement_Extract": result_bs,
-            "Resume_Extract": result_r,
-            "Assets_Liabilities_Extract": result_al
-        }
-        
-        # Convert structured extracts to text format for vector storage
-        emirates_id_extract = ""
-        for key in result_str['EmiratedID_Extract']['parsed'].__dict__.keys():
-            string_to_add = f"{key}: {result_str['EmiratedID_Extract']['parsed'].__dict__[key]}\n"
-            emirates_id_extract += string_to_add
-        result_str['EID_Extract_In_Text'] = emirates_id_extract
-        
-        bank_s_extract = ""
-        for key in result_str['BankStatement_Extract']['parsed'].__dict__.keys():
-            if str(type(result_str['BankStatement_Extract']['parsed'].__dict__[key])).startswith("<class '__main__"):
-                string_to_add = f"\n{key}: \n"
+
+        queued_at = LLM_STAGE.enqueue()
+        async with llm_slots:
+            started_at = LLM_STAGE.start(queued_at)
+            logger.info(f"Extracting {result_name}")
+            try:
+                result = await asyncio.wait_for(chains[result_name].ainvoke({input_key: text}), timeout)
+            except asyncio.TimeoutError:
+                LLM_STAGE.finish(started_at, failed=True)
+                raise TimeoutError(f"{result_name} extraction timed out after {timeout}s")
+            except Exception:
+                LLM_STAGE.finish(started_at, failed=True)
+                raise
+            LLM_STAGE.finish(started_at)
+
+        if cache_key is not None:
+            await asyncio.to_thread(save_cached_extraction, cache_key, result)
+        return result
+
+    results = await asyncio.gather(*(run(name) for name in DOCUMENT_SOURCES))
+    return dict(zip(DOCUMENT_SOURCES, results))
+
+def combine_extractions(results: Dict[str, Any], applicant_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Add text renderings of the extracts and index them in the vector store.
+    
+    Args:
+        results: Chain results keyed by result name
+        applicant_id: Applicant whose vector store partition receives the extracts
+    
+    Returns:
+        Dict: Extracted information from all documents
+    """
+    # Combine results
+    result_str = {name: results[name] for name in DOCUMENT_SOURCES}
+    
+    # Convert structured extracts to text format for vector storage
+    emirates_id_extract = ""
+    for key in result_str['EmiratedID_Extract']['parsed'].__dict__.keys():
+        string_to_add = f"{key}: {result_str['EmiratedID_Extract']['parsed'].__dict__[key]}\n"
+        emirates_id_extract += string_to_add
+    result_str['EID_Extract_In_Text'] = emirates_id_extract
+    
+    bank_s_extract = ""
+    for key in result_str['BankStatement_Extract']['parsed'].__dict__.keys():
+        if str(type(result_str['BankStatement_Extract']['parsed'].__dict__[key])).startswith("<class '__main__"):
+            string_to_add = f"\n{key}: \n"
+            bank_s_extract += string_to_add
+            for skey in result_str['BankStatement_Extract']['parsed'].__dict__[key].__dict__.keys():
+                string_to_add = f"{skey}: {result_str['BankStatement_Extract']['parsed'].__dict__[key].__dict__[skey]}\n"
                 bank_s_extract += string_to_add
-                for skey in result_str['BankStatement_Extract']['parsed'].__dict__[key].__dict__.keys():
-                    string_to_add = f"{skey}: {result_str['BankStatement_Extract']['parsed'].__dict__[key].__dict__[skey]}\n"
-                    bank_s_extract += string_to_add
-            else:
-                string_to_add = f"\n{key}: \n"
+        else:
+            string_to_add = f"\n{key}: \n"
+            bank_s_extract += string_to_add
+            for item_list in result_str['BankStatement_Extract']['parsed'].__dict__[key]:
+                string_to_add = f"{item_list}\n"
                 bank_s_extract += string_to_add
-                for item_list in result_str['BankStatement_Extract']['parsed'].__dict__[key]:
-                    string_to_add = f"{item_list}\n"
-                    bank_s_extract += string_to_add
-        result_str['BankS_Extract_In_Text'] = bank_s_extract
-        
-        resume_extract = ""
-        for key in result_str['Resume_Extract']['parsed'].__dict__.keys():
-            if str(type(result_str['Resume_Extract']['parsed'].__dict__[key])).startswith("<class '__main__"):
-                string_to_add = f"\n{key}: \n"
+    result_str['BankS_Extract_In_Text'] = bank_s_extract
+    
+    resume_extract = ""
+    for key in result_str['Resume_Extract']['parsed'].__dict__.keys():
+        if str(type(result_str['Resume_Extract']['parsed'].__dict__[key])).startswith("<class '__main__"):
+            string_to_add = f"\n{key}: \n"
+            resume_extract += string_to_add
+            for skey in result_str['Resume_Extract']['parsed'].__dict__[key].__dict__.keys():
+                string_to_add = f"{skey}: {result_str['Resume_Extract']['parsed'].__dict__[key].__dict__[skey]}\n"
                 resume_extract += string_to_add
-                for skey in result_str['Resume_Extract']['parsed'].__dict__[key].__dict__.keys():
-                    string_to_add = f"{skey}: {result_str['Resume_Extract']['parsed'].__dict__[key].__dict__[skey]}\n"
-                    resume_extract += string_to_add
-            else:
-                string_to_add = f"\n{key}: \n"
+        else:
+            string_to_add = f"\n{key}: \n"
+            resume_extract += string_to_add
+            for item_list in result_str['Resume_Extract']['parsed'].__dict__[key]:
+                string_to_add = f"{item_list}\n"
                 resume_extract += string_to_add
-                for item_list in result_str['Resume_Extract']['parsed'].__dict__[key]:
-                    string_to_add = f"{item_list}\n"
-                    resume_extract += string_to_add
-        result_str['Resume_Extract_In_Text'] = resume_extract
-        
-        # Add extracted information to vector store
-        for tx in [
-            emirates_id_extract,
-            bank_s_extract,
-            resume_extract,
-            str(result_str['CreditReport_Extract']['parsed'].__dict__),
-            str(result_str['Assets_Liabilities_Extract']['parsed'].__dict__)
-        ]:
-            add_to_vector_store(tx)
-        
-        # Cache results
-        save_cached_extraction_data(result_str)
+    result_str['Resume_Extract_In_Text'] = resume_extract
+    
+    # Add extracted information to vector store
+    add_many_to_vector_store([
+        emirates_id_extract,
+        bank_s_extract,
+        resume_extract,
+        str(result_str['CreditReport_Extract']['parsed'].__dict__),
+        str(result_str['Assets_Liabilities_Extract']['parsed'].__dict__)
+    ], applicant_id=applicant_id)
+    
+    return result_str
+
+def extract_documents(
+    filepaths: Dict[str, str],
+    use_cache: bool = True,
+    applicant_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Extract information from all document types.
+    
+    Args:
+        filepaths: Dictionary mapping document types to file paths
+        use_cache: Whether to reuse cached extractions of identical documents
+        applicant_id: Applicant whose vector store partition receives the extracts
+    
+    Returns:
+        Dict: Extracted information from all documents
+    
+    Raises:
+        Exception: If extraction fails
+    """
+    try:
+
+        chains = build_extraction_chains()
+        if EXTRACTION_CONFIG["concurrent"]:
+            results = asyncio.run(run_extraction_pipeline(
+                filepaths,
+                chains,
+                max_concurrency=EXTRACTION_CONFIG["max_concurrency"],
+                timeout=EXTRACTION_CONFIG["chain_timeout"],
+                use_cache=use_cache
+            ))
+        else:
+            results = {}
+            for name, (path_key, input_key) in DOCUMENT_SOURCES.items():
+                digest = document_digest(filepaths[path_key], use_cache)
+                cache_key, results[name] = lookup_extraction(name, filepaths[path_key], use_cache, digest)
+                if results[name] is not None:
+                    continue
+                text = read_document(name, filepaths[path_key], digest)
+                logger.info(f"Extracting {name}")
+                results[name] = chains[name].invoke({input_key: text})
+                if cache_key is not None:
+                    save_cached_extraction(cache_key, results[name])
         
-        return result_str
+        return combine_extractions(results, applicant_id)
+    except Exception as e:
+        logger.error(f"Error during document extraction: {str(e)}")
+        raise
+
+async def aextract_documents(
+    filepaths: Dict[str, str],
+    use_cache: bool = True,
+    applicant_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Async variant of extract_documents, run on the caller's event loop. The
+    pipeline is always concurrent; combining and indexing the extracts runs
+    in a worker thread.
+    """
+    try:
+        results = await run_extraction_pipeline(
+            filepaths,
+            build_extraction_chains(),
+            max_concurrency=EXTRACTION_CONFIG["max_concurrency"],
+            timeout=EXTRACTION_CONFIG["chain_timeout"],
+            use_cache=use_cache
+        )
+        return await asyncio.to_thread(combine_extractions, results, applicant_id)
     except Exception as e:
         logger.error(f"Error during document extraction: {str(e)}")
-        raise
\ No newline at end of file
+        raise
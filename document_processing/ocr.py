@@ -1,13 +1,184 @@
 """
 OCR functionality for the Social Support Application Processing System.
 """
+import hashlib
+import json
 import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+import pypdf
 from pypdf import PdfReader
 import easyocr
-from typing import Optional
+from typing import Any, Dict, List, Optional
+
+from caching.disk_cache import DiskCache
+from config import OCR_CONFIG, TEXT_CACHE_CONFIG
 
 logger = logging.getLogger(__name__)
 
+
+class ReaderPool:
+    """
+    Fixed-size pool of pre-loaded EasyOCR readers shared across threads.
+
+    Loading a reader pulls the detector and recognizer weights into memory,
+    so readers are built once and checked out exclusively for each OCR call.
+    """
+
+    def __init__(self, size: int, languages: List[str], gpu: bool = True):
+        self.size = max(1, size)
+        self.languages = languages
+        self.gpu = gpu
+        self.load_seconds = 0.0
+        self._readers = queue.Queue(maxsize=self.size)
+        self._load_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._loaded = False
+        self._checkouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def warm_up(self) -> None:
+        """
+        Load all readers in the pool. Safe to call more than once.
+        """
+        if self._loaded:
+            return
+        with self._load_lock:
+            if self._loaded:
+                return
+            start = time.perf_counter()
+            # Enqueue only once every reader has loaded, so a failed load
+            # leaves the pool empty and a retry does not overfill it
+            readers = [easyocr.Reader(self.languages, gpu=self.gpu) for _ in range(self.size)]
+            for reader in readers:
+                self._readers.put_nowait(reader)
+            self.load_seconds = time.perf_counter() - start
+            self._loaded = True
+            logger.info(f"Loaded {self.size} EasyOCR reader(s) in {self.load_seconds:.2f}s")
+
+    @contextmanager
+    def reader(self, timeout: Optional[float] = None):
+        """
+        Check out a reader for exclusive use, returning it to the pool afterwards.
+
+        Args:
+            timeout: Seconds to wait for a free reader, None to wait forever
+
+        Raises:
+            TimeoutError: If no reader becomes free within the timeout
+        """
+        self.warm_up()
+        start = time.perf_counter()
+        try:
+            reader = self._readers.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No EasyOCR reader available after {timeout}s")
+        waited = time.perf_counter() - start
+        with self._stats_lock:
+            self._checkouts += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+        try:
+            yield reader
+        finally:
+            self._readers.put(reader)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return load time and reader wait-time statistics for the pool.
+        """
+        with self._stats_lock:
+            return {
+                "size": self.size,
+                "loaded": self._loaded,
+                "available": self._readers.qsize(),
+                "load_seconds": self.load_seconds,
+                "checkouts": self._checkouts,
+                "total_wait_seconds": self._total_wait,
+                "avg_wait_seconds": self._total_wait / self._checkouts if self._checkouts else 0.0,
+                "max_wait_seconds": self._max_wait,
+            }
+
+
+_reader_pool: Optional[ReaderPool] = None
+_reader_pool_lock = threading.Lock()
+
+def get_reader_pool() -> ReaderPool:
+    """
+    Return the process-wide EasyOCR reader pool, creating it on first use.
+    """
+    global _reader_pool
+    if _reader_pool is None:
+        with _reader_pool_lock:
+            if _reader_pool is None:
+                _reader_pool = ReaderPool(
+                    size=OCR_CONFIG["workers"],
+                    languages=OCR_CONFIG["languages"],
+                    gpu=OCR_CONFIG["gpu"]
+                )
+    return _reader_pool
+
+def warm_up_ocr() -> None:
+    """
+    Pre-load the EasyOCR readers so the first application does not pay for it.
+    """
+    try:
+        get_reader_pool().warm_up()
+    except Exception as e:
+        logger.error(f"Error loading EasyOCR readers: {str(e)}")
+
+def get_ocr_stats() -> Dict[str, Any]:
+    """
+    Return statistics for the EasyOCR reader pool.
+    """
+    return get_reader_pool().stats()
+
+_text_cache: Optional[DiskCache] = None
+_text_cache_lock = threading.Lock()
+
+def get_text_cache() -> DiskCache:
+    """
+    Return the process-wide extracted-text cache, opening it on first use.
+    """
+    global _text_cache
+    if _text_cache is None:
+        with _text_cache_lock:
+            if _text_cache is None:
+                _text_cache = DiskCache(TEXT_CACHE_CONFIG["path"], TEXT_CACHE_CONFIG["max_bytes"])
+    return _text_cache
+
+def get_text_cache_stats() -> Dict[str, Any]:
+    """
+    Return hit/miss statistics for the extracted-text cache.
+    """
+    return get_text_cache().stats()
+
+def file_digest(file_path: str) -> str:
+    """
+    Compute the SHA-256 digest of a file's contents.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        str: Hex digest of the file bytes
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _text_cache_key(file_path: str, engine: str, settings: Dict[str, Any], digest: Optional[str] = None) -> str:
+    """
+    Build a cache key from the file digest and the extraction engine settings.
+    """
+    settings_json = json.dumps(settings, sort_keys=True)
+    return f"{digest or file_digest(file_path)}:{engine}:{settings_json}"
+
 def extract_text_from_pdf(file_path: str) -> str:
     """
     Extract text from a PDF file.
@@ -46,8 +217,8 @@ def extract_text_from_image(file_path: str) -> str:
         Exception: If extraction fails
     """
     try:
-        reader = easyocr.Reader(['en'])
-        result = reader.readtext(file_path)
+        with get_reader_pool().reader(timeout=OCR_CONFIG["reader_wait_timeout"]) as reader:
+            result = reader.readtext(file_path)
         text_extract = ""
         
         for detection in result:
@@ -59,24 +230,48 @@ def extract_text_from_image(file_path: str) -> str:
         logger.error(f"Error extracting text from image {file_path}: {str(e)}")
         raise
 
-def extract_text(file_path: str) -> Optional[str]:
+def extract_text(file_path: str, digest: Optional[str] = None) -> Optional[str]:
     """
     Extract text from a file based on its type.
     
     Args:
         file_path: Path to the file
+        digest: The file's file_digest if the caller already computed it
     
     Returns:
         str: Extracted text or None if extraction fails
     """
     try:
         if file_path.endswith('.pdf'):
-            return extract_text_from_pdf(file_path)
+            engine = "pypdf"
+            settings = {"version": pypdf.__version__}
+            extractor = extract_text_from_pdf
         elif file_path.endswith(('.png', '.jpg', '.jpeg', '.tiff', '.bmp')):
-            return extract_text_from_image(file_path)
+            engine = "easyocr"
+            settings = {
+                "version": easyocr.__version__,
+                "languages": OCR_CONFIG["languages"],
+                "gpu": OCR_CONFIG["gpu"]
+            }
+            extractor = extract_text_from_image
         else:
             logger.error(f"Unsupported file format: {file_path}")
             return None
+
+        if not TEXT_CACHE_CONFIG["enabled"]:
+            return extractor(file_path)
+
+        # Resubmitted documents are served from the cache without re-running OCR
+        cache = get_text_cache()
+        key = _text_cache_key(file_path, engine, settings, digest)
+        cached = cache.get(key)
+        if cached is not None:
+            logger.info(f"Text cache hit for {file_path}")
+            return cached.decode("utf-8")
+
+        text = extractor(file_path)
+        cache.put(key, text.encode("utf-8"))
+        return text
     except Exception as e:
         logger.error(f"Error extracting text from {file_path}: {str(e)}")
         return None
\ No newline at end of file
@@ -183,6 +183,29 @@ ELIGIBILITY_AGENT_PROMPT = """
             Respond with the reason only:
         """
 
+# Template explanation used instead of the eligibility agent
+ELIGIBILITY_EXPLANATION_TEMPLATE = (
+    "The application was assessed as '{decision}' with {probability:.0%} model confidence. "
+    "The main factors were {drivers}."
+)
+
+# How each feature is described in a template explanation
+ELIGIBILITY_DRIVER_TEMPLATES = {
+    "monthly_income": "a monthly income of AED {monthly_income}",
+    "assets": "assets of AED {assets}",
+    "liabilities": "liabilities of AED {liabilities}",
+    "household_size": "a household of {household_size} members",
+    "age": "an age of {age} years",
+    "education_level": "an education level of {education_level}",
+    "marital_status": "a marital status of {marital_status}",
+}
+
+# Direction of a feature's contribution towards the decision
+ELIGIBILITY_DRIVER_DIRECTIONS = {
+    True: "{driver}, which supported this outcome",
+    False: "{driver}, which weighed against it",
+}
+
 # Recommendation agent prompt
 RECOMMENDATION_AGENT_PROMPT = """
             You are the Recommendation Agent for a Social Security Application Processing System.
@@ -0,0 +1,81 @@
+"""
+Per-call overhead benchmark for single-row decision model scoring.
+
+Run with: python -m inference.benchmark [--iterations N]
+"""
+import argparse
+import time
+from typing import Any, Callable, Dict
+
+import pandas as pd
+
+from inference.decision_model import (
+    FEATURE_COLUMNS, EDUCATION_LEVELS, MARITAL_STATUSES, NUMERIC_FEATURES,
+    _feature_encoder, get_model_and_encoder, score_application
+)
+
+SAMPLE_APPLICATION = {
+    'monthly_income': 4500,
+    'assets': 12000,
+    'liabilities': 30000,
+    'household_size': 4,
+    'age': 38,
+    'education_level': 'high school',
+    'marital_status': 'Married',
+}
+
+def dataframe_features(application_data: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Encode one row the way predict_eligibility used to: dict, DataFrame, reindex.
+    """
+    input_data = {name: application_data[name] for name in NUMERIC_FEATURES}
+    for level in EDUCATION_LEVELS:
+        input_data[f'education_level_{level}'] = 1 if application_data['education_level'] == level else 0
+    for status in MARITAL_STATUSES:
+        input_data[f'marital_status_{status}'] = 1 if application_data['marital_status'] == status else 0
+    input_df = pd.DataFrame([input_data])
+    for col in set(FEATURE_COLUMNS) - set(input_df.columns):
+        input_df[col] = 0
+    return input_df[FEATURE_COLUMNS]
+
+def time_per_call(func: Callable[[], Any], iterations: int) -> float:
+    """
+    Return the mean wall time of func in microseconds.
+    """
+    func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=10000)
+    args = parser.parse_args()
+
+    model, label_encoder = get_model_and_encoder()
+    booster = model.get_booster()
+    app = SAMPLE_APPLICATION
+
+    def dataframe_predict():
+        return label_encoder.inverse_transform(model.predict(dataframe_features(app)))[0]
+
+    legacy = dataframe_predict()
+    current, _ = score_application(app)
+    assert legacy == current, f"encoder mismatch: {legacy!r} != {current!r}"
+
+    results = [
+        ("encode: dict + DataFrame + reindex", time_per_call(lambda: dataframe_features(app), args.iterations)),
+        ("encode: FeatureEncoder buffer", time_per_call(lambda: _feature_encoder.encode(app), args.iterations)),
+        ("trees only: inplace_predict", time_per_call(
+            lambda: booster.inplace_predict(_feature_encoder.buffer(), validate_features=False), args.iterations
+        )),
+        ("score: DataFrame + model.predict", time_per_call(dataframe_predict, args.iterations)),
+        ("score: score_application", time_per_call(lambda: score_application(app), args.iterations)),
+    ]
+    print(f"{args.iterations} iterations, mean per call")
+    for name, micros in results:
+        print(f"  {name:<38} {micros:10.1f} us")
+
+if __name__ == "__main__":
+    main()
@@ -2,20 +2,49 @@
 Machine learning model inference for the Social Support Application Processing System.
 """
 import os
+import hashlib
 import logging
 import pickle
+import threading
+import time
+from datetime import datetime
+import numpy as np
 import pandas as pd
 from pandas import Index
 import xgboost as xgb
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_ollama import ChatOllama
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
 
-from config import MODEL_PATH, LABEL_ENCODER_PATH, LLM_CONFIG
-from document_processing.prompts import ELIGIBILITY_AGENT_PROMPT
+from config import MODEL_PATH, LABEL_ENCODER_PATH, LLM_CONFIG, DECISION_MODEL_CONFIG
+from document_processing.prompts import (
+    ELIGIBILITY_AGENT_PROMPT, ELIGIBILITY_EXPLANATION_TEMPLATE,
+    ELIGIBILITY_DRIVER_TEMPLATES, ELIGIBILITY_DRIVER_DIRECTIONS
+)
 
 logger = logging.getLogger(__name__)
 
+# Feature layout the model was trained on
+NUMERIC_FEATURES = ['monthly_income', 'assets', 'liabilities', 'household_size', 'age']
+EDUCATION_LEVELS = ['bachelor\'s', 'high school', 'master\'s', 'uneducated']
+MARITAL_STATUSES = ['Married', 'Single']
+# Application fields the features are built from
+APPLICATION_FIELDS = NUMERIC_FEATURES + ['education_level', 'marital_status']
+FEATURE_COLUMNS = Index(
+    NUMERIC_FEATURES
+    + [f'education_level_{level}' for level in EDUCATION_LEVELS]
+    + [f'marital_status_{status}' for status in MARITAL_STATUSES]
+)
+
+# Feature columns whose contributions are summed into each explanation driver
+DRIVER_COLUMNS = {
+    **{name: [FEATURE_COLUMNS.get_loc(name)] for name in NUMERIC_FEATURES},
+    'education_level': [FEATURE_COLUMNS.get_loc(f'education_level_{level}') for level in EDUCATION_LEVELS],
+    'marital_status': [FEATURE_COLUMNS.get_loc(f'marital_status_{status}') for status in MARITAL_STATUSES],
+}
+
+EXPLANATION_MODES = ("template", "llm")
+
 def load_model_and_encoder():
     """
     Load the XGBoost model and label encoder.
@@ -40,14 +69,350 @@ def load_model_and_encoder():
         logger.error(f"Error loading model or encoder: {str(e)}")
         raise
 
+class LoadedModel(NamedTuple):
+    """A loaded model and label encoder together with their provenance."""
+    model: Any
+    label_encoder: Any
+    version: str
+    signature: Tuple[Tuple[int, int], ...]
+    load_seconds: float
+    loaded_at: str
+
+
+def _file_signature(*paths) -> Tuple[Tuple[int, int], ...]:
+    """
+    Return (mtime, size) for each file, a cheap check for changes.
+    """
+    signature = []
+    for path in paths:
+        stat = os.stat(path)
+        signature.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+def _files_checksum(*paths) -> str:
+    """
+    Return a short SHA-256 over the contents of the files, used as the model version.
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+class ModelHandle:
+    """
+    Process-wide, read-only model and label encoder shared across threads.
+
+    The model files are checked at most every `check_interval` seconds; when
+    their mtime/size changes and their checksum differs, a new model is
+    loaded off to the side and swapped in with a single assignment.
+
+    If a check or reload fails, the error is logged and the model already in
+    memory keeps serving. Deploy new files by writing each one to a temporary
+    path and moving it into place with os.replace, replacing the model and
+    encoder together, so a reload never reads a partly written file.
+    """
+
+    def __init__(self, model_path, encoder_path, check_interval: float):
+        self.model_path = model_path
+        self.encoder_path = encoder_path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._loaded: Optional[LoadedModel] = None
+        self._last_check = 0.0
+
+    def get(self) -> LoadedModel:
+        """
+        Return the current model, reloading it first if the files changed.
+        """
+        loaded = self._loaded
+        now = time.monotonic()
+        if loaded is not None and now - self._last_check < self.check_interval:
+            return loaded
+        with self._lock:
+            self._last_check = now
+            try:
+                signature = _file_signature(self.model_path, self.encoder_path)
+                if self._loaded is None or signature != self._loaded.signature:
+                    self._reload(signature)
+            except Exception as e:
+                if self._loaded is None:
+                    raise
+                logger.error(
+                    f"Error reloading decision model, keeping version {self._loaded.version}: {str(e)}"
+                )
+            return self._loaded
+
+    def _reload(self, signature: Tuple[Tuple[int, int], ...]) -> None:
+        version = _files_checksum(self.model_path, self.encoder_path)
+        if self._loaded is not None and version == self._loaded.version:
+            # Touched but unchanged; remember the new signature only
+            self._loaded = self._loaded._replace(signature=signature)
+            return
+        start = time.perf_counter()
+        model, label_encoder = load_model_and_encoder()
+        load_seconds = time.perf_counter() - start
+        self._loaded = LoadedModel(
+            model=model,
+            label_encoder=label_encoder,
+            version=version,
+            signature=signature,
+            load_seconds=load_seconds,
+            loaded_at=datetime.now().isoformat()
+        )
+        logger.info(f"Loaded decision model version {version} in {load_seconds:.3f}s")
+
+    def info(self) -> Dict[str, Any]:
+        """
+        Return the active model version and how long it took to load.
+        """
+        loaded = self.get()
+        return {
+            "version": loaded.version,
+            "load_seconds": loaded.load_seconds,
+            "loaded_at": loaded.loaded_at,
+            "model_path": str(self.model_path),
+        }
+
+
+_model_handle = ModelHandle(
+    MODEL_PATH,
+    LABEL_ENCODER_PATH,
+    check_interval=DECISION_MODEL_CONFIG["reload_check_interval_seconds"]
+)
+
+def get_model_and_encoder():
+    """
+    Return the shared model and label encoder, loading them once per process.
+    
+    Returns:
+        Tuple: (model, label_encoder)
+    """
+    loaded = _model_handle.get()
+    return loaded.model, loaded.label_encoder
+
+def get_model_info() -> Dict[str, Any]:
+    """
+    Return the active model version and load time.
+    """
+    return _model_handle.info()
+
+class FeatureEncoder:
+    """
+    Precompiled single-row encoder for the model's feature layout.
+
+    Column positions and the one-hot lookup tables are resolved once, and
+    each thread writes into its own reusable (1, n_features) float32 buffer,
+    so encoding a row allocates nothing.
+    """
+
+    def __init__(self, columns: Sequence[str] = FEATURE_COLUMNS):
+        index = {column: i for i, column in enumerate(columns)}
+        self.n_features = len(index)
+        self._numeric = tuple((name, index[name]) for name in NUMERIC_FEATURES)
+        self._education = {level: index[f'education_level_{level}'] for level in EDUCATION_LEVELS}
+        self._marital_status = {status: index[f'marital_status_{status}'] for status in MARITAL_STATUSES}
+        self._local = threading.local()
+
+    def buffer(self) -> np.ndarray:
+        """
+        Return this thread's reusable feature buffer.
+        """
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = np.zeros((1, self.n_features), dtype=np.float32)
+            self._local.buffer = buffer
+        return buffer
+
+    def encode(self, application_data: Mapping[str, Any]) -> np.ndarray:
+        """
+        Encode one application into this thread's buffer and return it.
+        
+        The buffer is overwritten by the next call on the same thread.
+        """
+        buffer = self.buffer()
+        row = buffer[0]
+        row.fill(0)
+        for name, i in self._numeric:
+            row[i] = application_data[name]
+        # Unknown categories leave every one-hot column at 0
+        i = self._education.get(application_data['education_level'])
+        if i is not None:
+            row[i] = 1
+        i = self._marital_status.get(application_data['marital_status'])
+        if i is not None:
+            row[i] = 1
+        return buffer
+
+
+_feature_encoder = FeatureEncoder()
+
+def score_application(application_data: Mapping[str, Any]) -> Tuple[str, np.ndarray]:
+    """
+    Score one application straight from the encoder buffer.
+    
+    Args:
+        application_data: Dictionary containing application information
+    
+    Returns:
+        Tuple: (decision, class probabilities in label encoder order)
+    """
+    model, label_encoder = get_model_and_encoder()
+    features = _feature_encoder.encode(application_data)
+    probabilities = model.get_booster().inplace_predict(features, validate_features=False)[0]
+    return label_encoder.classes_[int(probabilities.argmax())], probabilities
+
+def _reason_chain():
+    llm = ChatOllama(
+        model=LLM_CONFIG["validation_model"],
+        temperature=LLM_CONFIG["validation_temperature"]
+    )
+    prompt = ChatPromptTemplate.from_template(ELIGIBILITY_AGENT_PROMPT)
+    return prompt | llm
+
+def _reason_inputs(application_data: Dict[str, Any], decision: str) -> Dict[str, Any]:
+    return {
+        'monthly_income': application_data['monthly_income'],
+        'assets': application_data['assets'],
+        'liabilities': application_data['liabilities'],
+        'household_size': application_data['household_size'],
+        'age': application_data['age'],
+        'education_level': application_data['education_level'],
+        'marital_status': application_data['marital_status'],
+        'decision': decision
+    }
+
+def generate_llm_reason(application_data: Dict[str, Any], decision: str) -> str:
+    """
+    Ask the validation LLM to explain a decision.
+    
+    Args:
+        application_data: Dictionary containing application information
+        decision: Decision made by the model
+    
+    Returns:
+        str: Reason for the decision
+    """
+    result = _reason_chain().invoke(_reason_inputs(application_data, decision))
+    
+    # Extract reason from result (assuming result.content has the reason)
+    return result.content.split("</think>")[-1].strip()
+
+async def agenerate_llm_reason(application_data: Dict[str, Any], decision: str) -> str:
+    """
+    Async variant of generate_llm_reason.
+    """
+    result = await _reason_chain().ainvoke(_reason_inputs(application_data, decision))
+    return result.content.split("</think>")[-1].strip()
+
+def feature_contributions(features: np.ndarray) -> np.ndarray:
+    """
+    Return per-feature contributions to each class margin from the booster.
+    
+    Args:
+        features: float32 matrix in FEATURE_COLUMNS order
+    
+    Returns:
+        np.ndarray: (rows, classes, features + 1) array; the last column is the bias
+    """
+    model, _ = get_model_and_encoder()
+    return model.get_booster().predict(
+        xgb.DMatrix(features), pred_contribs=True, validate_features=False
+    )
+
+def template_reason(
+    application_data: Mapping[str, Any],
+    decision: str,
+    probability: float,
+    contributions: np.ndarray,
+    top_features: Optional[int] = None
+) -> str:
+    """
+    Render a reason naming the features that contributed most to a decision.
+    
+    Args:
+        application_data: Dictionary containing application information
+        decision: Decision made by the model
+        probability: Model probability of the decision
+        contributions: Contributions to the decided class's margin, one per feature
+        top_features: Number of features to name; defaults to the configured value
+    
+    Returns:
+        str: Reason for the decision
+    """
+    if top_features is None:
+        top_features = DECISION_MODEL_CONFIG["explanation_top_features"]
+    drivers = {
+        name: float(contributions[columns].sum()) for name, columns in DRIVER_COLUMNS.items()
+    }
+    ranked = sorted(
+        (name for name, value in drivers.items() if value != 0),
+        key=lambda name: abs(drivers[name]),
+        reverse=True
+    )[:top_features]
+    descriptions = [
+        ELIGIBILITY_DRIVER_DIRECTIONS[drivers[name] >= 0].format(
+            driver=ELIGIBILITY_DRIVER_TEMPLATES[name].format(**application_data)
+        )
+        for name in ranked
+    ]
+    if not descriptions:
+        descriptions = ["the model's baseline, as no single feature moved the decision"]
+    elif len(descriptions) > 1:
+        descriptions[-1] = f"and {descriptions[-1]}"
+    return ELIGIBILITY_EXPLANATION_TEMPLATE.format(
+        decision=decision,
+        probability=probability,
+        drivers="; ".join(descriptions)
+    )
+
+def explain_decision(
+    application_data: Mapping[str, Any],
+    decision: str,
+    probabilities: np.ndarray,
+    explanation_mode: Optional[str] = None
+) -> str:
+    """
+    Explain a decision from feature contributions, or with the LLM if requested.
+    
+    Args:
+        application_data: Dictionary containing application information
+        decision: Decision made by the model
+        probabilities: Class probabilities in label encoder order
+        explanation_mode: "template" or "llm"; defaults to the configured mode
+    
+    Returns:
+        str: Reason for the decision
+    
+    Raises:
+        ValueError: If the explanation mode is unknown
+    """
+    explanation_mode = explanation_mode or DECISION_MODEL_CONFIG["explanation_mode"]
+    if explanation_mode not in EXPLANATION_MODES:
+        raise ValueError(f"Unknown explanation mode: {explanation_mode}")
+    if explanation_mode == "llm":
+        return generate_llm_reason(application_data, decision)
+    
+    _, label_encoder = get_model_and_encoder()
+    class_index = int(np.flatnonzero(label_encoder.classes_ == decision)[0])
+    contributions = feature_contributions(_feature_encoder.encode(application_data))
+    return template_reason(
+        application_data, decision, float(probabilities[class_index]), contributions[0, class_index]
+    )
+
 def predict_eligibility(
-    application_data: Dict[str, Any]
+    application_data: Dict[str, Any],
+    explanation_mode: Optional[str] = None
 ) -> Tuple[str, str]:
     """
     Predict eligibility for social support based on application data.
     
     Args:
         application_data: Dictionary containing application information
+        explanation_mode: "template" to explain the decision from the model's
+            feature contributions, "llm" to have the validation model write
+            it; defaults to DECISION_MODEL_CONFIG["explanation_mode"]
         
     Returns:
         Tuple: (decision, reason)
@@ -56,75 +421,121 @@ def predict_eligibility(
         Exception: If prediction fails
     """
     try:
-        # Load model and encoder
-        model, label_encoder = load_model_and_encoder()
-        
-        # Prepare feature columns
-        X_columns = Index([
-            'monthly_income', 'assets', 'liabilities', 'household_size', 'age',
-            'education_level_bachelor\'s', 'education_level_high school',
-            'education_level_master\'s', 'education_level_uneducated',
-            'marital_status_Married', 'marital_status_Single'
-        ])
-        
-        # Create input data dictionary
-        input_data = {
-            'monthly_income': application_data['monthly_income'],
-            'assets': application_data['assets'],
-            'liabilities': application_data['liabilities'],
-            'household_size': application_data['household_size'],
-            'age': application_data['age']
-        }
+        # Score from the shared encoder buffer, without pandas
+        decision, probabilities = score_application(application_data)
         
-        # Create one-hot encoded columns for education_level
-        for level in ['bachelor\'s', 'high school', 'master\'s', 'uneducated']:
-            input_data[f'education_level_{level}'] = 1 if application_data['education_level'] == level else 0
+        # Explain the decision
+        reason = explain_decision(application_data, decision, probabilities, explanation_mode)
         
-        # Create one-hot encoded columns for marital_status
-        for status in ['Married', 'Single']:
-            input_data[f'marital_status_{status}'] = 1 if application_data['marital_status'] == status else 0
-        
-        # Create DataFrame with the input data
-        input_df = pd.DataFrame([input_data])
-        
-        # Ensure columns match the training data
-        missing_cols = set(X_columns) - set(input_df.columns)
-        for col in missing_cols:
-            input_df[col] = 0
-        
-        # Ensure column order matches the training data
-        input_df = input_df[X_columns]
-        
-        # Make prediction
-        prediction = model.predict(input_df)[0]
-        
-        # Convert prediction back to original label
-        decision = label_encoder.inverse_transform([prediction])[0]
-        
-        # Get reasoning for decision using LLM
-        llm = ChatOllama(
-            model=LLM_CONFIG["validation_model"],
-            temperature=LLM_CONFIG["validation_temperature"]
-        )
+        return decision, reason
+    except Exception as e:
+        logger.error(f"Error predicting eligibility: {str(e)}")
+        raise
+
+async def apredict_eligibility(
+    application_data: Dict[str, Any],
+    explanation_mode: Optional[str] = None
+) -> Tuple[str, str]:
+    """
+    Async variant of predict_eligibility. Scoring runs inline, as it takes
+    well under a millisecond; only an LLM explanation is awaited.
+    """
+    try:
+        decision, probabilities = score_application(application_data)
+        if (explanation_mode or DECISION_MODEL_CONFIG["explanation_mode"]) == "llm":
+            reason = await agenerate_llm_reason(application_data, decision)
+        else:
+            reason = explain_decision(application_data, decision, probabilities, explanation_mode)
+        return decision, reason
+    except Exception as e:
+        logger.error(f"Error predicting eligibility: {str(e)}")
+        raise
+
+def build_feature_matrix(
+    applications: Union[pd.DataFrame, Mapping[str, Sequence[Any]]]
+) -> np.ndarray:
+    """
+    One-hot encode many applications into the model's feature layout in one pass.
+    
+    Args:
+        applications: DataFrame or mapping of column name to array, with the
+            numeric features plus education_level and marital_status
+    
+    Returns:
+        np.ndarray: float32 matrix with one row per application, columns in
+            FEATURE_COLUMNS order
+    """
+    n_rows = len(applications[NUMERIC_FEATURES[0]])
+    features = np.zeros((n_rows, len(FEATURE_COLUMNS)), dtype=np.float32)
+    for i, column in enumerate(NUMERIC_FEATURES):
+        features[:, i] = np.asarray(applications[column], dtype=np.float32)
+    
+    offset = len(NUMERIC_FEATURES)
+    education = np.asarray(applications['education_level'], dtype=object)
+    for i, level in enumerate(EDUCATION_LEVELS):
+        features[:, offset + i] = education == level
+    
+    offset += len(EDUCATION_LEVELS)
+    marital_status = np.asarray(applications['marital_status'], dtype=object)
+    for i, status in enumerate(MARITAL_STATUSES):
+        features[:, offset + i] = marital_status == status
+    return features
+
+def predict_eligibility_batch(
+    applications: Union[pd.DataFrame, Mapping[str, Sequence[Any]]],
+    explain: bool = False,
+    explanation_mode: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Score many applications with a single model call.
+    
+    Args:
+        applications: DataFrame or mapping of column name to array, with the
+            numeric features plus education_level and marital_status
+        explain: Whether to add a reason for every row
+        explanation_mode: "template" or "llm" (slow); defaults to the configured mode
+    
+    Returns:
+        pd.DataFrame: decision, probability of that decision and one
+            probability column per class, one row per application, plus a
+            reason column when explain is set
+    
+    Raises:
+        Exception: If prediction fails
+    """
+    try:
+        model, label_encoder = get_model_and_encoder()
+        features = build_feature_matrix(applications)
         
-        prompt = ChatPromptTemplate.from_template(ELIGIBILITY_AGENT_PROMPT)
-        chain = prompt | llm
+        probabilities = model.predict_proba(features)
+        predictions = probabilities.argmax(axis=1)
+        decisions = label_encoder.inverse_transform(predictions)
         
-        result = chain.invoke({
-            'monthly_income': application_data['monthly_income'],
-            'assets': application_data['assets'],
-            'liabilities': application_data['liabilities'],
-            'household_size': application_data['household_size'],
-            'age': application_data['age'],
-            'education_level': application_data['education_level'],
-            'marital_status': application_data['marital_status'],
-            'decision': decision
+        results = pd.DataFrame({
+            'decision': decisions,
+            'probability': probabilities[np.arange(len(predictions)), predictions],
         })
+        for i, label in enumerate(label_encoder.classes_):
+            results[f'probability_{label}'] = probabilities[:, i]
         
-        # Extract reason from result (assuming result.content has the reason)
-        reason = result.content.split("</think>")[-1].strip()
-        
-        return decision, reason
+        if explain:
+            explanation_mode = explanation_mode or DECISION_MODEL_CONFIG["explanation_mode"]
+            if explanation_mode not in EXPLANATION_MODES:
+                raise ValueError(f"Unknown explanation mode: {explanation_mode}")
+            rows = pd.DataFrame(applications).to_dict('records')
+            if explanation_mode == "llm":
+                reasons = [generate_llm_reason(row, decision) for row, decision in zip(rows, decisions)]
+            else:
+                contributions = feature_contributions(features)
+                reasons = [
+                    template_reason(
+                        row, decision, float(probabilities[i, predictions[i]]),
+                        contributions[i, predictions[i]]
+                    )
+                    for i, (row, decision) in enumerate(zip(rows, decisions))
+                ]
+            results['reason'] = reasons
+        return results
     except Exception as e:
-        logger.error(f"Error predicting eligibility: {str(e)}")
-        raise
\ No newline at end of file
+        logger.error(f"Error predicting eligibility batch: {str(e)}")
+        raise
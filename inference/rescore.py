@@ -0,0 +1,191 @@
+"""
+Offline re-scoring of stored applications with the current decision model.
+
+Streams the application table with a server-side cursor in fixed-size
+chunks, scores each chunk with the batch model path and writes decisions
+back in bulk. Progress is checkpointed after every committed chunk, so an
+interrupted run resumes where it stopped:
+
+    python -m inference.rescore [--chunk-size N] [--restart]
+
+Only rows the model decided, saved with application_features, are
+re-scored; applications whose decision was cleared by a failed validation
+or component are left as they are. Template reasons are regenerated;
+enablement recommendations are left as they are.
+"""
+import argparse
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import pandas as pd
+from psycopg2.extras import execute_values
+
+from config import RESCORE_CONFIG
+from database.db_operations import connection
+from database.migrations import parse_json_text, run_migrations
+from inference.decision_model import APPLICATION_FIELDS, get_model_info, predict_eligibility_batch
+
+logger = logging.getLogger(__name__)
+
+SELECT_APPLICATIONS = """
+    SELECT id, decision, application_features
+    FROM application
+    WHERE id > %s AND application_features IS NOT NULL
+      AND model_version IS NOT NULL AND decision <> ''
+    ORDER BY id
+"""
+
+UPDATE_DECISIONS = """
+    UPDATE application AS a
+    SET decision = v.decision,
+        support_type = v.decision,
+        decision_reason = v.reason,
+        decision_date = v.decision_date,
+        model_version = v.model_version
+    FROM (VALUES %s) AS v(id, decision, reason, decision_date, model_version)
+    WHERE a.id = v.id
+"""
+
+def load_checkpoint(path: Path, model_version: str, restart: bool = False) -> Dict[str, Any]:
+    """
+    Return the saved progress for this model version, or a fresh start.
+    """
+    fresh = {"model_version": model_version, "last_id": 0, "rows": 0, "changed": 0}
+    if restart or not path.exists():
+        return fresh
+    with open(path) as f:
+        checkpoint = json.load(f)
+    if checkpoint.get("model_version") != model_version:
+        logger.info(
+            f"Checkpoint is for model version {checkpoint.get('model_version')}, "
+            f"starting over for {model_version}"
+        )
+        return fresh
+    return checkpoint
+
+def save_checkpoint(path: Path, checkpoint: Dict[str, Any]) -> None:
+    """
+    Atomically write progress to disk.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+def _features(value: Any) -> Dict[str, Any]:
+    """
+    Return a row's application features as a dict; values saved as text
+    before the JSONB migration are decoded like the migration does.
+    """
+    if isinstance(value, str):
+        return parse_json_text(value) or {}
+    return value
+
+def rescore_chunk(rows, model_version: str):
+    """
+    Score one chunk of (id, decision, application_features) rows.
+
+    Returns:
+        Tuple: (update values, number of changed decisions)
+    """
+    ids = [row[0] for row in rows]
+    previous = [row[1] for row in rows]
+    applications = pd.DataFrame.from_records(
+        [_features(row[2]) for row in rows], columns=APPLICATION_FIELDS
+    )
+    results = predict_eligibility_batch(applications, explain=True, explanation_mode="template")
+    decided_at = datetime.now().isoformat()
+    values = [
+        (application_id, decision, reason, decided_at, model_version)
+        for application_id, decision, reason in zip(ids, results["decision"], results["reason"])
+    ]
+    changed = sum(old != new for old, new in zip(previous, results["decision"]))
+    return values, changed
+
+def rescore_applications(
+    chunk_size: int = RESCORE_CONFIG["chunk_size"],
+    checkpoint_path: Path = RESCORE_CONFIG["checkpoint_path"],
+    restart: bool = False
+) -> Dict[str, Any]:
+    """
+    Re-score every stored application with the current model.
+
+    Args:
+        chunk_size: Rows fetched, scored and written per round trip
+        checkpoint_path: Where progress is saved between chunks
+        restart: Ignore any saved progress
+
+    Returns:
+        Dict: Final checkpoint with rows processed, decisions changed and rows/sec
+    """
+    checkpoint_path = Path(checkpoint_path)
+    # The queries below expect the typed columns of the current schema
+    with connection() as conn:
+        applied = run_migrations(conn)
+    if applied:
+        logger.info(f"Applied database migrations: {applied}")
+
+    model_version = get_model_info()["version"]
+    checkpoint = load_checkpoint(checkpoint_path, model_version, restart)
+    logger.info(f"Re-scoring applications after id {checkpoint['last_id']} with model {model_version}")
+
+    # Reads stream from a server-side cursor on their own connection, so
+    # committing each chunk's updates does not close it
+    start = time.perf_counter()
+    processed = 0
+    with connection() as read_conn, connection() as write_conn:
+        with read_conn.cursor(name="rescore_applications") as read_cursor:
+            read_cursor.itersize = chunk_size
+            read_cursor.execute(SELECT_APPLICATIONS, (checkpoint["last_id"],))
+            while True:
+                rows = read_cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                values, changed = rescore_chunk(rows, model_version)
+                with write_conn.cursor() as write_cursor:
+                    execute_values(
+                        write_cursor, UPDATE_DECISIONS, values,
+                        template="(%s::integer, %s, %s, %s::timestamptz, %s)", page_size=chunk_size
+                    )
+                write_conn.commit()
+
+                processed += len(rows)
+                checkpoint.update(
+                    last_id=rows[-1][0],
+                    rows=checkpoint["rows"] + len(rows),
+                    changed=checkpoint["changed"] + changed
+                )
+                save_checkpoint(checkpoint_path, checkpoint)
+                elapsed = time.perf_counter() - start
+                logger.info(
+                    f"Re-scored {checkpoint['rows']} rows (up to id {checkpoint['last_id']}), "
+                    f"{checkpoint['changed']} changed, {processed / elapsed:.0f} rows/sec"
+                )
+
+    elapsed = time.perf_counter() - start
+    checkpoint["rows_per_second"] = processed / elapsed if elapsed else 0.0
+    logger.info(
+        f"Re-scoring complete: {checkpoint['rows']} rows, {checkpoint['changed']} changed, "
+        f"{checkpoint['rows_per_second']:.0f} rows/sec"
+    )
+    return checkpoint
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="Re-score stored applications with the current model")
+    parser.add_argument("--chunk-size", type=int, default=RESCORE_CONFIG["chunk_size"])
+    parser.add_argument("--checkpoint", default=str(RESCORE_CONFIG["checkpoint_path"]))
+    parser.add_argument("--restart", action="store_true", help="ignore saved progress")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    rescore_applications(args.chunk_size, Path(args.checkpoint), args.restart)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+Export of the eligibility model to flat NumPy arrays, and a pure-NumPy
+evaluator for them.
+
+The evaluator does not import xgboost, so lightweight worker processes can
+score with only NumPy loaded. Export and verify with:
+
+    python -m inference.tree_export [--output PATH] [--verify-rows N]
+"""
+import argparse
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+
+from config import MODEL_PATH, COMPILED_MODEL_PATH
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_OBJECTIVES = ("multi:softprob", "multi:softmax")
+
+
+def _model_checksum(model_path: Union[str, Path]) -> str:
+    with open(model_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:12]
+
+def export_model(
+    model_path: Union[str, Path] = MODEL_PATH,
+    output_path: Union[str, Path] = COMPILED_MODEL_PATH
+) -> Path:
+    """
+    Flatten the trees of an XGBoost model into NumPy arrays saved as .npz.
+
+    All trees share one node table. Leaves point to themselves, so every row
+    can be walked for the same number of steps (the maximum tree depth).
+
+    Args:
+        model_path: Path to the XGBoost model
+        output_path: Where to write the arrays
+
+    Returns:
+        Path: The written file
+
+    Raises:
+        ValueError: If the model uses features the evaluator does not support
+    """
+    import xgboost as xgb
+
+    booster = xgb.Booster()
+    booster.load_model(str(model_path))
+    learner = json.loads(booster.save_raw("json"))["learner"]
+    objective = learner["objective"]["name"]
+    if objective not in SUPPORTED_OBJECTIVES:
+        raise ValueError(f"Unsupported objective: {objective}")
+    gbtree = learner["gradient_booster"]
+    if gbtree["name"] != "gbtree":
+        raise ValueError(f"Unsupported booster: {gbtree['name']}")
+
+    n_classes = int(learner["learner_model_param"]["num_class"])
+    base_score = np.asarray(
+        json.loads(learner["learner_model_param"]["base_score"]), dtype=np.float32
+    )
+    base_margin = np.broadcast_to(base_score, (n_classes,)).astype(np.float32)
+
+    trees = gbtree["model"]["trees"]
+    feature, threshold, left, right, default_left = [], [], [], [], []
+    roots, max_depth, offset = [], 0, 0
+    for tree in trees:
+        if any(tree["split_type"]):
+            raise ValueError("Categorical splits are not supported")
+        tree_left = np.asarray(tree["left_children"], dtype=np.int32)
+        tree_right = np.asarray(tree["right_children"], dtype=np.int32)
+        is_leaf = tree_left == -1
+        node_ids = np.arange(len(tree_left), dtype=np.int32)
+        # Leaves loop back to themselves; their split condition is the leaf value
+        feature.append(np.where(is_leaf, 0, tree["split_indices"]).astype(np.int32))
+        threshold.append(np.asarray(tree["split_conditions"], dtype=np.float32))
+        left.append(np.where(is_leaf, node_ids, tree_left) + offset)
+        right.append(np.where(is_leaf, node_ids, tree_right) + offset)
+        default_left.append(np.asarray(tree["default_left"], dtype=bool))
+        roots.append(offset)
+        max_depth = max(max_depth, _tree_depth(tree_left, tree_right))
+        offset += len(tree_left)
+
+    feature_names = learner.get("feature_names") or []
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez(
+        output_path,
+        feature=np.concatenate(feature),
+        threshold=np.concatenate(threshold),
+        left=np.concatenate(left).astype(np.int32),
+        right=np.concatenate(right).astype(np.int32),
+        default_left=np.concatenate(default_left),
+        roots=np.asarray(roots, dtype=np.int32),
+        tree_class=np.asarray(gbtree["model"]["tree_info"], dtype=np.int32),
+        base_margin=base_margin,
+        max_depth=np.int32(max_depth),
+        n_features=np.int32(learner["learner_model_param"]["num_feature"]),
+        feature_names=np.asarray(feature_names, dtype=str),
+        source_checksum=np.asarray(_model_checksum(model_path)),
+    )
+    logger.info(f"Exported {len(trees)} trees ({offset} nodes, depth {max_depth}) to {output_path}")
+    return output_path
+
+def _tree_depth(left: np.ndarray, right: np.ndarray) -> int:
+    depth, frontier = 0, [0]
+    while True:
+        frontier = [child for node in frontier for child in (left[node], right[node]) if child != -1]
+        if not frontier:
+            return depth
+        depth += 1
+
+
+class CompiledTrees:
+    """
+    Pure-NumPy evaluator for a model exported with export_model.
+
+    Rows are walked through every tree at once, one tree level per step, and
+    leaf values are summed per class in float32 and tree order, matching
+    xgboost's own accumulation.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.left = arrays["left"]
+        self.right = arrays["right"]
+        self.default_left = arrays["default_left"]
+        self.roots = arrays["roots"]
+        self.tree_class = arrays["tree_class"]
+        self.base_margin = arrays["base_margin"]
+        self.max_depth = int(arrays["max_depth"])
+        self.n_features = int(arrays["n_features"])
+        self.feature_names = [str(name) for name in arrays["feature_names"]]
+        self.source_checksum = str(arrays["source_checksum"])
+        self.n_classes = len(self.base_margin)
+        self._class_trees = [np.flatnonzero(self.tree_class == c) for c in range(self.n_classes)]
+
+    @classmethod
+    def load(cls, path: Union[str, Path] = COMPILED_MODEL_PATH) -> "CompiledTrees":
+        """
+        Load exported arrays from disk.
+        """
+        with np.load(path) as arrays:
+            return cls({name: arrays[name] for name in arrays.files})
+
+    def is_current(self, model_path: Union[str, Path] = MODEL_PATH) -> bool:
+        """
+        Whether these arrays were exported from the model file as it is now.
+        """
+        return self.source_checksum == _model_checksum(model_path)
+
+    def leaf_values(self, features: np.ndarray) -> np.ndarray:
+        """
+        Return the leaf value each row reaches in each tree, shape (rows, trees).
+        """
+        features = np.atleast_2d(np.asarray(features, dtype=np.float32))
+        if features.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got {features.shape[1]}")
+        rows = np.arange(len(features))[:, None]
+        nodes = np.broadcast_to(self.roots, (len(features), len(self.roots)))
+        for _ in range(self.max_depth):
+            values = features[rows, self.feature[nodes]]
+            go_left = np.where(np.isnan(values), self.default_left[nodes], values < self.threshold[nodes])
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return self.threshold[nodes]
+
+    def predict_margin(self, features: np.ndarray) -> np.ndarray:
+        """
+        Return raw per-class scores, shape (rows, classes).
+        """
+        leaves = self.leaf_values(features)
+        margins = np.empty((len(leaves), self.n_classes), dtype=np.float32)
+        for c, trees in enumerate(self._class_trees):
+            # cumsum adds sequentially, unlike sum's pairwise reduction
+            terms = np.empty((len(leaves), len(trees) + 1), dtype=np.float32)
+            terms[:, 0] = self.base_margin[c]
+            terms[:, 1:] = leaves[:, trees]
+            margins[:, c] = np.cumsum(terms, axis=1, dtype=np.float32)[:, -1]
+        return margins
+
+    def predict_proba(self, features: np.ndarray) -> np.ndarray:
+        """
+        Return class probabilities, shape (rows, classes).
+        """
+        margins = self.predict_margin(features)
+        exp = np.exp(margins - margins.max(axis=1, keepdims=True))
+        return exp / exp.sum(axis=1, keepdims=True, dtype=np.float32)
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        """
+        Return the predicted class index for each row.
+        """
+        return self.predict_proba(features).argmax(axis=1)
+
+
+def validation_rows(compiled: CompiledTrees, n_rows: int, seed: int = 0) -> np.ndarray:
+    """
+    Draw rows around the model's split thresholds, so every branch is exercised.
+    """
+    rng = np.random.default_rng(seed)
+    features = np.empty((n_rows, compiled.n_features), dtype=np.float32)
+    is_split = compiled.left != np.arange(len(compiled.left))
+    for i in range(compiled.n_features):
+        thresholds = compiled.threshold[is_split & (compiled.feature == i)]
+        if len(thresholds) == 0:
+            features[:, i] = rng.integers(0, 2, n_rows)
+            continue
+        picks = rng.choice(thresholds, n_rows)
+        jitter = rng.choice([-1.0, 0.0, 1.0], n_rows) * np.maximum(np.abs(picks) * 0.01, 0.5)
+        features[:, i] = picks + jitter
+    return features
+
+def verify(compiled: CompiledTrees, model_path: Union[str, Path] = MODEL_PATH, n_rows: int = 100000) -> Dict[str, Any]:
+    """
+    Compare the evaluator with XGBClassifier on generated validation rows.
+
+    Returns:
+        Dict: Mismatch counts for margins and predictions, and the largest
+            probability difference
+    """
+    import xgboost as xgb
+
+    model = xgb.XGBClassifier()
+    model.load_model(str(model_path))
+    features = validation_rows(compiled, n_rows)
+    margins = model.get_booster().inplace_predict(features, predict_type="margin", validate_features=False)
+    probabilities = model.predict_proba(features)
+    return {
+        "rows": n_rows,
+        "margin_mismatches": int(np.any(compiled.predict_margin(features) != margins, axis=1).sum()),
+        "prediction_mismatches": int((compiled.predict(features) != model.predict(features)).sum()),
+        "max_probability_difference": float(np.abs(compiled.predict_proba(features) - probabilities).max()),
+    }
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="Export the eligibility model to NumPy arrays")
+    parser.add_argument("--model", default=str(MODEL_PATH))
+    parser.add_argument("--output", default=str(COMPILED_MODEL_PATH))
+    parser.add_argument("--verify-rows", type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    path = export_model(args.model, args.output)
+    if args.verify_rows:
+        result = verify(CompiledTrees.load(path), args.model, args.verify_rows)
+        logger.info(f"Verification: {result}")
+        if result["margin_mismatches"] or result["prediction_mismatches"]:
+            raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
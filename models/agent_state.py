@@ -11,7 +11,7 @@ class AgentState(TypedDict):
     State object for workflow agents.
     
     Attributes:
-        cached_extraction_data_file_path: Path to cached extraction data
+        use_cached_extraction: Whether to reuse cached extractions of identical documents
         extraction_filepath_dict: Dictionary mapping document types to file paths
         application_data: Application data from the applicant
         extracted_data: Data extracted from documents
@@ -19,9 +19,11 @@ class AgentState(TypedDict):
         decision: Decision made by the model
         chatbot_conversation: List of conversation messages
         recommendations: Recommendations for the applicant
+        details_id: Identifies the thread's latest application, whose deferred
+            decision details may still be written to the state
         messages: Messages passed between agents
     """
-    cached_extraction_data_file_path: str
+    use_cached_extraction: bool
     extraction_filepath_dict: Dict[str, str]
     application_data: Dict[str, Any]
     extracted_data: Dict[str, Any]
@@ -29,4 +31,5 @@ class AgentState(TypedDict):
     decision: Dict[str, Any]
     chatbot_conversation: List[str]
     recommendations: str
+    details_id: str
     messages: Annotated[List[AnyMessage], operator.add]
\ No newline at end of file
@@ -0,0 +1,79 @@
+"""
+Tests for the chatbot's document retrieval and its use of the embedding cache.
+"""
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from agents import chatbot
+from caching.disk_cache import DiskCache
+from config import EMBEDDING_CACHE_CONFIG
+from vector_store import embeddings
+from vector_store.embeddings import BatchedOllamaEmbedding, EmbeddingCache
+
+
+class FakeOllamaClient:
+    """Stands in for the Ollama client, counting the texts sent for embedding."""
+
+    def __init__(self):
+        self.inputs = []
+
+    def embed(self, model, input, options=None):
+        self.inputs.append(list(input))
+        return {"embeddings": [[float(len(text)), 1.0] for text in input]}
+
+class FakeChain:
+    def invoke(self, inputs):
+        return SimpleNamespace(content=f"Answer to: {inputs['userQuestion']}")
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = EmbeddingCache(memory_entries=16, disk_cache=DiskCache(tmp_path / "embeddings.sqlite3", 1 << 20))
+    monkeypatch.setattr(embeddings, "_embedding_cache", cache)
+    monkeypatch.setitem(EMBEDDING_CACHE_CONFIG, "enabled", True)
+    return cache
+
+@pytest.fixture
+def client(cache, monkeypatch):
+    client = FakeOllamaClient()
+    embed_model = BatchedOllamaEmbedding(model_name="test-embedding")
+    embed_model._client = client
+
+    def query_vector_db(query, applicant_id=None):
+        embed_model.get_query_embedding(query)
+        return ["Applicant documents."]
+
+    monkeypatch.setattr(chatbot, "query_vector_db", query_vector_db)
+    monkeypatch.setattr(chatbot, "_conversation_chain", FakeChain)
+    return client
+
+
+def ask(question, conversation):
+    # The supervisor passes the user's query on as its latest message
+    state = {
+        "messages": [("user", question), HumanMessage(content=question, name="supervisor")],
+        "chatbot_conversation": list(conversation),
+        "application_data": {"applicant_id": "applicant-1"},
+    }
+    return chatbot.chatbot_node(state).update["chatbot_conversation"]
+
+
+def test_retrieval_query_is_the_latest_question():
+    state = {
+        "messages": [HumanMessage(content="What is my status?", name="supervisor")],
+        "chatbot_conversation": ["User: Hello", "System: Hi"],
+        "application_data": {"applicant_id": "applicant-1"},
+    }
+    assert chatbot._context_query(state) == ("applicant-1", "What is my status?")
+
+def test_repeated_question_is_an_embedding_cache_hit(client, cache):
+    conversation = ask("What is my application status?", [])
+    conversation = ask("Why was it declined?", conversation)
+    conversation = ask("What is my application status?", conversation)
+
+    assert client.inputs == [["What is my application status?"], ["Why was it declined?"]]
+    assert cache.stats()["memory_hits"] == 1
+    # The full history still reaches the LLM prompt
+    assert len(conversation) == 6
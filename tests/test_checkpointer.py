@@ -0,0 +1,118 @@
+"""
+Tests for the SQLite checkpoint saver.
+"""
+import sqlite3
+import time
+
+import pytest
+from langgraph.checkpoint.base import empty_checkpoint
+
+from workflow.checkpointer import SQLiteCheckpointer
+
+
+def make_saver(path, keep_last=20, ttl_seconds=None):
+    # The background compaction never runs during a test; compact() is called directly
+    return SQLiteCheckpointer(path, keep_last, ttl_seconds, compaction_interval=3600)
+
+def put_checkpoint(saver, thread_id, step, parent=None):
+    checkpoint = empty_checkpoint()
+    checkpoint["channel_values"] = {"messages": [f"message {step}"]}
+    config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    if parent is not None:
+        config["configurable"]["checkpoint_id"] = parent["configurable"]["checkpoint_id"]
+    return saver.put(config, checkpoint, {"source": "loop", "step": step}, {})
+
+def put_steps(saver, thread_id, steps):
+    config = None
+    for step in range(steps):
+        config = put_checkpoint(saver, thread_id, step, config)
+    return config
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "checkpoints" / "checkpoints.sqlite3"
+
+
+def test_put_and_get_tuple_round_trip(path):
+    saver = make_saver(path)
+    first = put_checkpoint(saver, "thread-1", 0)
+    second = put_checkpoint(saver, "thread-1", 1, first)
+
+    latest = saver.get_tuple({"configurable": {"thread_id": "thread-1"}})
+    assert latest.config["configurable"]["checkpoint_id"] == second["configurable"]["checkpoint_id"]
+    assert latest.parent_config["configurable"]["checkpoint_id"] == first["configurable"]["checkpoint_id"]
+    assert latest.checkpoint["channel_values"] == {"messages": ["message 1"]}
+    assert latest.metadata["step"] == 1
+
+    earlier = saver.get_tuple(first)
+    assert earlier.checkpoint["channel_values"] == {"messages": ["message 0"]}
+    assert saver.get_tuple({"configurable": {"thread_id": "thread-2"}}) is None
+
+def test_list_is_newest_first_and_filters(path):
+    saver = make_saver(path)
+    put_steps(saver, "thread-1", 3)
+    put_steps(saver, "thread-2", 1)
+
+    steps = [t.metadata["step"] for t in saver.list({"configurable": {"thread_id": "thread-1"}})]
+    assert steps == [2, 1, 0]
+    assert len(list(saver.list({"configurable": {"thread_id": "thread-1"}}, limit=2))) == 2
+    assert [t.metadata["step"] for t in saver.list(None, filter={"step": 0})] == [0, 0]
+
+def test_put_writes_are_returned_as_pending_writes(path):
+    saver = make_saver(path)
+    config = put_checkpoint(saver, "thread-1", 0)
+    saver.put_writes(config, [("messages", "a"), ("decision", {"decision": "x"})], task_id="task-1")
+    # Regular writes are kept once; a retried task does not overwrite them
+    saver.put_writes(config, [("messages", "b")], task_id="task-1")
+
+    pending = saver.get_tuple(config).pending_writes
+    assert sorted(pending, key=lambda w: w[1]) == [
+        ("task-1", "decision", {"decision": "x"}),
+        ("task-1", "messages", "a"),
+    ]
+
+def test_keep_last_compaction(path):
+    saver = make_saver(path, keep_last=2)
+    latest = put_steps(saver, "thread-1", 5)
+    put_steps(saver, "thread-2", 1)
+
+    assert saver.compact() == 3
+    steps = [t.metadata["step"] for t in saver.list({"configurable": {"thread_id": "thread-1"}})]
+    assert steps == [4, 3]
+    assert saver.get_tuple({"configurable": {"thread_id": "thread-1"}}).config == latest
+    assert saver.get_tuple({"configurable": {"thread_id": "thread-2"}}) is not None
+    assert saver.stats()["checkpoints"] == 3
+
+def test_ttl_compaction_removes_old_checkpoints_and_their_writes(path):
+    saver = make_saver(path, ttl_seconds=60)
+    old = put_checkpoint(saver, "old-thread", 0)
+    saver.put_writes(old, [("messages", "a")], task_id="task-1")
+    put_checkpoint(saver, "new-thread", 0)
+    with sqlite3.connect(path) as conn:
+        conn.execute("UPDATE checkpoints SET created_at = ? WHERE thread_id = 'old-thread'", (time.time() - 120,))
+
+    assert saver.compact() == 1
+    assert saver.get_tuple({"configurable": {"thread_id": "old-thread"}}) is None
+    assert saver.get_tuple({"configurable": {"thread_id": "new-thread"}}) is not None
+    assert saver.stats()["writes"] == 0
+
+def test_reopen_after_restart(path):
+    saver = make_saver(path)
+    config = put_steps(saver, "thread-1", 2)
+    saver.put_writes(config, [("messages", "a")], task_id="task-1")
+
+    reopened = make_saver(path)
+    latest = reopened.get_tuple({"configurable": {"thread_id": "thread-1"}})
+    assert latest.config == config
+    assert latest.checkpoint["channel_values"] == {"messages": ["message 1"]}
+    assert latest.pending_writes == [("task-1", "messages", "a")]
+
+def test_delete_thread(path):
+    saver = make_saver(path)
+    put_steps(saver, "thread-1", 2)
+    put_steps(saver, "thread-2", 1)
+
+    saver.delete_thread("thread-1")
+    assert saver.get_tuple({"configurable": {"thread_id": "thread-1"}}) is None
+    assert saver.stats()["threads"] == 1
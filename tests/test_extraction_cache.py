@@ -0,0 +1,104 @@
+"""
+Tests for the per-document extraction cache switches and document hashing.
+"""
+import pytest
+
+pytest.importorskip("easyocr")
+
+from config import EXTRACTION_CACHE_CONFIG, EXTRACTION_CONFIG, TEXT_CACHE_CONFIG
+from document_processing import extraction, ocr
+
+
+class CountingCache:
+    """Cache stand-in that always misses and counts lookups."""
+
+    def __init__(self):
+        self.lookups = 0
+
+    def get(self, key):
+        self.lookups += 1
+        return None
+
+    def put(self, key, value):
+        return True
+
+class FakeChain:
+    def __init__(self):
+        self.calls = 0
+
+    def _result(self):
+        self.calls += 1
+        return {"raw": None, "parsed": None, "parsing_error": None}
+
+    def invoke(self, inputs):
+        return self._result()
+
+    async def ainvoke(self, inputs):
+        return self._result()
+
+
+@pytest.fixture
+def filepaths(tmp_path):
+    paths = {}
+    for path_key, _ in extraction.DOCUMENT_SOURCES.values():
+        path = tmp_path / f"{path_key}.pdf"
+        path.write_bytes(path_key.encode())
+        paths[path_key] = str(path)
+    return paths
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = CountingCache()
+    monkeypatch.setattr(extraction, "get_extraction_cache", lambda: cache)
+    monkeypatch.setattr(extraction, "build_extraction_chains", lambda: {
+        name: FakeChain() for name in extraction.DOCUMENT_SOURCES
+    })
+    monkeypatch.setattr(extraction, "combine_extractions", lambda results, applicant_id=None: results)
+    return cache
+
+@pytest.fixture
+def documents(monkeypatch):
+    monkeypatch.setattr(extraction, "read_document", lambda result_name, file_path, digest=None: "document text")
+
+
+@pytest.mark.parametrize("concurrent", [True, False])
+def test_cache_is_read_by_default(monkeypatch, filepaths, cache, documents, concurrent):
+    monkeypatch.setitem(EXTRACTION_CONFIG, "concurrent", concurrent)
+    extraction.extract_documents(filepaths)
+    assert cache.lookups == len(extraction.DOCUMENT_SOURCES)
+
+@pytest.mark.parametrize("concurrent", [True, False])
+def test_use_cache_false_skips_the_cache(monkeypatch, filepaths, cache, documents, concurrent):
+    monkeypatch.setitem(EXTRACTION_CONFIG, "concurrent", concurrent)
+    results = extraction.extract_documents(filepaths, use_cache=False)
+    assert cache.lookups == 0
+    assert set(results) == set(extraction.DOCUMENT_SOURCES)
+
+@pytest.mark.parametrize("concurrent", [True, False])
+def test_disabled_cache_is_skipped(monkeypatch, filepaths, cache, documents, concurrent):
+    monkeypatch.setitem(EXTRACTION_CONFIG, "concurrent", concurrent)
+    monkeypatch.setitem(EXTRACTION_CACHE_CONFIG, "enabled", False)
+    extraction.extract_documents(filepaths)
+    assert cache.lookups == 0
+
+@pytest.mark.parametrize("concurrent", [True, False])
+def test_each_document_is_hashed_once_for_both_caches(monkeypatch, filepaths, cache, concurrent):
+    monkeypatch.setitem(EXTRACTION_CONFIG, "concurrent", concurrent)
+    monkeypatch.setitem(TEXT_CACHE_CONFIG, "enabled", True)
+    hashed = []
+
+    def file_digest(file_path):
+        hashed.append(file_path)
+        return f"digest:{file_path}"
+
+    text_cache = CountingCache()
+    monkeypatch.setattr(extraction, "file_digest", file_digest)
+    monkeypatch.setattr(ocr, "file_digest", file_digest)
+    monkeypatch.setattr(ocr, "get_text_cache", lambda: text_cache)
+    monkeypatch.setattr(ocr, "extract_text_from_pdf", lambda file_path: "document text")
+    monkeypatch.setattr(extraction, "read_asset_liability_sheet", lambda file_path: "sheet text")
+
+    extraction.extract_documents(filepaths)
+    assert sorted(hashed) == sorted(filepaths.values())
+    # Every document but the spreadsheet was looked up in the text cache too
+    assert text_cache.lookups == len(extraction.DOCUMENT_SOURCES) - 1
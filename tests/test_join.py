@@ -0,0 +1,60 @@
+"""
+Tests for the join node that merges the parallel validation and decision branches.
+"""
+import pytest
+from langchain_core.messages import HumanMessage
+
+from agents.join import join_node
+
+
+def state_with(validation=None, decision=None):
+    messages = [("user", "CODE-STARTAPPLICATION"), HumanMessage(content="Extraction Successful.", name="extractor")]
+    # The branches finish in either order
+    if decision is not None:
+        messages.append(HumanMessage(content=decision, name="decision_maker"))
+    if validation is not None:
+        messages.append(HumanMessage(content=validation, name="validator"))
+    return {"messages": messages, "decision": {"decision": "Approved", "reason": "r"}}
+
+
+# (validator message, decision maker message) -> where the sequential graph
+# goes next: validator success hands over to the decision maker, whose
+# message then decides; any other validator message routes on its own
+SEQUENTIAL_ROUTES = [
+    ("Application Validation Completed.", "Decision made.", "recommender", "decision_maker"),
+    ("Application Validation Completed.", "Decision made: only Financial Support Approved.", "supervisor", "decision_maker"),
+    ("Application Validation Completed.", "Decision made: details pending.", "supervisor", "decision_maker"),
+    ("Application Validation Completed.", "Decision Making Component Failed.", "supervisor", "decision_maker"),
+    ("Validation Unsuccessful.", "Decision made.", "recommender", "validator"),
+    ("Validation Unsuccessful.", "Decision made: only Financial Support Approved.", "recommender", "validator"),
+    ("Validation Component Failed.", "Decision made.", "supervisor", "validator"),
+    ("Validation Component Failed.", "Decision Making Component Failed.", "supervisor", "validator"),
+]
+
+@pytest.mark.parametrize("validation, decision, goto, sender", SEQUENTIAL_ROUTES)
+def test_route_matches_sequential_graph(validation, decision, goto, sender):
+    command = join_node(state_with(validation, decision))
+    assert command.goto == goto
+    # The message that decided the route is the latest one for the next node
+    message = command.update["messages"][-1]
+    assert message.name == sender
+    assert message.content == (decision if sender == "decision_maker" else validation)
+
+@pytest.mark.parametrize("validation", ["Validation Unsuccessful.", "Validation Component Failed."])
+def test_validation_failure_clears_decision(validation):
+    command = join_node(state_with(validation, "Decision made."))
+    assert command.update["decision"] == {}
+
+def test_successful_validation_keeps_decision():
+    command = join_node(state_with("Application Validation Completed.", "Decision made."))
+    assert "decision" not in command.update
+
+def test_missing_branch_messages_count_as_failures():
+    command = join_node(state_with())
+    assert command.goto == "supervisor"
+    assert command.update["messages"][-1].content == "Validation Component Failed."
+    assert command.update["decision"] == {}
+
+    command = join_node(state_with("Application Validation Completed."))
+    assert command.goto == "supervisor"
+    assert command.update["messages"][-1].content == "Decision Making Component Failed."
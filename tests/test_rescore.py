@@ -0,0 +1,43 @@
+"""
+Tests for the offline re-scoring job.
+"""
+import json
+import sqlite3
+
+from inference.rescore import SELECT_APPLICATIONS, _features
+
+
+FEATURES = json.dumps({"monthly_income": 1000})
+
+def selected_ids(rows, after_id=0):
+    # The WHERE clause is plain SQL, so SQLite can evaluate it in place of Postgres
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE application (id INTEGER PRIMARY KEY, decision TEXT, "
+        "application_features TEXT, model_version TEXT)"
+    )
+    conn.executemany("INSERT INTO application VALUES (?, ?, ?, ?)", rows)
+    return [row[0] for row in conn.execute(SELECT_APPLICATIONS.replace("%s", "?"), (after_id,))]
+
+
+def test_only_model_decided_rows_are_rescored():
+    ids = selected_ids([
+        (1, "Approved", FEATURES, "v1"),
+        # Validation failed or a component failed: the decision was cleared
+        (2, "", FEATURES, None),
+        (3, "", FEATURES, "v1"),
+        # Saved before features were recorded
+        (4, "Declined", None, "v1"),
+        (5, "Declined", FEATURES, "v2"),
+    ])
+    assert ids == [1, 5]
+
+def test_resumes_after_last_id():
+    ids = selected_ids([(1, "Approved", FEATURES, "v1"), (2, "Approved", FEATURES, "v1")], after_id=1)
+    assert ids == [2]
+
+def test_features_decode_legacy_text():
+    assert _features({"monthly_income": 1000}) == {"monthly_income": 1000}
+    assert _features(FEATURES) == {"monthly_income": 1000}
+    assert _features("{'monthly_income': 1000}") == {"monthly_income": 1000}
+    assert _features("") == {}
@@ -0,0 +1,99 @@
+"""
+Tests for the supervisor's rule-table routing and its LLM fallback.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.messages import HumanMessage
+from langgraph.graph import END
+
+from agents import supervisor
+from agents.supervisor import START_APPLICATION, RoutingStats, asupervisor_node, supervisor_node
+
+
+# Every message the supervisor used to route by hand, with the node it went
+# to; a new application went through the LLM, which was told to start with
+# the extractor
+KNOWN_ROUTES = [
+    (("user", START_APPLICATION), "extractor"),
+    (("user", "What is the status of my application?"), "chatbot"),
+    (HumanMessage(content="Validation Unsuccessful.", name="validator"), END),
+    (HumanMessage(content="Validation Component Failed.", name="validator"), END),
+    (HumanMessage(content="Extraction Unsuccessful.", name="extractor"), END),
+    (HumanMessage(content="Extraction Component Failed.", name="extractor"), END),
+    (HumanMessage(content="Decision made: only Financial Support Approved.", name="decision_maker"), END),
+    (HumanMessage(content="Decision made: details pending.", name="decision_maker"), END),
+    (HumanMessage(content="Decision Making Component Failed.", name="decision_maker"), END),
+    (HumanMessage(content="Process Complete (Extraction - Validation - Decision - Recommendation)", name="recommender"), END),
+    (HumanMessage(content="Process Complete (Extraction - Validation - Recommendation)", name="recommender"), END),
+    (HumanMessage(content="Recommender Component Failed.", name="recommender"), END),
+    (HumanMessage(content="Error generating response for the user.", name="chatbot"), END),
+    (HumanMessage(content="Your application was approved.", name="chatbot"), END),
+]
+
+class FakeRouter:
+    """Structured-output LLM stand-in that records the messages it was asked to route."""
+
+    def __init__(self, next_node="validator"):
+        self.response = SimpleNamespace(next=next_node, reason="Routed by the LLM.")
+        self.calls = []
+
+    def invoke(self, messages):
+        self.calls.append(messages)
+        return self.response
+
+    async def ainvoke(self, messages):
+        return self.invoke(messages)
+
+
+@pytest.fixture
+def router(monkeypatch):
+    fake = FakeRouter()
+    monkeypatch.setattr(supervisor, "_routing_llm", lambda: fake)
+    monkeypatch.setattr(supervisor, "ROUTING_STATS", RoutingStats())
+    return fake
+
+
+@pytest.mark.parametrize("message, goto", KNOWN_ROUTES)
+def test_known_messages_keep_their_route_without_the_llm(router, message, goto):
+    command = supervisor_node({"messages": [message]})
+    assert command.goto == goto
+    assert command.update["messages"][-1].name == "supervisor"
+    assert router.calls == []
+    assert supervisor.get_routing_stats()["rule"]["count"] == 1
+
+@pytest.mark.parametrize("message, goto", KNOWN_ROUTES)
+def test_async_known_messages_keep_their_route(router, message, goto):
+    command = asyncio.run(asupervisor_node({"messages": [message]}))
+    assert command.goto == goto
+    assert router.calls == []
+
+def test_user_query_is_passed_to_the_chatbot(router):
+    command = supervisor_node({"messages": [("user", "How do I appeal?")]})
+    assert command.update["messages"][-1].content == "How do I appeal?"
+
+@pytest.mark.parametrize("message", [
+    HumanMessage(content="Extraction Successful.", name="extractor"),
+    HumanMessage(content="Decision made.", name="decision_maker"),
+    HumanMessage(content="Something else.", name="supervisor"),
+])
+def test_unknown_messages_fall_back_to_the_llm(router, message):
+    command = supervisor_node({"messages": [message]})
+    assert command.goto == "validator"
+    assert command.update["messages"][-1].content == "Routed by the LLM."
+    assert len(router.calls) == 1
+    assert router.calls[0][1:-1] == [message]
+    assert "rule" not in supervisor.get_routing_stats()
+    assert supervisor.get_routing_stats()["llm"]["count"] == 1
+
+def test_async_unknown_message_falls_back_to_the_llm(router):
+    message = HumanMessage(content="Extraction Successful.", name="extractor")
+    command = asyncio.run(asupervisor_node({"messages": [message]}))
+    assert command.goto == "validator"
+    assert len(router.calls) == 1
+
+def test_llm_finish_ends_the_run(router):
+    router.response.next = "FINISH"
+    command = supervisor_node({"messages": [HumanMessage(content="Unknown.", name="extractor")]})
+    assert command.goto == END
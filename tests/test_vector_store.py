@@ -0,0 +1,47 @@
+"""
+Tests for the resident vector index and its memory-mapped store.
+"""
+import os
+
+import pytest
+from llama_index.core import Settings
+from llama_index.core.embeddings import MockEmbedding
+
+from vector_store import operations
+from vector_store.mmap_store import NODES_FNAME
+from vector_store.operations import ResidentIndex, make_document
+
+
+@pytest.fixture(autouse=True)
+def mock_embeddings(monkeypatch):
+    monkeypatch.setattr(
+        operations, "setup_embedding_model", lambda: setattr(Settings, "embed_model", MockEmbedding(embed_dim=8))
+    )
+
+def open_index(path):
+    return ResidentIndex(str(path), flush_batch_size=100, flush_interval=3600)
+
+
+def test_reopened_index_retrieves_text_without_a_docstore(tmp_path):
+    index = open_index(tmp_path)
+    index.insert([make_document("Monthly income: 1000 AED", "applicant-1")])
+    index.insert([make_document("Monthly income: 5000 AED", "applicant-2")])
+    index.flush()
+
+    reopened = open_index(tmp_path)
+    nodes = reopened.retrieve("income", applicant_id="applicant-2")
+    assert [node.get_content() for node in nodes] == ["Monthly income: 5000 AED"]
+    assert nodes[0].metadata == {"applicant_id": "applicant-2"}
+    assert os.path.exists(tmp_path / NODES_FNAME)
+    assert not os.path.exists(tmp_path / "docstore.json")
+    assert not os.path.exists(tmp_path / "index_store.json")
+
+def test_deleted_document_is_not_retrieved(tmp_path):
+    index = open_index(tmp_path)
+    document = make_document("Monthly income: 1000 AED", "applicant-1")
+    index.insert([document])
+    index.insert([make_document("Monthly income: 5000 AED", "applicant-1")])
+    index._get_index().vector_store.delete(document.doc_id)
+
+    nodes = index.retrieve("income", applicant_id="applicant-1")
+    assert [node.get_content() for node in nodes] == ["Monthly income: 5000 AED"]
@@ -0,0 +1,183 @@
+"""
+Embedding model for the Social Support Application Processing System.
+"""
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from llama_index.embeddings.ollama import OllamaEmbedding
+
+from caching.disk_cache import DiskCache
+from config import EMBEDDING_CACHE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """
+    Two-level embedding cache keyed by model name and text hash.
+
+    A bounded in-memory LRU sits in front of a persistent DiskCache that
+    stores embeddings as raw float32 bytes.
+    """
+
+    def __init__(self, memory_entries: int, disk_cache: DiskCache):
+        self.memory_entries = memory_entries
+        self.disk_cache = disk_cache
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def key(model_name: str, text: str) -> str:
+        return f"{model_name}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+
+    def _remember(self, key: str, embedding: List[float]) -> None:
+        with self._lock:
+            self._memory[key] = embedding
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[List[float]]:
+        """
+        Look up an embedding in memory, then on disk.
+        """
+        with self._lock:
+            embedding = self._memory.get(key)
+            if embedding is not None:
+                self._memory.move_to_end(key)
+                self._memory_hits += 1
+                return embedding
+        payload = self.disk_cache.get(key)
+        if payload is None:
+            with self._lock:
+                self._misses += 1
+            return None
+        embedding = np.frombuffer(payload, dtype=np.float32).tolist()
+        self._remember(key, embedding)
+        with self._lock:
+            self._disk_hits += 1
+        return embedding
+
+    def put(self, key: str, embedding: List[float]) -> None:
+        """
+        Store an embedding in memory and on disk.
+        """
+        self._remember(key, embedding)
+        self.disk_cache.put(key, np.asarray(embedding, dtype=np.float32).tobytes())
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit-rate metrics for this process.
+        """
+        with self._lock:
+            lookups = self._memory_hits + self._disk_hits + self._misses
+            return {
+                "memory_hits": self._memory_hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_rate": (self._memory_hits + self._disk_hits) / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "max_memory_entries": self.memory_entries,
+                "disk": self.disk_cache.stats(),
+            }
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+_embedding_cache_lock = threading.Lock()
+
+def get_embedding_cache() -> EmbeddingCache:
+    """
+    Return the process-wide embedding cache, opening it on first use.
+    """
+    global _embedding_cache
+    if _embedding_cache is None:
+        with _embedding_cache_lock:
+            if _embedding_cache is None:
+                _embedding_cache = EmbeddingCache(
+                    memory_entries=EMBEDDING_CACHE_CONFIG["memory_entries"],
+                    disk_cache=DiskCache(EMBEDDING_CACHE_CONFIG["path"], EMBEDDING_CACHE_CONFIG["max_bytes"])
+                )
+    return _embedding_cache
+
+def get_embedding_cache_stats() -> Dict[str, Any]:
+    """
+    Return hit-rate metrics for the embedding cache.
+    """
+    return get_embedding_cache().stats()
+
+
+class BatchedOllamaEmbedding(OllamaEmbedding):
+    """
+    Ollama embedding model that sends each batch of texts in one request.
+
+    The stock OllamaEmbedding calls the single-prompt endpoint once per
+    text; this uses Ollama's /api/embed, which accepts a list of inputs.
+    Texts already in the embedding cache are not sent at all.
+    """
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "BatchedOllamaEmbedding"
+
+    def _split_cached(self, texts: List[str]):
+        """
+        Return cached embeddings (None where missing), cache keys, and the
+        positions that still need embedding.
+        """
+        if not EMBEDDING_CACHE_CONFIG["enabled"]:
+            return [None] * len(texts), [None] * len(texts), list(range(len(texts)))
+        cache = get_embedding_cache()
+        keys = [EmbeddingCache.key(self.model_name, text) for text in texts]
+        embeddings = [cache.get(key) for key in keys]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        return embeddings, keys, missing
+
+    def _fill_missing(self, embeddings, keys, missing, result) -> List[List[float]]:
+        for i, embedding in zip(missing, result["embeddings"]):
+            embeddings[i] = list(embedding)
+            if keys[i] is not None:
+                get_embedding_cache().put(keys[i], embeddings[i])
+        return embeddings
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Get embeddings for a batch of texts in one request."""
+        embeddings, keys, missing = self._split_cached(texts)
+        if not missing:
+            return embeddings
+        result = self._client.embed(
+            model=self.model_name,
+            input=[texts[i] for i in missing],
+            options=self.ollama_additional_kwargs
+        )
+        return self._fill_missing(embeddings, keys, missing, result)
+
+    async def _aget_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Asynchronously get embeddings for a batch of texts in one request."""
+        embeddings, keys, missing = self._split_cached(texts)
+        if not missing:
+            return embeddings
+        result = await self._async_client.embed(
+            model=self.model_name,
+            input=[texts[i] for i in missing],
+            options=self.ollama_additional_kwargs
+        )
+        return self._fill_missing(embeddings, keys, missing, result)
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._get_text_embeddings([text])[0]
+
+    async def _aget_text_embedding(self, text: str) -> List[float]:
+        return (await self._aget_text_embeddings([text]))[0]
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return self._get_text_embeddings([query])[0]
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return (await self._aget_text_embeddings([query]))[0]
@@ -0,0 +1,385 @@
+"""
+Memory-mapped embedding storage for the Social Support Application Processing System.
+"""
+import os
+import json
+import logging
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from llama_index.core.bridge.pydantic import PrivateAttr
+from llama_index.core.schema import BaseNode
+from llama_index.core.storage.docstore import SimpleDocumentStore
+from llama_index.core.vector_stores.simple import SimpleVectorStore
+from llama_index.core.vector_stores.types import (
+    BasePydanticVectorStore,
+    FilterOperator,
+    VectorStoreQuery,
+    VectorStoreQueryResult,
+)
+from llama_index.core.vector_stores.utils import metadata_dict_to_node, node_to_metadata_dict
+
+logger = logging.getLogger(__name__)
+
+VECTORS_FNAME = "vectors.npy"
+IDS_FNAME = "vector_ids.npy"
+REF_IDS_FNAME = "vector_ref_ids.npy"
+PARTITIONS_FNAME = "vector_partitions.npy"
+META_FNAME = "vector_meta.json"
+NODES_FNAME = "vector_nodes.sqlite3"
+LEGACY_FNAME = "default__vector_store.json"
+LEGACY_DOCSTORE_FNAME = "docstore.json"
+
+# Node and document ids are UUIDs; fixed-width rows keep the id files mappable
+ID_DTYPE = "S64"
+INITIAL_CAPACITY = 64
+
+# Node metadata key whose value selects the partition a row belongs to
+PARTITION_KEY = "applicant_id"
+
+
+class MmapVectorStore(BasePydanticVectorStore):
+    """
+    Vector store keeping normalised float32 embeddings as one contiguous
+    memory-mapped matrix, with row offset -> node id sidecar files.
+
+    Opening the store maps the files without reading them, and a query is a
+    single matrix-vector product over the used rows. Each row is tagged with
+    the node's applicant_id; a query filtered on applicant_id only scores that
+    applicant's rows. Node text and metadata are kept in a SQLite table keyed
+    by node id, written per insert and read only for the nodes a query returns,
+    so the index needs no docstore or index store on disk.
+    """
+
+    stores_text: bool = True
+    persist_dir: str
+
+    _lock: threading.RLock = PrivateAttr(default_factory=threading.RLock)
+    _dim: Optional[int] = PrivateAttr(default=None)
+    _count: int = PrivateAttr(default=0)
+    _deleted: int = PrivateAttr(default=0)
+    _vectors: Optional[np.memmap] = PrivateAttr(default=None)
+    _ids: Optional[np.memmap] = PrivateAttr(default=None)
+    _ref_ids: Optional[np.memmap] = PrivateAttr(default=None)
+    _partitions: Optional[np.memmap] = PrivateAttr(default=None)
+    _offsets: Optional[Dict[str, int]] = PrivateAttr(default=None)
+    _partition_rows: Optional[Dict[bytes, List[int]]] = PrivateAttr(default=None)
+    _nodes: Optional[sqlite3.Connection] = PrivateAttr(default=None)
+
+    def __init__(self, persist_dir: str, **kwargs: Any):
+        super().__init__(persist_dir=persist_dir, **kwargs)
+        os.makedirs(persist_dir, exist_ok=True)
+        import_docstore = not os.path.exists(self._path(NODES_FNAME))
+        # Used from the index's threads under the store lock
+        self._nodes = sqlite3.connect(self._path(NODES_FNAME), check_same_thread=False)
+        self._nodes.execute("PRAGMA journal_mode=WAL")
+        self._nodes.execute(
+            "CREATE TABLE IF NOT EXISTS nodes (node_id TEXT PRIMARY KEY, ref_doc_id TEXT NOT NULL, node TEXT NOT NULL)"
+        )
+        self._nodes.execute("CREATE INDEX IF NOT EXISTS nodes_ref_doc_id ON nodes (ref_doc_id)")
+        self._nodes.commit()
+        if import_docstore and os.path.exists(self._path(LEGACY_DOCSTORE_FNAME)):
+            self._import_legacy_docstore(self._path(LEGACY_DOCSTORE_FNAME))
+        meta_path = os.path.join(persist_dir, META_FNAME)
+        if os.path.exists(meta_path):
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+            self._dim = meta["dim"]
+            self._count = meta["count"]
+            self._deleted = meta.get("deleted", 0)
+            self._vectors = np.load(self._path(VECTORS_FNAME), mmap_mode="r+")
+            self._ids = np.load(self._path(IDS_FNAME), mmap_mode="r+")
+            self._ref_ids = np.load(self._path(REF_IDS_FNAME), mmap_mode="r+")
+            if os.path.exists(self._path(PARTITIONS_FNAME)):
+                self._partitions = np.load(self._path(PARTITIONS_FNAME), mmap_mode="r+")
+            else:
+                self._partitions = self._create_partitions_file(self._vectors.shape[0])
+        elif os.path.exists(self._path(LEGACY_FNAME)):
+            self._import_legacy_store(self._path(LEGACY_FNAME))
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "MmapVectorStore"
+
+    @property
+    def client(self) -> None:
+        return None
+
+    def _path(self, fname: str) -> str:
+        return os.path.join(self.persist_dir, fname)
+
+    def _create_partitions_file(self, capacity: int) -> np.memmap:
+        """
+        Create an empty partition file for stores written before partitioning.
+        """
+        partitions = np.lib.format.open_memmap(
+            self._path(PARTITIONS_FNAME), mode="w+", dtype=ID_DTYPE, shape=(capacity,)
+        )
+        partitions.flush()
+        return partitions
+
+    def _import_legacy_store(self, legacy_path: str) -> None:
+        """
+        Copy embeddings from a llama-index JSON vector store into the mapped files.
+        """
+        logger.info(f"Importing embeddings from {legacy_path}")
+        legacy = SimpleVectorStore.from_persist_path(legacy_path)
+        data = legacy.data
+        node_ids = list(data.embedding_dict.keys())
+        if not node_ids:
+            return
+        self._append(
+            node_ids,
+            [data.text_id_to_ref_doc_id.get(node_id) or "" for node_id in node_ids],
+            [data.metadata_dict.get(node_id, {}).get(PARTITION_KEY) or "" for node_id in node_ids],
+            np.asarray([data.embedding_dict[node_id] for node_id in node_ids], dtype=np.float32),
+        )
+        self.persist(self._path(META_FNAME))
+
+    def _import_legacy_docstore(self, docstore_path: str) -> None:
+        """
+        Copy node text and metadata from a llama-index JSON docstore into the node table.
+        """
+        logger.info(f"Importing nodes from {docstore_path}")
+        docstore = SimpleDocumentStore.from_persist_path(docstore_path)
+        self._write_nodes(list(docstore.docs.values()))
+
+    def _write_nodes(self, nodes: Sequence[BaseNode]) -> None:
+        with self._nodes:
+            self._nodes.executemany(
+                "INSERT OR REPLACE INTO nodes (node_id, ref_doc_id, node) VALUES (?, ?, ?)",
+                [
+                    (
+                        node.node_id,
+                        node.ref_doc_id or "",
+                        json.dumps(node_to_metadata_dict(node, remove_text=False, flat_metadata=False))
+                    )
+                    for node in nodes
+                ]
+            )
+
+    def _read_nodes(self, node_ids: List[str]) -> Dict[str, BaseNode]:
+        rows = self._nodes.execute(
+            f"SELECT node_id, node FROM nodes WHERE node_id IN ({', '.join('?' * len(node_ids))})",
+            node_ids
+        ).fetchall()
+        return {node_id: metadata_dict_to_node(json.loads(node)) for node_id, node in rows}
+
+    def _ensure_capacity(self, dim: int, needed: int) -> None:
+        """
+        Create the mapped files, or grow them by doubling, to hold `needed` rows.
+        """
+        if self._vectors is None:
+            self._dim = dim
+            capacity = max(INITIAL_CAPACITY, needed)
+        elif needed <= self._vectors.shape[0]:
+            return
+        else:
+            capacity = max(needed, 2 * self._vectors.shape[0])
+
+        vectors = np.lib.format.open_memmap(
+            self._path(VECTORS_FNAME + ".tmp"), mode="w+", dtype=np.float32, shape=(capacity, dim)
+        )
+        ids = np.lib.format.open_memmap(
+            self._path(IDS_FNAME + ".tmp"), mode="w+", dtype=ID_DTYPE, shape=(capacity,)
+        )
+        ref_ids = np.lib.format.open_memmap(
+            self._path(REF_IDS_FNAME + ".tmp"), mode="w+", dtype=ID_DTYPE, shape=(capacity,)
+        )
+        partitions = np.lib.format.open_memmap(
+            self._path(PARTITIONS_FNAME + ".tmp"), mode="w+", dtype=ID_DTYPE, shape=(capacity,)
+        )
+        if self._vectors is not None:
+            vectors[:self._count] = self._vectors[:self._count]
+            ids[:self._count] = self._ids[:self._count]
+            ref_ids[:self._count] = self._ref_ids[:self._count]
+            partitions[:self._count] = self._partitions[:self._count]
+        for array, fname in (
+            (vectors, VECTORS_FNAME),
+            (ids, IDS_FNAME),
+            (ref_ids, REF_IDS_FNAME),
+            (partitions, PARTITIONS_FNAME),
+        ):
+            array.flush()
+            os.replace(self._path(fname + ".tmp"), self._path(fname))
+        self._vectors, self._ids, self._ref_ids, self._partitions = vectors, ids, ref_ids, partitions
+
+    def _append(
+        self,
+        node_ids: List[str],
+        ref_doc_ids: List[str],
+        partitions: List[str],
+        embeddings: np.ndarray
+    ) -> None:
+        """
+        Normalise and write rows after the last used row.
+        """
+        if self._dim is not None and embeddings.shape[1] != self._dim:
+            raise ValueError(f"Embedding dimension {embeddings.shape[1]} does not match store dimension {self._dim}")
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        start = self._count
+        end = start + len(node_ids)
+        self._ensure_capacity(embeddings.shape[1], end)
+        self._vectors[start:end] = embeddings / norms
+        self._ids[start:end] = np.asarray(node_ids, dtype=ID_DTYPE)
+        self._ref_ids[start:end] = np.asarray(ref_doc_ids, dtype=ID_DTYPE)
+        self._partitions[start:end] = np.asarray(partitions, dtype=ID_DTYPE)
+        if self._offsets is not None:
+            self._offsets.update({node_id: start + i for i, node_id in enumerate(node_ids)})
+        if self._partition_rows is not None:
+            for i, partition in enumerate(partitions):
+                self._partition_rows.setdefault(partition.encode(), []).append(start + i)
+        self._count = end
+
+    def _get_offsets(self) -> Dict[str, int]:
+        """
+        Build the node id -> row offset map on first use.
+        """
+        if self._offsets is None:
+            self._offsets = {
+                node_id.decode(): offset
+                for offset, node_id in enumerate(self._ids[:self._count])
+                if node_id
+            }
+        return self._offsets
+
+    def _get_partition_rows(self, partition: str) -> np.ndarray:
+        """
+        Return the row offsets of one partition, building the partition map
+        with a single sort on first use.
+        """
+        if self._partition_rows is None:
+            keys = self._partitions[:self._count]
+            order = np.argsort(keys, kind="stable")
+            sorted_keys = keys[order]
+            bounds = np.flatnonzero(sorted_keys[1:] != sorted_keys[:-1]) + 1
+            self._partition_rows = {
+                bytes(sorted_keys[start]): order[start:end].tolist()
+                for start, end in zip(
+                    np.concatenate(([0], bounds)), np.concatenate((bounds, [len(keys)]))
+                )
+                if end > start
+            }
+        return np.asarray(self._partition_rows.get(partition.encode(), []), dtype=np.int64)
+
+    def _rows_for_filters(self, query: VectorStoreQuery) -> Optional[np.ndarray]:
+        """
+        Translate an applicant_id equality filter into the rows to score.
+        """
+        if query.filters is None:
+            return None
+        filters = query.filters.filters
+        if (
+            len(filters) != 1
+            or getattr(filters[0], "key", None) != PARTITION_KEY
+            or filters[0].operator != FilterOperator.EQ
+        ):
+            raise ValueError(f"MmapVectorStore only supports filtering on {PARTITION_KEY}")
+        return self._get_partition_rows(str(filters[0].value))
+
+    def add(self, nodes: Sequence[BaseNode], **kwargs: Any) -> List[str]:
+        """
+        Add nodes and their embeddings to the store.
+        """
+        if not nodes:
+            return []
+        with self._lock:
+            self._write_nodes(nodes)
+            self._append(
+                [node.node_id for node in nodes],
+                [node.ref_doc_id or "" for node in nodes],
+                [str(node.metadata.get(PARTITION_KEY) or "") for node in nodes],
+                np.asarray([node.get_embedding() for node in nodes], dtype=np.float32),
+            )
+        return [node.node_id for node in nodes]
+
+    def delete(self, ref_doc_id: str, **delete_kwargs: Any) -> None:
+        """
+        Delete the rows of all nodes belonging to a document.
+        """
+        with self._lock:
+            with self._nodes:
+                self._nodes.execute("DELETE FROM nodes WHERE ref_doc_id = ?", (ref_doc_id,))
+            if self._ref_ids is None:
+                return
+            rows = np.flatnonzero(self._ref_ids[:self._count] == ref_doc_id.encode())
+            if self._offsets is not None:
+                for node_id in self._ids[rows]:
+                    self._offsets.pop(node_id.decode(), None)
+            if self._partition_rows is not None:
+                for row, partition in zip(rows.tolist(), self._partitions[rows]):
+                    self._partition_rows[bytes(partition)].remove(row)
+            self._ids[rows] = b""
+            self._ref_ids[rows] = b""
+            self._partitions[rows] = b""
+            self._vectors[rows] = 0.0
+            self._deleted += len(rows)
+
+    def query(self, query: VectorStoreQuery, **kwargs: Any) -> VectorStoreQueryResult:
+        """
+        Return the nodes with the highest cosine similarity to the query embedding.
+
+        Only rows matching the query's node_ids and applicant_id filter are scored.
+        """
+        with self._lock:
+            if self._vectors is None or self._count == 0 or query.query_embedding is None:
+                return VectorStoreQueryResult(nodes=[], similarities=[], ids=[])
+
+            rows = self._rows_for_filters(query)
+            # An index over a store that keeps text passes an empty list for "all nodes"
+            if query.node_ids:
+                offsets = self._get_offsets()
+                node_rows = np.asarray(
+                    sorted(offsets[node_id] for node_id in query.node_ids if node_id in offsets),
+                    dtype=np.int64,
+                )
+                rows = node_rows if rows is None else np.intersect1d(rows, node_rows)
+            if rows is not None and rows.size == 0:
+                return VectorStoreQueryResult(nodes=[], similarities=[], ids=[])
+
+            query_vector = np.asarray(query.query_embedding, dtype=np.float32)
+            norm = np.linalg.norm(query_vector)
+            if norm > 0:
+                query_vector = query_vector / norm
+
+            matrix = self._vectors[:self._count] if rows is None else self._vectors[rows]
+            scores = matrix @ query_vector
+            if self._deleted and rows is None:
+                scores[self._ids[:self._count] == b""] = -np.inf
+
+            top_k = min(query.similarity_top_k, scores.shape[0])
+            top = np.argpartition(-scores, top_k - 1)[:top_k]
+            top = top[np.argsort(-scores[top])]
+            top = top[np.isfinite(scores[top])]
+            offsets = top if rows is None else rows[top]
+            ids = [node_id.decode() for node_id in self._ids[offsets]]
+            similarities = scores[top].astype(float).tolist()
+            nodes_by_id = self._read_nodes(ids) if ids else {}
+            # A row whose node was never written (an interrupted insert) is skipped
+            found = [i for i, node_id in enumerate(ids) if node_id in nodes_by_id]
+            return VectorStoreQueryResult(
+                nodes=[nodes_by_id[ids[i]] for i in found],
+                similarities=[similarities[i] for i in found],
+                ids=[ids[i] for i in found],
+            )
+
+    def persist(self, persist_path: str, fs: Optional[Any] = None) -> None:
+        """
+        Flush the mapped files and write the row count sidecar; node rows
+        are committed as they are added.
+
+        llama-index passes a per-namespace JSON path; the store always writes
+        to its own directory instead.
+        """
+        with self._lock:
+            if self._vectors is None:
+                return
+            for array in (self._vectors, self._ids, self._ref_ids, self._partitions):
+                array.flush()
+            meta_path = self._path(META_FNAME)
+            with open(meta_path + ".tmp", "w") as f:
+                json.dump({"dim": self._dim, "count": self._count, "deleted": self._deleted}, f)
+            os.replace(meta_path + ".tmp", meta_path)
@@ -2,13 +2,18 @@
 Vector store operations for the Social Support Application Processing System.
 """
 import os
+import atexit
 import logging
-from typing import List
-from llama_index.core import VectorStoreIndex, SimpleDirectoryReader, StorageContext, load_index_from_storage, Settings
-from llama_index.embeddings.ollama import OllamaEmbedding
-from llama_index.core.schema import Document
+import threading
+from typing import List, Optional
+from llama_index.core import VectorStoreIndex, Settings
+from llama_index.core.ingestion import run_transformations
+from llama_index.core.schema import Document, QueryBundle
+from llama_index.core.vector_stores.types import MetadataFilter, MetadataFilters
 
-from config import VECTOR_STORE_DIR, EMBEDDING_MODEL, EMBEDDING_BASE_URL
+from vector_store.embeddings import BatchedOllamaEmbedding
+from vector_store.mmap_store import META_FNAME, MmapVectorStore, PARTITION_KEY
+from config import VECTOR_STORE_DIR, VECTOR_STORE_CONFIG, EMBEDDING_MODEL, EMBEDDING_BASE_URL
 
 logger = logging.getLogger(__name__)
 
@@ -16,51 +21,186 @@ def setup_embedding_model():
     """
     Set up the embedding model for vector operations.
     """
-    ollama_embedding = OllamaEmbedding(
+    ollama_embedding = BatchedOllamaEmbedding(
         model_name=EMBEDDING_MODEL,
         base_url=EMBEDDING_BASE_URL,
         ollama_additional_kwargs={"mirostat": 0},
     )
     Settings.embed_model = ollama_embedding
 
-def add_to_vector_store(text: str) -> bool:
+
+class ResidentIndex:
+    """
+    Process-wide vector index kept in memory between calls.
+
+    Inserts are applied to the in-memory index and written to disk by a
+    background thread once enough inserts are pending or the flush interval
+    elapses, and on flush(). All state lives in the MmapVectorStore, so
+    opening the index and flushing it do not read or rewrite the corpus.
+    """
+
+    def __init__(self, persist_dir: str, flush_batch_size: int, flush_interval: float):
+        self.persist_dir = persist_dir
+        self.flush_batch_size = flush_batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+        self._index: Optional[VectorStoreIndex] = None
+        self._vector_store: Optional[MmapVectorStore] = None
+        self._pending = 0
+        self._flusher: Optional[threading.Thread] = None
+
+    def _get_index(self) -> VectorStoreIndex:
+        """
+        Open the index over the vector store on first use.
+        """
+        with self._lock:
+            if self._index is None:
+                setup_embedding_model()
+                logger.info("Opening vector store...")
+                self._vector_store = MmapVectorStore(persist_dir=self.persist_dir)
+                self._index = VectorStoreIndex.from_vector_store(self._vector_store)
+                self._flusher = threading.Thread(
+                    target=self._flush_loop, name="vector-store-flush", daemon=True
+                )
+                self._flusher.start()
+            return self._index
+
+    def insert(self, documents: List[Document]) -> None:
+        """
+        Insert documents into the in-memory index and schedule a flush.
+
+        All chunks are embedded in one batched call before the index lock is
+        taken, then inserted together.
+        """
+        index = self._get_index()
+        nodes = run_transformations(documents, Settings.transformations)
+        embeddings = Settings.embed_model.get_text_embedding_batch(
+            [node.get_content(metadata_mode="embed") for node in nodes]
+        )
+        for node, embedding in zip(nodes, embeddings):
+            node.embedding = embedding
+        with self._lock:
+            index.insert_nodes(nodes)
+            self._pending += len(documents)
+            if self._pending >= self.flush_batch_size:
+                self._wake.set()
+
+    def retrieve(self, query: str, applicant_id: Optional[str] = None):
+        """
+        Retrieve the nodes closest to the query, only from the applicant's
+        partition when an applicant_id is given.
+        """
+        index = self._get_index()
+        # Embed outside the lock so a slow embedding call does not block inserts
+        query_bundle = QueryBundle(
+            query_str=query,
+            embedding=Settings.embed_model.get_query_embedding(query)
+        )
+        filters = None
+        if applicant_id is not None:
+            filters = MetadataFilters(filters=[MetadataFilter(key=PARTITION_KEY, value=applicant_id)])
+        with self._lock:
+            return index.as_retriever(filters=filters).retrieve(query_bundle)
+
+    def flush(self) -> None:
+        """
+        Persist pending inserts to disk.
+        """
+        with self._lock:
+            if self._index is None or self._pending == 0:
+                return
+            self._vector_store.persist(os.path.join(self.persist_dir, META_FNAME))
+            logger.info(f"Persisted {self._pending} pending vector store insert(s)")
+            self._pending = 0
+
+    def _flush_loop(self) -> None:
+        while True:
+            self._wake.wait(timeout=self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error persisting vector store: {str(e)}")
+
+
+_resident_index = ResidentIndex(
+    persist_dir=str(VECTOR_STORE_DIR),
+    flush_batch_size=VECTOR_STORE_CONFIG["flush_batch_size"],
+    flush_interval=VECTOR_STORE_CONFIG["flush_interval_seconds"]
+)
+
+def flush_vector_store() -> bool:
+    """
+    Write any pending vector store inserts to disk, e.g. on shutdown.
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    try:
+        _resident_index.flush()
+        return True
+    except Exception as e:
+        logger.error(f"Error flushing vector store: {str(e)}")
+        return False
+
+atexit.register(flush_vector_store)
+
+def make_document(text: str, applicant_id: Optional[str] = None) -> Document:
+    """
+    Wrap text in a Document tagged with its applicant's partition.
+    
+    The applicant_id is kept out of the embedded and LLM-visible text.
+    """
+    metadata = {PARTITION_KEY: applicant_id} if applicant_id else {}
+    return Document(
+        text=text,
+        metadata=metadata,
+        excluded_embed_metadata_keys=list(metadata),
+        excluded_llm_metadata_keys=list(metadata)
+    )
+
+def add_to_vector_store(text: str, applicant_id: Optional[str] = None) -> bool:
     """
     Add text to the vector store.
     
     Args:
         text: Text to add to the vector store
+        applicant_id: Applicant whose partition the text belongs to
+    
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    return add_many_to_vector_store([text], applicant_id=applicant_id)
+
+def add_many_to_vector_store(texts: List[str], applicant_id: Optional[str] = None) -> bool:
+    """
+    Add several texts to the vector store in one operation.
+    
+    The texts are embedded in a single batched request and inserted together,
+    so they are persisted in the same flush.
+    
+    Args:
+        texts: Texts to add to the vector store
+        applicant_id: Applicant whose partition the texts belong to
     
     Returns:
         bool: True if successful, False otherwise
     """
     try:
-        # Set up embedding model
-        setup_embedding_model()
-        
-        # Add document to vector store
-        if os.path.exists(VECTOR_STORE_DIR):
-            logger.info("Loading existing index...")
-            storage_context = StorageContext.from_defaults(persist_dir=VECTOR_STORE_DIR)
-            index = load_index_from_storage(storage_context)
-            index.insert(Document(text=text))
-            index.storage_context.persist(persist_dir=VECTOR_STORE_DIR)
-        else:
-            logger.info("Creating new index...")
-            documents = [Document(text=text)]
-            index = VectorStoreIndex.from_documents(documents)
-            index.storage_context.persist(VECTOR_STORE_DIR)
-            
+        _resident_index.insert([make_document(text, applicant_id) for text in texts])
         return True
     except Exception as e:
         logger.error(f"Error adding to vector store: {str(e)}")
         return False
 
-def query_vector_db(query: str) -> List[str]:
+def query_vector_db(query: str, applicant_id: Optional[str] = None) -> List[str]:
     """
     Query the vector database for relevant text.
     
     Args:
         query: Query string
+        applicant_id: Only search this applicant's documents; None searches all
     
     Returns:
         List[str]: List of retrieved text chunks
@@ -69,22 +209,8 @@ def query_vector_db(query: str) -> List[str]:
         Exception: If query fails
     """
     try:
-        # Set up embedding model
-        setup_embedding_model()
-        
-        # Load persistent index
-        if not os.path.exists(VECTOR_STORE_DIR):
-            logger.warning("Vector store directory does not exist.")
-            return []
-            
-        storage_context = StorageContext.from_defaults(persist_dir=VECTOR_STORE_DIR)
-        index = load_index_from_storage(storage_context)
-        
-        # Get retriever
-        retriever = index.as_retriever()
-        
         # Retrieve top matching nodes
-        retrieved_nodes = retriever.retrieve(query)
+        retrieved_nodes = _resident_index.retrieve(query, applicant_id=applicant_id)
         
         # Extract content from nodes
         list_texts = []
@@ -97,4 +223,4 @@ def query_vector_db(query: str) -> List[str]:
         return list_texts
     except Exception as e:
         logger.error(f"Error querying vector database: {str(e)}")
-        raise
\ No newline at end of file
+        raise
@@ -0,0 +1,451 @@
+"""
+Persistent LangGraph checkpointer for the Social Support Application Processing System.
+"""
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Sequence, Tuple, Union
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    SerializerProtocol,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.serde.types import TASKS
+
+from config import CHECKPOINT_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteCheckpointer(BaseCheckpointSaver[int]):
+    """
+    Durable, bounded checkpoint saver stored in a local SQLite file.
+
+    Each checkpoint is stored whole (channel values included), serialized
+    with the graph's serializer and zlib-compressed. A background thread
+    compacts the file: per thread and namespace only the newest `keep_last`
+    checkpoints are kept, checkpoints older than `ttl_seconds` are removed,
+    and freed pages are returned to the filesystem.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        keep_last: int,
+        ttl_seconds: Optional[float],
+        compaction_interval: float,
+        *,
+        serde: Optional[SerializerProtocol] = None
+    ):
+        super().__init__(serde=serde)
+        self.path = str(path)
+        self.keep_last = keep_last
+        self.ttl_seconds = ttl_seconds
+        self.compaction_interval = compaction_interval
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._compactions = 0
+        self._compacted_checkpoints = 0
+        self._last_compaction_at: Optional[float] = None
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS checkpoints (
+                    thread_id TEXT NOT NULL,
+                    checkpoint_ns TEXT NOT NULL,
+                    checkpoint_id TEXT NOT NULL,
+                    parent_checkpoint_id TEXT,
+                    type TEXT NOT NULL,
+                    checkpoint BLOB NOT NULL,
+                    metadata_type TEXT NOT NULL,
+                    metadata BLOB NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS writes (
+                    thread_id TEXT NOT NULL,
+                    checkpoint_ns TEXT NOT NULL,
+                    checkpoint_id TEXT NOT NULL,
+                    task_id TEXT NOT NULL,
+                    idx INTEGER NOT NULL,
+                    channel TEXT NOT NULL,
+                    type TEXT NOT NULL,
+                    value BLOB NOT NULL,
+                    task_path TEXT NOT NULL DEFAULT '',
+                    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS checkpoints_created_at ON checkpoints (created_at)")
+        self._compactor = threading.Thread(
+            target=self._compaction_loop, name="checkpoint-compaction", daemon=True
+        )
+        self._compactor.start()
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Return this thread's connection, reopening it after a fork.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            # Only takes effect on a new file, so it must precede journal_mode
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _dumps(self, value: Any) -> Tuple[str, bytes]:
+        type_, data = self.serde.dumps_typed(value)
+        return type_, zlib.compress(data)
+
+    def _loads(self, type_: str, data: bytes) -> Any:
+        return self.serde.loads_typed((type_, zlib.decompress(data)))
+
+    def _writes_for(self, conn, thread_id: str, checkpoint_ns: str, checkpoint_id: str, channel: Optional[str] = None):
+        query = "SELECT task_id, channel, type, value, task_path, idx FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?"
+        params = [thread_id, checkpoint_ns, checkpoint_id]
+        if channel is not None:
+            query += " AND channel = ?"
+            params.append(channel)
+        return conn.execute(query + " ORDER BY task_path, task_id, idx", params).fetchall()
+
+    def _tuple_from_row(self, conn, thread_id: str, checkpoint_ns: str, row) -> CheckpointTuple:
+        checkpoint_id, parent_checkpoint_id, type_, checkpoint_blob, metadata_type, metadata_blob = row
+        checkpoint = self._loads(type_, checkpoint_blob)
+        sends = []
+        if parent_checkpoint_id:
+            sends = [
+                self._loads(w_type, w_value)
+                for _, _, w_type, w_value, _, _ in self._writes_for(
+                    conn, thread_id, checkpoint_ns, parent_checkpoint_id, TASKS
+                )
+            ]
+        writes = self._writes_for(conn, thread_id, checkpoint_ns, checkpoint_id)
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint={**checkpoint, "pending_sends": sends},
+            metadata=self._loads(metadata_type, metadata_blob),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_checkpoint_id,
+                    }
+                }
+                if parent_checkpoint_id
+                else None
+            ),
+            pending_writes=[
+                (task_id, channel, self._loads(w_type, w_value))
+                for task_id, channel, w_type, w_value, _, _ in writes
+            ],
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """
+        Return the requested checkpoint, or the thread's latest one.
+        """
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        conn = self._connection()
+        columns = "checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata"
+        if checkpoint_id := get_checkpoint_id(config):
+            row = conn.execute(
+                f"SELECT {columns} FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                (thread_id, checkpoint_ns, checkpoint_id)
+            ).fetchone()
+        else:
+            # Checkpoint ids sort by creation time
+            row = conn.execute(
+                f"SELECT {columns} FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+                "ORDER BY checkpoint_id DESC LIMIT 1",
+                (thread_id, checkpoint_ns)
+            ).fetchone()
+        if row is None:
+            return None
+        return self._tuple_from_row(conn, thread_id, checkpoint_ns, row)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        """
+        List checkpoints newest first, optionally filtered by metadata.
+        """
+        conditions, params = [], []
+        if config:
+            conditions.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if (checkpoint_ns := config["configurable"].get("checkpoint_ns")) is not None:
+                conditions.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                conditions.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            conditions.append("checkpoint_id < ?")
+            params.append(before_id)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        conn = self._connection()
+        rows = conn.execute(
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata "
+            f"FROM checkpoints {where} ORDER BY thread_id, checkpoint_ns, checkpoint_id DESC",
+            params
+        ).fetchall()
+        for thread_id, checkpoint_ns, *row in rows:
+            if limit is not None and limit <= 0:
+                break
+            if filter:
+                metadata = self._loads(row[4], row[5])
+                if not all(metadata.get(key) == value for key, value in filter.items()):
+                    continue
+            if limit is not None:
+                limit -= 1
+            yield self._tuple_from_row(conn, thread_id, checkpoint_ns, row)
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """
+        Store a checkpoint with its channel values.
+        """
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        checkpoint = {key: value for key, value in checkpoint.items() if key != "pending_sends"}
+        type_, checkpoint_blob = self._dumps(checkpoint)
+        metadata_type, metadata_blob = self._dumps(get_checkpoint_metadata(config, metadata))
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO checkpoints "
+                "(thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, "
+                "metadata_type, metadata, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    thread_id, checkpoint_ns, checkpoint["id"],
+                    config["configurable"].get("checkpoint_id"), type_, sqlite3.Binary(checkpoint_blob),
+                    metadata_type, sqlite3.Binary(metadata_blob), time.time()
+                )
+            )
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """
+        Store the intermediate writes of a task.
+        """
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            type_, blob = self._dumps(value)
+            rows.append((
+                thread_id, checkpoint_ns, checkpoint_id, task_id,
+                WRITES_IDX_MAP.get(channel, idx), channel, type_, sqlite3.Binary(blob), task_path
+            ))
+        # Special writes (negative idx) replace earlier ones; regular writes are kept once
+        with self._connection() as conn:
+            for conflict, group in (
+                ("REPLACE", [row for row in rows if row[4] < 0]),
+                ("IGNORE", [row for row in rows if row[4] >= 0]),
+            ):
+                conn.executemany(
+                    f"INSERT OR {conflict} INTO writes "
+                    "(thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, value, task_path) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    group
+                )
+
+    def delete_thread(self, thread_id: str) -> None:
+        """
+        Delete all checkpoints and writes of a thread.
+        """
+        with self._connection() as conn:
+            conn.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+            conn.execute("DELETE FROM writes WHERE thread_id = ?", (thread_id,))
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def compact(self) -> int:
+        """
+        Apply the retention policy and release freed space.
+
+        Returns:
+            int: Number of checkpoints removed
+        """
+        with self._connection() as conn:
+            removed = 0
+            if self.ttl_seconds is not None:
+                removed += conn.execute(
+                    "DELETE FROM checkpoints WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+                ).rowcount
+            removed += conn.execute(
+                """
+                DELETE FROM checkpoints WHERE rowid IN (
+                    SELECT rowid FROM (
+                        SELECT rowid, ROW_NUMBER() OVER (
+                            PARTITION BY thread_id, checkpoint_ns ORDER BY checkpoint_id DESC
+                        ) AS position
+                        FROM checkpoints
+                    ) WHERE position > ?
+                )
+                """,
+                (self.keep_last,)
+            ).rowcount
+            conn.execute(
+                """
+                DELETE FROM writes WHERE NOT EXISTS (
+                    SELECT 1 FROM checkpoints c
+                    WHERE c.thread_id = writes.thread_id
+                      AND c.checkpoint_ns = writes.checkpoint_ns
+                      AND c.checkpoint_id = writes.checkpoint_id
+                )
+                """
+            )
+        if removed:
+            self._connection().execute("PRAGMA incremental_vacuum")
+        with self._stats_lock:
+            self._compactions += 1
+            self._compacted_checkpoints += removed
+            self._last_compaction_at = time.time()
+        return removed
+
+    def _compaction_loop(self) -> None:
+        while True:
+            time.sleep(self.compaction_interval)
+            try:
+                removed = self.compact()
+                if removed:
+                    logger.info(f"Compacted {removed} checkpoint(s) from {self.path}")
+            except Exception as e:
+                logger.error(f"Error compacting checkpoints: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return checkpoint counts, file size and compaction metrics.
+        """
+        conn = self._connection()
+        checkpoints, threads = conn.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT thread_id) FROM checkpoints"
+        ).fetchone()
+        writes = conn.execute("SELECT COUNT(*) FROM writes").fetchone()[0]
+        with self._stats_lock:
+            return {
+                "checkpoints": checkpoints,
+                "threads": threads,
+                "writes": writes,
+                "size_bytes": os.path.getsize(self.path),
+                "keep_last": self.keep_last,
+                "ttl_seconds": self.ttl_seconds,
+                "compactions": self._compactions,
+                "compacted_checkpoints": self._compacted_checkpoints,
+                "last_compaction_at": self._last_compaction_at,
+            }
+
+
+_checkpointer: Optional[SQLiteCheckpointer] = None
+_checkpointer_lock = threading.Lock()
+
+def get_checkpointer() -> SQLiteCheckpointer:
+    """
+    Return the process-wide checkpointer, opening it on first use.
+    """
+    global _checkpointer
+    if _checkpointer is None:
+        with _checkpointer_lock:
+            if _checkpointer is None:
+                _checkpointer = SQLiteCheckpointer(
+                    CHECKPOINT_CONFIG["path"],
+                    keep_last=CHECKPOINT_CONFIG["keep_last"],
+                    ttl_seconds=CHECKPOINT_CONFIG["ttl_seconds"],
+                    compaction_interval=CHECKPOINT_CONFIG["compaction_interval_seconds"]
+                )
+    return _checkpointer
+
+def get_checkpointer_stats() -> Dict[str, Any]:
+    """
+    Return size and retention metrics for the checkpointer.
+    """
+    return get_checkpointer().stats()
@@ -2,22 +2,78 @@
 Workflow graph construction for the Social Support Application Processing System.
 """
 import logging
+from typing import Callable, Literal, Tuple, get_args, get_type_hints
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, START, END
-from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.types import Command
 from models.agent_state import AgentState
-from agents.supervisor import supervisor_node
-from agents.extractor import extractor_node
-from agents.validator import validator_node
-from agents.decision_maker import decision_maker_node
-from agents.recommender import recommender_node
-from agents.chatbot import chatbot_node
+from agents.supervisor import asupervisor_node, supervisor_node
+from agents.extractor import aextractor_node, extractor_node
+from agents.validator import avalidator_node, validator_node
+from agents.decision_maker import adecision_maker_node, decision_maker_node
+from agents.recommender import arecommender_node, recommender_node
+from agents.chatbot import achatbot_node, chatbot_node
+from agents.join import join_node
+from workflow.checkpointer import get_checkpointer
+from config import WORKFLOW_CONFIG
 
 logger = logging.getLogger(__name__)
 
-def create_workflow_graph():
+def _fan_out(command: Command) -> Command:
+    if command.goto == "validator":
+        logger.info("--- Workflow Transition: Extractor to Validator and Decision Maker ---")
+        return Command(update=command.update, goto=["validator", "decision_maker"])
+    return command
+
+def fan_out_extractor(state: AgentState) -> Command[Literal["validator", "decision_maker", "supervisor"]]:
+    """
+    Run the extractor, then start validation and the decision together.
+    """
+    return _fan_out(extractor_node(state))
+
+async def afan_out_extractor(state: AgentState) -> Command[Literal["validator", "decision_maker", "supervisor"]]:
+    return _fan_out(await aextractor_node(state))
+
+def validator_branch(state: AgentState) -> Command[Literal["join"]]:
+    """
+    Run the validator as a parallel branch; routing is left to the join node.
+    """
+    return Command(update=validator_node(state).update, goto="join")
+
+async def avalidator_branch(state: AgentState) -> Command[Literal["join"]]:
+    return Command(update=(await avalidator_node(state)).update, goto="join")
+
+def decision_maker_branch(state: AgentState) -> Command[Literal["join"]]:
+    """
+    Run the decision maker as a parallel branch; routing is left to the join node.
+    """
+    return Command(update=decision_maker_node(state).update, goto="join")
+
+async def adecision_maker_branch(state: AgentState) -> Command[Literal["join"]]:
+    return Command(update=(await adecision_maker_node(state)).update, goto="join")
+
+def _destinations(func: Callable) -> Tuple[str, ...]:
+    # Nodes the function's Command[Literal[...]] return annotation can route to
+    return get_args(get_args(get_type_hints(func)["return"])[0])
+
+def add_agent_node(graph: StateGraph, name: str, func: Callable, afunc: Callable) -> None:
+    """
+    Add a node that runs func under invoke and afunc under ainvoke, so one
+    compiled graph serves both sync and async callers.
+    """
+    graph.add_node(name, RunnableLambda(func, afunc=afunc, name=name), destinations=_destinations(func))
+
+def create_workflow_graph(parallel_decision: bool = WORKFLOW_CONFIG["parallel_decision"]):
     """
     Create the workflow graph for the Social Support Application Processing System.
     
+    The graph runs with app.invoke or app.ainvoke; under ainvoke every agent
+    uses its async variant, so LLM calls do not hold a thread while waiting.
+    
+    Args:
+        parallel_decision: Run validation and the decision concurrently and
+            merge them in the join node, instead of one after the other
+    
     Returns:
         StateGraph: Compiled workflow graph
     """
@@ -25,19 +81,25 @@ def create_workflow_graph():
     graph = StateGraph(AgentState)
     
     # Add nodes to graph
-    graph.add_node("supervisor", supervisor_node)
-    graph.add_node("extractor", extractor_node)
-    graph.add_node("validator", validator_node)
-    graph.add_node("decision_maker", decision_maker_node)
-    graph.add_node("recommender", recommender_node)
-    graph.add_node("chatbot", chatbot_node)
+    add_agent_node(graph, "supervisor", supervisor_node, asupervisor_node)
+    add_agent_node(graph, "recommender", recommender_node, arecommender_node)
+    add_agent_node(graph, "chatbot", chatbot_node, achatbot_node)
+    if parallel_decision:
+        # Both branches finish in the same step, so the join runs once
+        add_agent_node(graph, "extractor", fan_out_extractor, afan_out_extractor)
+        add_agent_node(graph, "validator", validator_branch, avalidator_branch)
+        add_agent_node(graph, "decision_maker", decision_maker_branch, adecision_maker_branch)
+        graph.add_node("join", join_node)
+    else:
+        add_agent_node(graph, "extractor", extractor_node, aextractor_node)
+        add_agent_node(graph, "validator", validator_node, avalidator_node)
+        add_agent_node(graph, "decision_maker", decision_maker_node, adecision_maker_node)
     
     # Add edges to graph
     graph.add_edge(START, "supervisor")
     
-    memory = InMemorySaver()
-    # Compile graph
-    app = graph.compile(checkpointer=memory)
+    # Compile graph with the shared, persistent checkpointer
+    app = graph.compile(checkpointer=get_checkpointer())
     
     return app
 
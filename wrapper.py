@@ -2,20 +2,33 @@
 Main entry point for the Social Support Application Processing System.
 """
 import os
+import asyncio
 import logging
+import threading
+import time
 import uuid
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Dict, Any, Optional
-from database.db_operations import initialize_database, save_applicant, save_application
+from typing import AsyncIterator, Dict, Any, Optional, Tuple
+from database.db_operations import initialize_database, save_applicant_and_application, update_application
 from workflow.graph import create_workflow_graph, print_workflow_graph
-from config import EXTRACTION_CACHE_PATH, STORAGE_DIR
+from agents.decision_maker import FINANCIAL_SUPPORT_ONLY
+from agents.recommender import generate_recommendations
+from inference.decision_model import APPLICATION_FIELDS, generate_llm_reason, get_model_info
+from config import STORAGE_DIR, DECISION_MODEL_CONFIG
 
 
 logger = logging.getLogger(__name__)
 
 
+def thread_config(thread_id: str) -> Dict[str, Any]:
+    return {"configurable": {"thread_id": thread_id}}
+
+# Walks every checkpoint of the thread; use get_current_state for the latest one
 def get_saved_states(app, thread_id: str):
-    config = {"configurable": {"thread_id": thread_id}}
+    config = thread_config(thread_id)
     
     # Get the history of checkpoints
     history = []
@@ -24,60 +37,250 @@ def get_saved_states(app, thread_id: str):
     
     return history
 
-# Get current state
+# Get current state (latest checkpoint only)
 def get_current_state(app, thread_id: str):
-    config = {"configurable": {"thread_id": thread_id}}
+    config = thread_config(thread_id)
     current_state = app.get_state(config)
     return current_state
 
 
+_thread_locks: "weakref.WeakValueDictionary[str, threading.Lock]" = weakref.WeakValueDictionary()
+_thread_locks_guard = threading.Lock()
+
+def thread_lock(thread_id: str) -> threading.Lock:
+    """
+    Return the lock serializing runs on one workflow thread.
+    
+    Runs on different threads never wait for each other; the lock is dropped
+    once no caller holds a reference to it.
+    """
+    with _thread_locks_guard:
+        lock = _thread_locks.get(thread_id)
+        if lock is None:
+            lock = threading.Lock()
+            _thread_locks[thread_id] = lock
+        return lock
+
+@asynccontextmanager
+async def athread_lock(thread_id: str) -> AsyncIterator[None]:
+    """
+    Hold a thread's lock from async code, waiting in a worker thread only
+    when another run on the same thread holds it.
+    """
+    lock = thread_lock(thread_id)
+    if not lock.acquire(blocking=False):
+        waiter = asyncio.ensure_future(asyncio.to_thread(lock.acquire))
+        try:
+            await asyncio.shield(waiter)
+        except asyncio.CancelledError:
+            # The worker thread still takes the lock; hand it back once it does
+            def release_acquired(future: asyncio.Future) -> None:
+                if not future.cancelled() and future.exception() is None:
+                    lock.release()
+            waiter.add_done_callback(release_acquired)
+            raise
+    try:
+        yield
+    finally:
+        lock.release()
+
+
+
+_details_executor: Optional[ThreadPoolExecutor] = None
+_details_lock = threading.Lock()
+# Keyed by details_id; finished entries are kept for a retention window so a
+# caller that waits a little late still gets its details, then dropped
+_pending_details: Dict[str, Future] = {}
+_finished_details: Dict[str, float] = {}
+
+def get_details_executor() -> ThreadPoolExecutor:
+    """
+    Return the shared executor that generates deferred reasons and recommendations.
+    """
+    global _details_executor
+    if _details_executor is None:
+        with _details_lock:
+            if _details_executor is None:
+                _details_executor = ThreadPoolExecutor(
+                    max_workers=DECISION_MODEL_CONFIG["deferred_workers"],
+                    thread_name_prefix="decision-details"
+                )
+    return _details_executor
 
-def process_query(query: str, app) -> Optional[Dict[str, Any]]:
+def complete_decision_details(
+    app,
+    config: Dict[str, Any],
+    details_id: str,
+    application_id: Optional[int],
+    application_data: Dict[str, Any],
+    decision: Dict[str, Any]
+) -> Optional[Dict[str, str]]:
+    """
+    Generate the reason and recommendations for a decision that was returned
+    early, then attach them to the workflow state and the application row.
+    
+    The workflow state is only updated while the application is still the
+    thread's latest one; a later application on the same thread keeps its own.
+    
+    Args:
+        app: Compiled workflow graph
+        config: Workflow config with the thread_id the decision was made on
+        details_id: The application's details_id in the workflow state
+        application_id: ID of the saved application, None if saving failed
+        application_data: Application data from the applicant
+        decision: Decision made by the model, with its template reason
+    
+    Returns:
+        Dict: reason and recommendations if successful, None otherwise
+    """
+    try:
+        reason = decision["reason"]
+        if DECISION_MODEL_CONFIG["explanation_mode"] == "llm":
+            reason = generate_llm_reason(application_data, decision["decision"])
+        
+        recommendations = ""
+        if decision["decision"] != FINANCIAL_SUPPORT_ONLY:
+            recommendations = generate_recommendations(application_data, {**decision, "reason": reason})
+        
+        with thread_lock(config["configurable"]["thread_id"]):
+            if app.get_state(config).values.get("details_id") == details_id:
+                app.update_state(config, {
+                    "decision": {"decision": decision["decision"], "reason": reason, "details_pending": False},
+                    "recommendations": recommendations
+                })
+            else:
+                logger.info(f"Application {details_id} was superseded on its thread; only its record is updated")
+        if application_id is not None:
+            update_application(application_id, {
+                "status": "Completed",
+                "processing_completed_at": datetime.now().isoformat(),
+                "decision_reason": reason,
+                "enablement_recommendations": recommendations
+            })
+        logger.info(f"Decision details completed for application {application_id}")
+        return {"reason": reason, "recommendations": recommendations}
+    except Exception as e:
+        logger.error(f"Error completing decision details: {str(e)}")
+        return None
+
+def _expire_details() -> None:
+    # Caller holds _details_lock
+    now = time.monotonic()
+    retention = DECISION_MODEL_CONFIG["deferred_details_retention_seconds"]
+    expired = [key for key, finished_at in _finished_details.items() if now - finished_at >= retention]
+    for key in expired:
+        _finished_details.pop(key, None)
+        _pending_details.pop(key, None)
+
+def _details_finished(details_id: str) -> None:
+    """
+    Record when a deferred generation finished, so it expires after the retention window.
+    """
+    with _details_lock:
+        if details_id in _pending_details:
+            _finished_details[details_id] = time.monotonic()
+        _expire_details()
+
+def _details_future(details_id: str) -> Optional[Future]:
+    with _details_lock:
+        _expire_details()
+        return _pending_details.get(details_id)
+
+def get_decision_details(details_id: str, timeout: Optional[float] = None) -> Optional[Dict[str, str]]:
+    """
+    Wait for the deferred reason and recommendations of a decision.
+    
+    Args:
+        details_id: The results' "details_id" of the application whose decision was returned early
+        timeout: Seconds to wait, None to wait until they are ready
+    
+    Returns:
+        Dict: reason and recommendations, None if nothing is pending or generation failed
+    """
+    future = _details_future(details_id)
+    if future is None:
+        return None
+    return future.result(timeout=timeout)
+
+async def aget_decision_details(details_id: str) -> Optional[Dict[str, str]]:
+    """
+    Async variant of get_decision_details, waiting without blocking the event loop.
+    """
+    future = _details_future(details_id)
+    if future is None:
+        return None
+    # Shielded so a cancelled caller does not cancel the shared generation
+    return await asyncio.shield(asyncio.wrap_future(future))
+
+def _query_input(current_state: Dict[str, Any], query: str) -> Dict[str, Any]:
+    """
+    Build the workflow input for a user query from the thread's latest state.
+    """
+    if current_state:
+        # Earlier messages are kept by the graph; only the new one is sent
+        initial_state = {"messages": [("user", query)]}
+        if "chatbot_conversation" in current_state:
+            logger.info("Chatbot History: {}".format(str(current_state["chatbot_conversation"])))
+        else:
+            initial_state["chatbot_conversation"] = []
+        return initial_state
+    return {
+        "extraction_filepath_dict": {},
+        "application_data": {},
+        "use_cached_extraction": True,
+        "extracted_data": {},
+        "validation_result": {},
+        "decision": {},
+        "chatbot_conversation": [],
+        "recommendations": "",
+        "messages": [
+            ("user", query)
+        ]
+    }
+
+def process_query(query: str, app, thread_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
     """
     Process a user query.
     
     Args:
         query: User query
+        thread_id: Workflow thread of the user's session; a new one is started if None
     
     Returns:
         Dict: Query processing results
     """
     try:
         logger.info(f"Processing user query: {query}")
+        thread_id = thread_id or str(uuid.uuid4())
+        config = thread_config(thread_id)
 
-        state_history = get_saved_states(app, "social_support_agent")
-        logger.info(f"Found {len(state_history)} checkpoints in history")
+        with thread_lock(thread_id):
+            # Prepare initial state
+            initial_state = _query_input(get_current_state(app, thread_id).values, query)
+            logger.info(f"Thread {thread_id} input:{initial_state}")
+            
+            # Invoke workflow
+            results = app.invoke(initial_state, config = config)
         
-        # Prepare initial state
+        return results
+    except Exception as e:
+        logger.error(f"Error processing query: {str(e)}")
+        return None
 
-        if len(state_history) > 0:
-            initial_state = get_current_state(app, "social_support_agent")[0]
-            templist = initial_state["messages"].copy()
-            templist.append(("user", query))
-            initial_state["messages"] = templist
-            try:
-                logger.info("Chatbot History: {}".format(str(initial_state["chatbot_conversation"])))
-            except:
-                initial_state["chatbot_conversation"] = []
-        else:
-            initial_state = {
-                "extraction_filepath_dict": {},
-                "application_data": {},
-                "cached_extraction_data_file_path": "",
-                "extracted_data": {},
-                "validation_result": {},
-                "decision": {},
-                "chatbot_conversation": [],
-                "recommendations": "",
-                "messages": [
-                    ("user", query)
-                ]
-            }
-        logger.info("Current state:{}".format(str(initial_state)))
-            
-        config = {"configurable":{"thread_id":"social_support_agent"}}
-        # Invoke workflow
-        results = app.invoke(initial_state, config = config)
+async def aprocess_query(query: str, app, thread_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Async variant of process_query, running the graph with ainvoke.
+    """
+    try:
+        logger.info(f"Processing user query: {query}")
+        thread_id = thread_id or str(uuid.uuid4())
+        config = thread_config(thread_id)
+
+        async with athread_lock(thread_id):
+            current_state = (await app.aget_state(config)).values
+            initial_state = _query_input(current_state, query)
+            logger.info(f"Thread {thread_id} input:{initial_state}")
+            results = await app.ainvoke(initial_state, config = config)
         
         return results
     except Exception as e:
@@ -85,6 +288,94 @@ def process_query(query: str, app) -> Optional[Dict[str, Any]]:
         return None
 
 
+def _application_input(
+    filepaths: Dict[str, str],
+    application_data: Dict[str, Any],
+    use_cached_extraction: bool,
+    thread_id: str
+) -> Dict[str, Any]:
+    return {
+        # New for every application, so deferred details of an earlier one
+        # on the thread cannot overwrite this one's state
+        "details_id": f"{thread_id}:{uuid.uuid4().hex}",
+        "extraction_filepath_dict": filepaths,
+        "application_data": application_data,
+        "use_cached_extraction": use_cached_extraction,
+        # Clear the previous application's results on the thread, so a failed
+        # step cannot leave an earlier decision in this one's results
+        "extracted_data": {},
+        "validation_result": {},
+        "decision": {},
+        "recommendations": "",
+        # Earlier messages on the thread are kept by the graph
+        "messages": [
+            ("user", "CODE-STARTAPPLICATION")
+        ]
+    }
+
+def _application_records(
+    application_data: Dict[str, Any],
+    initial_state: Dict[str, Any],
+    results: Dict[str, Any]
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Build the applicant and application rows for a processed application.
+    """
+    current_time = datetime.now().isoformat()
+    
+    # Save applicant data
+    applicant_data = {
+        "applicant_id": application_data.get("applicant_id", ""),
+        "created_at": current_time,
+        "updated_at": current_time,
+        "first_name": application_data.get("first_name", ""),
+        "last_name": application_data.get("last_name", ""),
+        "date_of_birth": application_data.get("date_of_birth", ""),
+        "gender": application_data.get("gender", ""),
+        "nationality": application_data.get("nationality", ""),
+        "emirates_id": application_data.get("emirates_id", ""),
+        "address": application_data.get("address", "")
+    }
+    
+    # Save application data
+    details_pending = results.get("decision", {}).get("details_pending", False)
+    application_record = {
+        "applicant_id": application_data.get("applicant_id", ""),
+        "created_at": current_time,
+        "support_type": results.get("decision", {}).get("decision", ""),
+        "status": "Decision Made" if details_pending else "Completed",
+        "processing_completed_at": None if details_pending else datetime.now().isoformat(),
+        "decision": results.get("decision", {}).get("decision", ""),
+        "decision_reason": results.get("decision", {}).get("reason", ""),
+        "decision_explanation": "",
+        "decision_date": current_time,
+        "enablement_recommendations": results.get("recommendations", ""),
+        "documents": initial_state["extraction_filepath_dict"],
+        "validation_results": results.get("validation_result", {}),
+        "application_features": {field: application_data.get(field) for field in APPLICATION_FIELDS},
+        "model_version": get_model_info()["version"] if results.get("decision") else None
+    }
+    return applicant_data, application_record
+
+def _schedule_details(
+    app,
+    config: Dict[str, Any],
+    application_id: Optional[int],
+    application_data: Dict[str, Any],
+    results: Dict[str, Any]
+) -> None:
+    # Generate the reason and recommendations after returning the decision
+    if results.get("decision", {}).get("details_pending", False):
+        details_id = results["details_id"]
+        future = get_details_executor().submit(
+            complete_decision_details, app, config, details_id, application_id,
+            application_data, results["decision"]
+        )
+        with _details_lock:
+            _expire_details()
+            _pending_details[details_id] = future
+        future.add_done_callback(lambda _: _details_finished(details_id))
+
 def process_application(
     emirates_id_path: str,
     bank_statement_path: str,
@@ -93,9 +384,8 @@ def process_application(
     assets_liabilities_path: str,
     application_data: Dict[str, Any],
     app,
-    emirates_id_file, bank_statement_file, credit_report_file, 
-                resume_file, assets_liabilities_file,
-    use_cached_extraction: bool = False,
+    use_cached_extraction: bool = True,
+    thread_id: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Process a social support application.
@@ -107,7 +397,8 @@ def process_application(
         resume_path: Path to resume document
         assets_liabilities_path: Path to assets/liabilities spreadsheet
         application_data: Application data
-        use_cached_extraction: Whether to use cached extraction data
+        use_cached_extraction: Whether to reuse cached extractions of identical documents
+        thread_id: Workflow thread of the user's session; a new one is started if None
     
     Returns:
         Dict: Processing results
@@ -115,88 +406,71 @@ def process_application(
     try:
         logger.info("Starting application processing")
         
-        # Prepare initial state
-        state_history = get_saved_states(app, "social_support_agent")
-        logger.info(f"Found {len(state_history)} checkpoints in history")
+        thread_id = thread_id or str(uuid.uuid4())
+        config = thread_config(thread_id)
         
         # Prepare initial state
-        cacheFile = ""
-
-        if  ((emirates_id_file.split("\\")[-1] == "eida.png") and (bank_statement_file.split("\\")[-1] == "BankStatement.pdf") and (credit_report_file.split("\\")[-1] == "credit-report.png") and (resume_file.split("\\")[-1] == "Resume.pdf") and (assets_liabilities_file.split("\\")[-1] == "Assets-Liabilities.xlsx")):
-            cacheFile = str(EXTRACTION_CACHE_PATH)
-
-
-        if len(state_history) > 0:
-            initial_state = get_current_state(app, "social_support_agent")[0]
-            templist = initial_state["messages"].copy()
-            templist.append(("user", "CODE-STARTAPPLICATION"))
-            initial_state["messages"] = templist
-            initial_state['extraction_filepath_dict'] =  {
-                    "emirates_id_file_path": emirates_id_path,
-                    "bank_statements_file_path": bank_statement_path,
-                    "credit_report_file_path": credit_report_path,
-                    "resume_file_path": resume_path,
-                    "assets_liabilities_file_path": assets_liabilities_path
-                }
-            initial_state["application_data"] = application_data
-            initial_state["cached_extraction_data_file_path"] = cacheFile
+        initial_state = _application_input({
+            "emirates_id_file_path": emirates_id_path,
+            "bank_statements_file_path": bank_statement_path,
+            "credit_report_file_path": credit_report_path,
+            "resume_file_path": resume_path,
+            "assets_liabilities_file_path": assets_liabilities_path
+        }, application_data, use_cached_extraction, thread_id)
+        logger.info(f"Thread {thread_id} input:{initial_state}")
 
-        else:
-            initial_state = {
-                "extraction_filepath_dict": {
-                    "emirates_id_file_path": emirates_id_path,
-                    "bank_statements_file_path": bank_statement_path,
-                    "credit_report_file_path": credit_report_path,
-                    "resume_file_path": resume_path,
-                    "assets_liabilities_file_path": assets_liabilities_path
-                },
-                "application_data": application_data,
-                "cached_extraction_data_file_path": cacheFile,
-                "messages": [
-                    ("user", "CODE-STARTAPPLICATION")
-                ]
-            }
-        logger.info("Current state:{}".format(str(initial_state)))
-
-        config = {"configurable":{"thread_id":"social_support_agent"}}
-        # Invoke workflow
-        results = app.invoke(initial_state, config = config)
+        with thread_lock(thread_id):
+            # Invoke workflow
+            results = app.invoke(initial_state, config = config)
         
-        # Process results
-        current_time = datetime.now().isoformat()
+        # Save applicant and application together, so neither is written alone
+        applicant_data, application_record = _application_records(application_data, initial_state, results)
+        application_id = save_applicant_and_application(applicant_data, application_record)
         
-        # Save applicant data
-        applicant_data = {
-            "applicant_id": application_data.get("applicant_id", ""),
-            "created_at": current_time,
-            "updated_at": current_time,
-            "first_name": application_data.get("first_name", ""),
-            "last_name": application_data.get("last_name", ""),
-            "date_of_birth": application_data.get("date_of_birth", ""),
-            "gender": application_data.get("gender", ""),
-            "nationality": application_data.get("nationality", ""),
-            "emirates_id": application_data.get("emirates_id", ""),
-            "address": application_data.get("address", "")
-        }
-        save_applicant(applicant_data)
+        _schedule_details(app, config, application_id, application_data, results)
+        return results
+    except Exception as e:
+        logger.error(f"Error processing application: {str(e)}")
+        return {"error": str(e)}
+
+async def aprocess_application(
+    emirates_id_path: str,
+    bank_statement_path: str,
+    credit_report_path: str,
+    resume_path: str,
+    assets_liabilities_path: str,
+    application_data: Dict[str, Any],
+    app,
+    use_cached_extraction: bool = True,
+    thread_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Async variant of process_application, running the graph with ainvoke.
+    The database save runs in a worker thread, as psycopg2 is blocking.
+    """
+    try:
+        logger.info("Starting application processing")
+        
+        thread_id = thread_id or str(uuid.uuid4())
+        config = thread_config(thread_id)
+        initial_state = _application_input({
+            "emirates_id_file_path": emirates_id_path,
+            "bank_statements_file_path": bank_statement_path,
+            "credit_report_file_path": credit_report_path,
+            "resume_file_path": resume_path,
+            "assets_liabilities_file_path": assets_liabilities_path
+        }, application_data, use_cached_extraction, thread_id)
+        logger.info(f"Thread {thread_id} input:{initial_state}")
+
+        async with athread_lock(thread_id):
+            results = await app.ainvoke(initial_state, config = config)
         
-        # Save application data
-        application_data = {
-            "applicant_id": application_data.get("applicant_id", ""),
-            "created_at": current_time,
-            "support_type": results.get("decision", {}).get("decision", ""),
-            "status": "Completed",
-            "processing_completed_at": datetime.now().isoformat(),
-            "decision": results.get("decision", {}).get("decision", ""),
-            "decision_reason": results.get("decision", {}).get("reason", ""),
-            "decision_explanation": "",
-            "decision_date": current_time,
-            "enablement_recommendations": results.get("recommendations", ""),
-            "documents": str(initial_state["extraction_filepath_dict"]),
-            "validation_results": str(results.get("validation_result", {}))
-        }
-        save_application(application_data)
+        applicant_data, application_record = _application_records(application_data, initial_state, results)
+        application_id = await asyncio.to_thread(
+            save_applicant_and_application, applicant_data, application_record
+        )
         
+        _schedule_details(app, config, application_id, application_data, results)
         return results
     except Exception as e:
         logger.error(f"Error processing application: {str(e)}")